@@ -3,11 +3,12 @@ from __future__ import annotations
 import argparse
 import json
 import statistics
+import sys
 import time
 from pathlib import Path
 from typing import Any
 
-from fiber_link_sim.benchmarking import env_overrides
+from fiber_link_sim.benchmarking import CLI_HELP_COMMAND, env_overrides, time_command
 from fiber_link_sim.simulate import simulate
 
 DEFAULT_EXAMPLES = [
@@ -23,9 +24,12 @@ def _parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Benchmark simulation runtime across example specs.")
     parser.add_argument(
         "--mode",
-        choices=["general", "phys-pipeline"],
+        choices=["general", "phys-pipeline", "startup"],
         default="general",
-        help="general: per-spec summary table; phys-pipeline: sequential vs DAG cache comparison.",
+        help=(
+            "general: per-spec summary table; phys-pipeline: sequential vs DAG cache comparison; "
+            "startup: cold interpreter start for the CLI and the simulate import."
+        ),
     )
     parser.add_argument(
         "--spec",
@@ -150,6 +154,25 @@ def _bench_phys_pipeline(
     return rows
 
 
+STARTUP_COMMANDS = {
+    "cli_help": list(CLI_HELP_COMMAND),
+    "import_simulate": [sys.executable, "-c", "import fiber_link_sim.simulate"],
+    "import_adapters": [sys.executable, "-c", "import fiber_link_sim.adapters.opticommpy.stages"],
+}
+
+
+def _bench_startup(repeat: int) -> list[dict[str, float | str | int]]:
+    rows: list[dict[str, float | str | int]] = []
+    for label, argv in STARTUP_COMMANDS.items():
+        timings_s = time_command(argv, repeat=repeat)
+        rows.append(
+            _summarize(
+                label=label, spec_path=" ".join(argv[1:]), timings_s=timings_s, repeat=repeat
+            )
+        )
+    return rows
+
+
 def _print_rows(rows: list[dict[str, float | str | int]]) -> None:
     print("label,spec,repeat,min_s,mean_s,p95_s,max_s")
     for row in rows:
@@ -164,6 +187,8 @@ def main() -> int:
     if args.mode == "general":
         specs = args.spec or DEFAULT_EXAMPLES
         rows = [_bench_general(spec_path, args.repeat, args.warmup) for spec_path in specs]
+    elif args.mode == "startup":
+        rows = _bench_startup(args.repeat)
     else:
         specs = args.spec or [DEFAULT_PIPELINE_SPEC]
         rows = []
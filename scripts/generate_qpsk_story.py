@@ -12,7 +12,7 @@ import numpy as np
 matplotlib.use("Agg")
 from matplotlib import pyplot as plt  # noqa: E402
 
-from fiber_link_sim.artifacts import artifact_root_for_spec
+from fiber_link_sim.artifacts import artifact_root_for_spec, load_artifact_arrays
 from fiber_link_sim.data_models.spec_models import SimulationSpec
 from fiber_link_sim.simulate import simulate
 from fiber_link_sim.utils import bits_per_symbol, total_link_length_m
@@ -88,11 +88,7 @@ def generate_story_assets(
         add_artifact(stage, name, path, "json")
 
     def load_npz(name: str) -> dict[str, np.ndarray]:
-        path = artifact_root / f"{name}.npz"
-        if not path.exists():
-            return {}
-        with np.load(path) as data:
-            return {key: np.asarray(data[key]) for key in data.files}
+        return load_artifact_arrays(artifact_root, name)
 
     def save_fig(stage: str, name: str) -> None:
         path = output_root / f"{name}.{image_format}"
@@ -1,5 +1,48 @@
+from __future__ import annotations
+
+import importlib
+import sys
+import types
+from typing import TYPE_CHECKING, Any
+
 import fiber_link_sim._compat  # noqa: F401
-from fiber_link_sim.data_models.spec_models import SimulationResult, SimulationSpec
-from fiber_link_sim.simulate import simulate
 
-__all__ = ["SimulationResult", "SimulationSpec", "simulate"]
+if TYPE_CHECKING:
+    from fiber_link_sim.aio import simulate_async
+    from fiber_link_sim.batch import simulate_many
+    from fiber_link_sim.data_models.spec_models import SimulationResult, SimulationSpec
+    from fiber_link_sim.simulate import simulate
+
+# Resolved on first access so that importing a light submodule (the CLI, the daemon client)
+# does not pull in numpy, pydantic and the stage stack.
+_EXPORTS = {
+    "SimulationResult": "fiber_link_sim.data_models.spec_models",
+    "SimulationSpec": "fiber_link_sim.data_models.spec_models",
+    "simulate": "fiber_link_sim.simulate",
+    "simulate_async": "fiber_link_sim.aio",
+    "simulate_many": "fiber_link_sim.batch",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+class _Package(types.ModuleType):
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Importing the ``simulate`` submodule binds it here; keep the function, as the eager
+        # ``from fiber_link_sim.simulate import simulate`` always did.
+        if name == "simulate" and isinstance(value, types.ModuleType):
+            value = value.simulate
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _Package
+
+
+__all__ = ["SimulationResult", "SimulationSpec", "simulate", "simulate_async", "simulate_many"]
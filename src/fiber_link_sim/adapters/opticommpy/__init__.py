@@ -1,8 +1,35 @@
-from fiber_link_sim.adapters.opticommpy.channel import run_channel
-from fiber_link_sim.adapters.opticommpy.metrics import compute_metrics
-from fiber_link_sim.adapters.opticommpy.rx import run_rx_frontend
-from fiber_link_sim.adapters.opticommpy.stages import ADAPTERS, OptiCommPyAdapters
-from fiber_link_sim.adapters.opticommpy.tx import run_tx
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from fiber_link_sim.adapters.opticommpy.channel import run_channel
+    from fiber_link_sim.adapters.opticommpy.metrics import compute_metrics
+    from fiber_link_sim.adapters.opticommpy.rx import run_rx_frontend
+    from fiber_link_sim.adapters.opticommpy.stages import ADAPTERS, OptiCommPyAdapters
+    from fiber_link_sim.adapters.opticommpy.tx import run_tx
+
+# The adapters import OptiCommPy, which takes seconds; they load on first attribute access so
+# the optic-free submodules (``units``, ``chain``) stay cheap to import.
+_EXPORTS = {
+    "ADAPTERS": "stages",
+    "OptiCommPyAdapters": "stages",
+    "run_tx": "tx",
+    "run_channel": "channel",
+    "run_rx_frontend": "rx",
+    "compute_metrics": "metrics",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "ADAPTERS",
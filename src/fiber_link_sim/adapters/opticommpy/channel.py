@@ -6,19 +6,59 @@ from optic.models import channels  # type: ignore[import-untyped]
 
 from fiber_link_sim.adapters.opticommpy import units
 from fiber_link_sim.adapters.opticommpy.param_builders import build_channel_params
-from fiber_link_sim.adapters.opticommpy.types import ChannelOutput
+from fiber_link_sim.adapters.opticommpy.types import ChannelOutput, PropagationPath
 from fiber_link_sim.data_models.stage_models import ChannelSpecSlice
+from fiber_link_sim.propagation.linear import linear_link, nonlinear_phase_rad
+from fiber_link_sim.propagation.manakov import MANAKOV_KERR_FACTOR, PmdSections, manakov_ssfm
+from fiber_link_sim.propagation.ssfm import LinkModel, ssfm
 from fiber_link_sim.utils import preserve_numpy_random_state
 
 
+def _launch_power_w(signal: np.ndarray, polarizations: int) -> float:
+    # Mean power of the strongest mode, summed over its polarizations.
+    power = np.mean(np.abs(signal) ** 2, axis=0)
+    return float(np.reshape(power, (-1, polarizations)).sum(axis=-1).max(initial=0.0))
+
+
 def run_channel(spec: ChannelSpecSlice, signal: object, seed: int) -> ChannelOutput:
     param, layout = build_channel_params(spec, seed)
+    model = LinkModel.from_spec(
+        spec, n_spans=layout.n_spans, span_length_km=layout.span_length_km, carrier_hz=param.Fc
+    )
+    manakov = spec.propagation.model == "manakov"
+    field = np.asarray(signal)
+    polarizations = 2 if manakov and field.ndim == 2 and field.shape[1] % 2 == 0 else 1
+    phase_rad = nonlinear_phase_rad(
+        model,
+        _launch_power_w(field, polarizations),
+        coefficient=MANAKOV_KERR_FACTOR if manakov else 1.0,
+    )
+    param.nonlinear_phase_rad = phase_rad
 
-    with preserve_numpy_random_state(seed):
-        if spec.signal.format == "coherent_qpsk":
-            out = channels.manakovSSF(signal, param)
-        else:
-            out = channels.ssfm(signal, param)
+    out: object
+    propagation_path: PropagationPath = "split_step"
+    if phase_rad <= spec.propagation.linear_phase_threshold_rad:
+        # Negligible Kerr phase: one transfer function for the whole link, on either backend.
+        # Only the native engines model PMD, so only they draw waveplates here.
+        propagation_path = "linear"
+        rng = np.random.default_rng(seed)
+        pmd = None
+        if spec.propagation.backend == "native_ssfm" and polarizations == 2:
+            pmd = PmdSections.build(model, field.shape[0], rng) if model.pmd_ps_sqrt_km else None
+        out = linear_link(field, model, rng=rng, pmd=pmd)
+    elif spec.propagation.backend == "native_ssfm":
+        propagate = manakov_ssfm if manakov else ssfm
+        out, stats = propagate(field, model, rng=np.random.default_rng(seed))
+        param.ssfm_steps = stats.steps
+        param.ssfm_rejected_steps = stats.rejected_steps
+        param.ssfm_max_nonlinear_phase_rad = stats.max_nonlinear_phase_rad
+        param.ssfm_error_estimate = stats.error_estimate
+    else:
+        with preserve_numpy_random_state(seed):
+            if spec.signal.format == "coherent_qpsk":
+                out = channels.manakovSSF(signal, param)
+            else:
+                out = channels.ssfm(signal, param)
 
     if isinstance(out, tuple):
         signal_out, params = out
@@ -52,4 +92,5 @@ def run_channel(spec: ChannelSpecSlice, signal: object, seed: int) -> ChannelOut
         params=params,
         osnr_db=osnr_db,
         n_spans=layout.n_spans,
+        propagation_path=propagation_path,
     )
@@ -10,77 +10,20 @@ from optic.dsp import carrierRecovery, equalization  # type: ignore[import-untyp
 from optic.dsp import core as dsp_core
 from optic.utils import dec2bitarray  # type: ignore[import-untyped]
 
+from fiber_link_sim.adapters.opticommpy.chain import (
+    _DSP_BLOCKS,
+    resolve_dsp_chain,
+)
 from fiber_link_sim.adapters.opticommpy.param_builders import (
     build_edc_params,
     build_mimo_eq_params,
     build_resample_params,
 )
 from fiber_link_sim.adapters.opticommpy.types import DspOutput
-from fiber_link_sim.data_models.spec_models import DspBlock, DSPBlockName
+from fiber_link_sim.compact import LlrFormat, compact_llrs
+from fiber_link_sim.data_models.spec_models import DspBlock
 from fiber_link_sim.data_models.stage_models import DspSpecSlice
 
-_DSP_BLOCKS = {
-    "resample",
-    "matched_filter",
-    "cd_comp",
-    "mimo_eq",
-    "ffe",
-    "cpr",
-    "demap",
-}
-
-_DEFAULT_COHERENT_CHAIN: tuple[DSPBlockName, ...] = (
-    "resample",
-    "matched_filter",
-    "cd_comp",
-    "mimo_eq",
-    "cpr",
-    "demap",
-)
-_DEFAULT_IMDD_CHAIN: tuple[DSPBlockName, ...] = ("resample", "matched_filter", "ffe", "demap")
-
-
-def resolve_dsp_chain(spec: DspSpecSlice, blocks: list[DspBlock]) -> list[DspBlock]:
-    if blocks:
-        chain = list(blocks)
-    else:
-        if spec.signal.format == "coherent_qpsk":
-            chain = [DspBlock(name=name) for name in _DEFAULT_COHERENT_CHAIN]
-        else:
-            chain = [DspBlock(name=name) for name in _DEFAULT_IMDD_CHAIN]
-    validate_dsp_chain(chain)
-    return chain
-
-
-def validate_dsp_chain(blocks: list[DspBlock]) -> None:
-    for block in blocks:
-        if not block.enabled:
-            continue
-        name = block.name
-        params = block.params
-        if name not in _DSP_BLOCKS:
-            continue
-        if name == "resample" and "out_fs_hz" in params:
-            out_fs = float(params["out_fs_hz"])
-            if out_fs <= 0:
-                raise ValueError("resample.out_fs_hz must be > 0")
-        if name in {"mimo_eq", "ffe"}:
-            taps = int(params.get("taps", 1))
-            mu = float(params.get("mu", 1e-3))
-            if taps < 1:
-                raise ValueError(f"{name}.taps must be >= 1")
-            if mu <= 0:
-                raise ValueError(f"{name}.mu must be > 0")
-        if name == "cpr":
-            n_avg = int(params.get("avg_window", 1))
-            test_angles = int(params.get("test_angles", 1))
-            if n_avg < 1:
-                raise ValueError("cpr.avg_window must be >= 1")
-            if test_angles < 1:
-                raise ValueError("cpr.test_angles must be >= 1")
-        if name == "demap" and "soft" in params and not isinstance(params["soft"], bool):
-            raise ValueError("demap.soft must be a boolean when provided")
-
 
 def run_dsp_chain(spec: DspSpecSlice, samples: np.ndarray, blocks: list[DspBlock]) -> DspOutput:
     params: dict[str, Any] = {}
@@ -89,6 +32,7 @@ def run_dsp_chain(spec: DspSpecSlice, samples: np.ndarray, blocks: list[DspBlock
     blocks = resolve_dsp_chain(spec, blocks)
     demap_enabled = False
     demap_soft = False
+    llr_format: LlrFormat = "float32"
 
     for block in blocks:
         if not block.enabled:
@@ -153,14 +97,17 @@ def run_dsp_chain(spec: DspSpecSlice, samples: np.ndarray, blocks: list[DspBlock
         elif block.name == "demap":
             demap_enabled = True
             demap_soft = bool(block.params.get("soft", False))
-            params["demap"] = {"soft": demap_soft}
+            llr_format = block.params.get("llr_format", "float32")
+            params["demap"] = {"soft": demap_soft, "llr_format": llr_format}
 
     symbols = _downsample(out, spec.runtime.samples_per_symbol)
     hard_bits = None
     llrs = None
     if demap_enabled:
         order, const_type = _constellation_params(spec.signal.format)
-        hard_bits, llrs = _demap_symbols(symbols, order, const_type, demap_soft)
+        hard_bits, raw_llrs = _demap_symbols(symbols, order, const_type, demap_soft)
+        if raw_llrs is not None:
+            llrs = compact_llrs(raw_llrs, llr_format)
     return DspOutput(samples=out, symbols=symbols, params=params, hard_bits=hard_bits, llrs=llrs)
 
 
@@ -183,7 +130,7 @@ def _demap_symbols(
     symbols: np.ndarray, order: int, const_type: str, soft: bool
 ) -> tuple[np.ndarray, np.ndarray | None]:
     flattened = _flatten_symbols(symbols)
-    hard_bits = modulation.demodulateGray(flattened, order, const_type).astype(int)
+    hard_bits = modulation.demodulateGray(flattened, order, const_type).astype(np.uint8)
     if not soft:
         return hard_bits, None
 
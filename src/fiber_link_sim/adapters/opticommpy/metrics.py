@@ -13,6 +13,8 @@ class MetricsOutput:
     pre_fec_ber: float
     snr_db: float
     evm_rms: float
+    # Why ``pre_fec_ber`` is the theoretical BER at the measured SNR, if it is.
+    ber_fallback: str | None = None
 
 
 def compute_metrics(symb_rx: np.ndarray, symb_tx: np.ndarray, signal: Signal) -> MetricsOutput:
@@ -29,13 +31,18 @@ def compute_metrics(symb_rx: np.ndarray, symb_tx: np.ndarray, signal: Signal) ->
     snr_linear = 1.0 / max(evm_mean, 1e-12)
     snr_db = 10.0 * float(np.log10(snr_linear))
 
+    ber_fallback = None
     try:
         ber, _, snr = opti_metrics.fastBERcalc(rx_aligned, tx_aligned, order, const_type)
         pre_fec_ber = float(np.mean(ber))
         snr_db = float(np.mean(snr))
         if not np.isfinite(pre_fec_ber) or not np.isfinite(snr_db):
-            raise ValueError("non-finite BER/SNR from fastBERcalc")
-    except Exception:
+            ber_fallback = "non-finite BER/SNR from fastBERcalc"
+    except AssertionError as exc:
+        # OptiCommPy's jitted shape checks reject some constellation layouts. Anything else
+        # fastBERcalc raises is a bug and propagates rather than turning into theory.
+        ber_fallback = f"fastBERcalc rejected the symbols ({exc})"
+    if ber_fallback is not None:
         bits_per_symbol = float(np.log2(order))
         ebn0_db = snr_db - 10.0 * float(np.log10(bits_per_symbol))
         theory_const = "pam" if const_type == "ook" else const_type
@@ -45,6 +52,7 @@ def compute_metrics(symb_rx: np.ndarray, symb_tx: np.ndarray, signal: Signal) ->
         pre_fec_ber=_quantize(pre_fec_ber),
         snr_db=_quantize(snr_db),
         evm_rms=_quantize(float(np.sqrt(evm_mean))),
+        ber_fallback=ber_fallback,
     )
 
 
@@ -70,7 +78,8 @@ def _align_symbols(symb_rx: np.ndarray, symb_tx: np.ndarray) -> tuple[np.ndarray
     rx = _as_2d(symb_rx)
     tx = _as_2d(symb_tx)
     n = min(rx.shape[0], tx.shape[0])
-    return rx[:n, :], tx[:n, :]
+    # fastBERcalc normalizes its inputs in place, and stored symbols are read-only views.
+    return np.array(rx[:n, :], copy=True), np.array(tx[:n, :], copy=True)
 
 
 def _as_2d(arr: np.ndarray) -> np.ndarray:
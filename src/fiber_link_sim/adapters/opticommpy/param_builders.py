@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
 from typing import Literal
 
 import numpy as np
@@ -13,29 +12,11 @@ from fiber_link_sim.data_models.stage_models import (
     RxFrontEndSpecSlice,
     TxSpecSlice,
 )
-from fiber_link_sim.utils import total_link_length_m
-
-
-@dataclass(frozen=True)
-class ChannelLayout:
-    total_length_km: float
-    span_length_km: float
-    n_spans: int
+from fiber_link_sim.utils import ChannelLayout, channel_layout, total_link_length_m
 
 
 def _channel_layout(spec: ChannelSpecSlice) -> ChannelLayout:
-    total_length_km = total_link_length_m(spec.path) / 1000.0
-    if spec.spans.mode == "from_path_segments":
-        n_spans = max(len(spec.path.segments), 1)
-        span_length_km = total_length_km / n_spans if n_spans > 0 else total_length_km
-    else:
-        span_length_km = spec.spans.span_length_m / 1000.0
-        n_spans = max(1, int(round(total_length_km / span_length_km)))
-    return ChannelLayout(
-        total_length_km=total_length_km,
-        span_length_km=span_length_km,
-        n_spans=n_spans,
-    )
+    return channel_layout(spec.path, spec.spans)
 
 
 def _beta2_to_dispersion(beta2_s2_per_m: float, fc_hz: float) -> float:
@@ -106,6 +87,9 @@ def build_channel_params(spec: ChannelSpecSlice, seed: int) -> tuple[parameters,
     param.Ltotal = layout.total_length_km
     param.Lspan = layout.span_length_km
     param.hz = spec.propagation.ssfm.dz_m / 1000.0
+    # manakovSSF keeps its adaptive nonlinear-phase stepping (nlprMethod) on, as it always
+    # has; step_adapt and step_method only select the native engines' step rule.
+    param.maxNlinPhaseRot = spec.propagation.ssfm.max_nonlinear_phase_rad
     param.alpha = spec.fiber.alpha_db_per_km
     param.gamma = spec.fiber.gamma_w_inv_m * 1e3
     param.Fc = units.carrier_frequency_hz()
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Literal
 
 import numpy as np
 from optic.utils import parameters  # type: ignore[import-untyped]
 
+from fiber_link_sim.compact import QuantizedLLRs
+
+PropagationPath = Literal["split_step", "linear"]
+
 
 @dataclass(slots=True)
 class TxOutput:
@@ -20,6 +24,7 @@ class ChannelOutput:
     params: parameters
     osnr_db: float | None
     n_spans: int
+    propagation_path: PropagationPath = "split_step"
 
 
 @dataclass(slots=True)
@@ -34,7 +39,7 @@ class DspOutput:
     symbols: np.ndarray
     params: dict[str, Any]
     hard_bits: np.ndarray | None = None
-    llrs: np.ndarray | None = None
+    llrs: np.ndarray | QuantizedLLRs | None = None
 
 
 @dataclass(slots=True)
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import threading
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import get_context
+from multiprocessing.managers import SyncManager
+from typing import Any, Literal
+
+from pydantic import ValidationError
+
+from fiber_link_sim.data_models.spec_models import SimulationResult, SimulationSpec
+from fiber_link_sim.simulate import _cached_result, _load_spec, _remember_result, simulate
+from fiber_link_sim.utils import compute_spec_hash
+from fiber_link_sim.workers import SpecInput, default_workers, failure_result, get_pool
+
+ExecutorKind = Literal["thread", "process"]
+
+_DEFAULT_SIMULATORS: dict[ExecutorKind, AsyncSimulator] = {}
+_DEFAULT_LOCK = threading.Lock()
+
+
+class AsyncSimulator:
+    """Run simulations from asyncio with a concurrency limit and clean cancellation.
+
+    At most ``concurrency`` runs execute at once (default ``default_workers()``); further runs
+    queue in the executor. ``executor="thread"`` runs ``simulate()`` on a private thread pool.
+    ``executor="process"`` uses the shared warm ``WorkerPool`` and checks this process's result
+    caches before submitting. Either way, cancelling a queued run withdraws it, and cancelling
+    a running one sets its cancel event (a manager ``Event`` in process mode) so it stops at
+    the next stage boundary; the awaiting task waits for that before re-raising
+    ``CancelledError``. The whole run, including artifact writes, happens off the event loop.
+    """
+
+    def __init__(
+        self, *, concurrency: int | None = None, executor: ExecutorKind = "thread"
+    ) -> None:
+        if executor not in ("thread", "process"):
+            raise ValueError(f"unknown executor: {executor!r}")
+        self.concurrency = default_workers() if concurrency is None else concurrency
+        if self.concurrency < 1:
+            raise ValueError("concurrency must be >= 1")
+        self.executor = executor
+        self._threads: ThreadPoolExecutor | None = None
+        self._manager: SyncManager | None = None
+        self._lock = threading.Lock()
+
+    def _thread_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(
+                    max_workers=self.concurrency, thread_name_prefix="fiber-link-sim"
+                )
+            return self._threads
+
+    def _cancel_event(self) -> Any:
+        with self._lock:
+            if self._manager is None:
+                self._manager = get_context("spawn").Manager()
+            return self._manager.Event()
+
+    async def simulate(self, spec: SpecInput) -> SimulationResult:
+        if self.executor == "process":
+            return await self._simulate_in_process(spec)
+        return await self._simulate_in_thread(spec)
+
+    async def _simulate_in_thread(self, spec: SpecInput) -> SimulationResult:
+        cancel = threading.Event()
+        future = self._thread_pool().submit(simulate, spec, cancel=cancel)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            cancel.set()
+            if not future.cancel():
+                with contextlib.suppress(Exception):
+                    await asyncio.wrap_future(future)
+            raise
+
+    async def _simulate_in_process(self, spec: SpecInput) -> SimulationResult:
+        try:
+            spec_model: SimulationSpec | None = _load_spec(spec)
+        except (ValidationError, OSError, json.JSONDecodeError):
+            spec_model = None  # the worker reports the validation error
+        if spec_model is not None:
+            cached = _cached_result(compute_spec_hash(spec_model), spec_model.runtime.seed)
+            if cached is not None:
+                return cached
+        cancel = await asyncio.to_thread(self._cancel_event)
+        future = get_pool(self.concurrency).submit_cancellable(spec_model or spec, cancel)
+        try:
+            payload = await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            await asyncio.to_thread(cancel.set)
+            if not future.cancel():
+                with contextlib.suppress(Exception):
+                    await asyncio.wrap_future(future)
+            raise
+        except Exception as exc:
+            return failure_result(spec, exc)
+        result = SimulationResult.model_validate(payload)
+        if spec_model is None or result.status != "success":
+            return result
+        return _remember_result(compute_spec_hash(spec_model), spec_model.runtime.seed, result)
+
+    async def iter_simulate(
+        self, specs: Iterable[SpecInput] | AsyncIterable[SpecInput]
+    ) -> AsyncIterator[tuple[int, SimulationResult]]:
+        """Yield ``(index, result)`` pairs as runs complete.
+
+        Specs are pulled from ``specs`` only when one of the ``concurrency`` slots is free and
+        the consumer is ready, so a slow consumer or an endless async source never builds a
+        queue. Closing the iterator early cancels the runs still in flight.
+        """
+        source = _aiter_specs(specs)
+        pending: dict[asyncio.Task[SimulationResult], int] = {}
+        next_index = 0
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(pending) < self.concurrency:
+                    try:
+                        spec = await anext(source)
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+                    pending[asyncio.ensure_future(self.simulate(spec))] = next_index
+                    next_index += 1
+                if not pending:
+                    return
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield pending.pop(task), task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    async def aclose(self) -> None:
+        """Shut down the thread pool once its runs finish; the process pool is shared."""
+        with self._lock:
+            threads, self._threads = self._threads, None
+            manager, self._manager = self._manager, None
+        if threads is not None:
+            await asyncio.to_thread(threads.shutdown)
+        if manager is not None:
+            await asyncio.to_thread(manager.shutdown)
+
+    async def __aenter__(self) -> AsyncSimulator:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+
+async def _aiter_specs(
+    specs: Iterable[SpecInput] | AsyncIterable[SpecInput],
+) -> AsyncIterator[SpecInput]:
+    if isinstance(specs, AsyncIterable):
+        async for spec in specs:
+            yield spec
+    else:
+        for spec in specs:
+            yield spec
+
+
+def _default_simulator(executor: ExecutorKind) -> AsyncSimulator:
+    with _DEFAULT_LOCK:
+        simulator = _DEFAULT_SIMULATORS.get(executor)
+        if simulator is None:
+            simulator = _DEFAULT_SIMULATORS[executor] = AsyncSimulator(executor=executor)
+        return simulator
+
+
+async def simulate_async(spec: SpecInput, *, executor: ExecutorKind = "thread") -> SimulationResult:
+    """``simulate()`` without blocking the event loop, on a shared ``AsyncSimulator``."""
+    return await _default_simulator(executor).simulate(spec)
+
+
+async def iter_simulate_async(
+    specs: Iterable[SpecInput] | AsyncIterable[SpecInput],
+    *,
+    concurrency: int | None = None,
+    executor: ExecutorKind = "thread",
+) -> AsyncIterator[tuple[int, SimulationResult]]:
+    """Async ``iter_simulate_many``: yield ``(index, result)`` pairs with bounded concurrency."""
+    async with AsyncSimulator(concurrency=concurrency, executor=executor) as simulator:
+        async for item in simulator.iter_simulate(specs):
+            yield item
+
+
+__all__ = ["AsyncSimulator", "ExecutorKind", "iter_simulate_async", "simulate_async"]
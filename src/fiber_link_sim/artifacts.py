@@ -1,14 +1,30 @@
 from __future__ import annotations
 
+import contextlib
 import json
-from dataclasses import dataclass, field
+import threading
+from collections.abc import Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field, fields
 from pathlib import Path
 from typing import Any, Protocol
 
 import numpy as np
-from phys_pipeline.types import hash_ndarray
 
 import fiber_link_sim._compat  # noqa: F401
+from fiber_link_sim.blob_pool import BLOB_POOL_DIRNAME, BlobCodec, BlobPool
+from fiber_link_sim.bundle import BUNDLE_FILENAME, BundleReader, BundleWriter
+from fiber_link_sim.chunked import DEFAULT_CHUNK_BYTES, ChunkedArray
+from fiber_link_sim.fingerprint import fingerprint_array, remember_fingerprint
+
+# Large waveforms are stored as raw ``.npy`` so readers can memory-map and slice them
+# lazily; everything else (symbols, hard bits, LLRs) stays compressed. Map a role to
+# ``chunked`` to split it into fixed-size ``.npy`` chunks instead.
+DEFAULT_BLOB_CODECS: dict[str, BlobCodec] = {
+    "signal:tx": "npy",
+    "signal:optical": "npy",
+    "signal:rx": "npy",
+}
 
 
 @dataclass(frozen=True, slots=True)
@@ -23,13 +39,31 @@ class BlobPayload:
     array: np.ndarray
     role: str
     units: str | None = None
+    # Precomputed identity (e.g. a lineage digest); stores fingerprint the array otherwise.
+    digest: str | None = None
+
+
+# A lazily readable blob: in-memory and memory-mapped arrays, or a chunked store view.
+LazyArray = np.ndarray | ChunkedArray
 
 
 class ArtifactStore(Protocol):
     def write_blob(self, payload: BlobPayload) -> dict[str, Any]: ...
 
+    def write_blob_chunks(
+        self,
+        name: str,
+        chunks: Iterable[np.ndarray],
+        *,
+        role: str,
+        units: str | None = None,
+        digest: str | None = None,
+    ) -> dict[str, Any]: ...
+
     def read_blob(self, ref: str) -> np.ndarray: ...
 
+    def open_blob(self, ref: str) -> LazyArray: ...
+
     def save_npz_artifact(self, payload: ArtifactPayload) -> dict[str, Any]: ...
 
     def save_json_artifact(self, name: str, payload: dict[str, Any]) -> dict[str, Any]: ...
@@ -40,25 +74,30 @@ class InMemoryArtifactStore:
     blobs: dict[str, np.ndarray] = field(default_factory=dict)
 
     def write_blob(self, payload: BlobPayload) -> dict[str, Any]:
-        array = np.asarray(payload.array)
-        digest = hash_ndarray(array).hex()
+        array = _take_ownership(payload.array)
+        digest = payload.digest or fingerprint_array(array)
         ref = f"blob://memory/{payload.name}-{digest}.npz"
         self.blobs[ref] = array
-        return {
-            "ref": ref,
-            "name": payload.name,
-            "type": "npz",
-            "mime": "application/octet-stream",
-            "bytes": int(array.nbytes),
-            "shape": list(array.shape),
-            "dtype": str(array.dtype),
-            "role": payload.role,
-            "units": payload.units,
-        }
+        return _blob_entry(ref, payload, array, nbytes=int(array.nbytes))
+
+    def write_blob_chunks(
+        self,
+        name: str,
+        chunks: Iterable[np.ndarray],
+        *,
+        role: str,
+        units: str | None = None,
+        digest: str | None = None,
+    ) -> dict[str, Any]:
+        array = np.concatenate([np.atleast_1d(chunk) for chunk in chunks], axis=0)
+        return self.write_blob(BlobPayload(name, array, role, units, digest))
 
     def read_blob(self, ref: str) -> np.ndarray:
         return np.asarray(self.blobs[ref])
 
+    def open_blob(self, ref: str) -> LazyArray:
+        return self.read_blob(ref)
+
     def save_npz_artifact(self, payload: ArtifactPayload) -> dict[str, Any]:
         arrays = {key: np.asarray(value) for key, value in payload.arrays.items()}
         ref = f"artifact://memory/{payload.name}.npz"
@@ -86,34 +125,49 @@ class InMemoryArtifactStore:
 @dataclass(slots=True)
 class LocalArtifactStore:
     root: Path
+    codecs: dict[str, BlobCodec] = field(default_factory=lambda: dict(DEFAULT_BLOB_CODECS))
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES
 
     def __post_init__(self) -> None:
         self.root.mkdir(parents=True, exist_ok=True)
-        (self.root / "blobs").mkdir(parents=True, exist_ok=True)
+
+    @property
+    def pool(self) -> BlobPool:
+        return BlobPool(self.root.parent / BLOB_POOL_DIRNAME)
 
     def write_blob(self, payload: BlobPayload) -> dict[str, Any]:
         array = np.asarray(payload.array)
-        digest = hash_ndarray(array).hex()
-        filename = f"{payload.name}-{digest}.npz"
-        path = self.root / "blobs" / filename
-        np.savez_compressed(path, data=array)
-        return {
-            "ref": f"blob://{self.root.name}/blobs/{filename}",
-            "name": payload.name,
-            "type": "npz",
-            "mime": "application/octet-stream",
-            "bytes": path.stat().st_size,
-            "shape": list(array.shape),
-            "dtype": str(array.dtype),
-            "role": payload.role,
-            "units": payload.units,
-        }
+        digest = payload.digest or fingerprint_array(array)
+        codec = self.codec_for(payload.role)
+        ref, nbytes = self.pool.put(digest, array, codec, chunk_bytes=self.chunk_bytes)
+        return _blob_entry(ref, payload, array, codec=codec, nbytes=nbytes)
+
+    def write_blob_chunks(
+        self,
+        name: str,
+        chunks: Iterable[np.ndarray],
+        *,
+        role: str,
+        units: str | None = None,
+        digest: str | None = None,
+    ) -> dict[str, Any]:
+        ref, nbytes, index = self.pool.put_chunks(chunks, digest)
+        return _chunked_entry(ref, name, role, units, index, nbytes)
 
     def read_blob(self, ref: str) -> np.ndarray:
+        blob = self.open_blob(ref)
+        return blob if isinstance(blob, np.ndarray) else np.asarray(blob)
+
+    def open_blob(self, ref: str) -> LazyArray:
         relative = ref.replace("blob://", "")
+        if "#" in relative:
+            relative, member = relative.split("#", 1)
+            return BundleReader(self.root.parent / relative).memmap(member)
         path = self.root.parent / relative
-        with np.load(path) as data:
-            return np.asarray(data["data"])
+        return _read_blob_file(path)
+
+    def codec_for(self, role: str) -> BlobCodec:
+        return self.codecs.get(role, "npz")
 
     def save_npz_artifact(self, payload: ArtifactPayload) -> dict[str, Any]:
         filename = f"{payload.name}.npz"
@@ -141,10 +195,428 @@ class LocalArtifactStore:
         }
 
 
-def artifact_root_for_spec(spec_hash: str, base_dir: Path | None = None) -> Path:
+@dataclass(slots=True)
+class HybridArtifactStore(LocalArtifactStore):
+    """Keep blobs as read-only in-memory views and only persist them on request.
+
+    Refs use the same shared ``blob://blob_pool/...`` layout as ``LocalArtifactStore`` so
+    state hashes and run manifests are unchanged; ``persist_blobs`` controls whether
+    the blob files are also written to the pool. Directories are created lazily so runs
+    that persist nothing leave no trace on disk.
+
+    Arrays larger than ``spill_bytes`` (and everything written with
+    ``write_blob_chunks``) are not kept in memory: they go straight to a chunked pool
+    blob and are read back lazily, so links larger than RAM can still be staged.
+    """
+
+    persist_blobs: bool = False
+    spill_bytes: int | None = None
+    blobs: dict[str, np.ndarray] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        return None
+
+    def write_blob(self, payload: BlobPayload) -> dict[str, Any]:
+        array = _take_ownership(payload.array)
+        if payload.digest is None:
+            # The store owns this view for the rest of the run, so its digest stays valid.
+            digest = fingerprint_array(array)
+            remember_fingerprint(array, digest)
+        else:
+            digest = payload.digest
+        codec = self.codec_for(payload.role)
+        pool = self.pool
+        if self.spill_bytes is not None and array.nbytes > self.spill_bytes:
+            ref, nbytes = pool.put(digest, array, "chunked", chunk_bytes=self.chunk_bytes)
+            entry = _blob_entry(ref, payload, array, codec="chunked", nbytes=nbytes)
+            entry["persisted"] = True
+            return entry
+        ref = pool.ref_for(digest, codec)
+        self.blobs[ref] = array
+        if not self.persist_blobs:
+            entry = _blob_entry(ref, payload, array, codec=codec, nbytes=int(array.nbytes))
+            entry["persisted"] = False
+            return entry
+        ref, nbytes = pool.put(digest, array, codec)
+        entry = _blob_entry(ref, payload, array, codec=codec, nbytes=nbytes)
+        entry["persisted"] = True
+        return entry
+
+    def write_blob_chunks(
+        self,
+        name: str,
+        chunks: Iterable[np.ndarray],
+        *,
+        role: str,
+        units: str | None = None,
+        digest: str | None = None,
+    ) -> dict[str, Any]:
+        entry = LocalArtifactStore.write_blob_chunks(
+            self, name, chunks, role=role, units=units, digest=digest
+        )
+        entry["persisted"] = True
+        return entry
+
+    def read_blob(self, ref: str) -> np.ndarray:
+        array = self.blobs.get(ref)
+        if array is not None:
+            return array
+        return LocalArtifactStore.read_blob(self, ref)
+
+    def open_blob(self, ref: str) -> LazyArray:
+        array = self.blobs.get(ref)
+        if array is not None:
+            return array
+        return LocalArtifactStore.open_blob(self, ref)
+
+    def save_npz_artifact(self, payload: ArtifactPayload) -> dict[str, Any]:
+        self.root.mkdir(parents=True, exist_ok=True)
+        return LocalArtifactStore.save_npz_artifact(self, payload)
+
+    def save_json_artifact(self, name: str, payload: dict[str, Any]) -> dict[str, Any]:
+        self.root.mkdir(parents=True, exist_ok=True)
+        return LocalArtifactStore.save_json_artifact(self, name, payload)
+
+    def persist_memory_blobs(self) -> None:
+        """Write every blob still held only in memory to disk under its existing ref."""
+        pool = self.pool
+        for ref, array in self.blobs.items():
+            digest, codec = pool.locate(ref)
+            pool.put(digest, array, codec, chunk_bytes=self.chunk_bytes)
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Cached DAG node states all share this store; pickling the arrays would repeat
+        # every blob produced so far in each node's entry. Persist them and pickle refs only.
+        self.persist_memory_blobs()
+        return {
+            item.name: getattr(self, item.name) for item in fields(self) if item.name != "blobs"
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+        self.blobs = {}
+
+
+@dataclass(slots=True)
+class BundleArtifactStore(HybridArtifactStore):
+    """Hybrid store that packs everything a run persists into one ``bundle.bin``.
+
+    Persisted and spilled blobs and every ``save_npz_artifact`` array are appended to a
+    single container instead of separate pool/NPZ files, which keeps per-file metadata
+    traffic low on network filesystems. Refs address members as
+    ``blob://<root>/bundle.bin#blobs/<name>-<digest>`` and
+    ``artifact://<root>/bundle.bin#artifacts/<name>``; ``finalize()`` writes the footer
+    and returns the offset table that ``simulate()`` embeds in the run manifest. Bundles
+    are per run, so blobs are not shared through the content-addressed pool.
+    """
+
+    writer: BundleWriter | None = None
+
+    def write_blob(self, payload: BlobPayload) -> dict[str, Any]:
+        array = _take_ownership(payload.array)
+        if payload.digest is None:
+            digest = fingerprint_array(array)
+            remember_fingerprint(array, digest)
+        else:
+            digest = payload.digest
+        member = f"blobs/{payload.name}-{digest}"
+        ref = f"blob://{self.root.name}/{BUNDLE_FILENAME}#{member}"
+        spill = self.spill_bytes is not None and array.nbytes > self.spill_bytes
+        if not spill:
+            self.blobs[ref] = array
+        if not (spill or self.persist_blobs):
+            entry = _blob_entry(ref, payload, array, codec="bundle", nbytes=int(array.nbytes))
+            entry["persisted"] = False
+            return entry
+        stored = self._writer().append(member, array)
+        entry = _blob_entry(ref, payload, array, codec="bundle", nbytes=stored["nbytes"])
+        entry.update(persisted=True, offset=stored["offset"])
+        return entry
+
+    def write_blob_chunks(
+        self,
+        name: str,
+        chunks: Iterable[np.ndarray],
+        *,
+        role: str,
+        units: str | None = None,
+        digest: str | None = None,
+    ) -> dict[str, Any]:
+        if digest is None:
+            # The member name must be known before streaming; fall back to the pool.
+            return HybridArtifactStore.write_blob_chunks(
+                self, name, chunks, role=role, units=units, digest=digest
+            )
+        member = f"blobs/{name}-{digest}"
+        stored = self._writer().append_chunks(member, chunks)
+        return {
+            "ref": f"blob://{self.root.name}/{BUNDLE_FILENAME}#{member}",
+            "name": name,
+            "type": "bundle",
+            "codec": "bundle",
+            "mime": "application/octet-stream",
+            "bytes": stored["nbytes"],
+            "shape": stored["shape"],
+            "dtype": str(np.lib.format.descr_to_dtype(stored["dtype"])),
+            "role": role,
+            "units": units,
+            "persisted": True,
+            "offset": stored["offset"],
+        }
+
+    def open_blob(self, ref: str) -> LazyArray:
+        array = self.blobs.get(ref)
+        if array is not None:
+            return array
+        member = ref.partition("#")[2]
+        if self.writer is not None and member in self.writer.members:
+            self.writer.flush()
+            return BundleReader(self.writer.location, self.writer.index()).memmap(member)
+        return LocalArtifactStore.open_blob(self, ref)
+
+    def save_npz_artifact(self, payload: ArtifactPayload) -> dict[str, Any]:
+        writer = self._writer()
+        nbytes = 0
+        for key, value in payload.arrays.items():
+            nbytes += writer.append(f"artifacts/{payload.name}/{key}", value)["nbytes"]
+        return {
+            "name": payload.name,
+            "type": "bin",
+            "ref": f"artifact://{self.root.name}/{BUNDLE_FILENAME}#artifacts/{payload.name}",
+            "mime": "application/octet-stream",
+            "bytes": nbytes,
+        }
+
+    def persist_memory_blobs(self) -> None:
+        for ref, array in self.blobs.items():
+            member = ref.partition("#")[2]
+            if self.writer is None or member not in self.writer.members:
+                self._writer().append(member, array)
+
+    def finalize(self) -> dict[str, Any] | None:
+        if self.writer is None:
+            return None
+        return self.writer.finalize()
+
+    def discard(self) -> None:
+        if self.writer is not None:
+            self.writer.discard()
+
+    def _writer(self) -> BundleWriter:
+        if self.writer is None:
+            self.writer = BundleWriter(self.root / BUNDLE_FILENAME)
+        return self.writer
+
+
+class AsyncArtifactWriter:
+    """Write-behind wrapper that saves NPZ artifacts on a bounded background thread pool.
+
+    ``save_npz_artifact`` returns a placeholder entry immediately and fills it in once the
+    payload has been compressed and written; ``flush()`` must run before the entries are
+    read (``simulate()`` flushes before writing the run manifest). At most ``max_pending``
+    payloads are queued at once so large waveforms cannot pile up in memory. Blob writes
+    and reads stay synchronous because downstream stages depend on them.
+    """
+
+    def __init__(
+        self, store: ArtifactStore, *, max_workers: int = 2, max_pending: int | None = None
+    ) -> None:
+        self.store = store
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max(1, max_pending or 2 * self.max_workers)
+        self._executor: ThreadPoolExecutor | None = None
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._pending: list[Future[dict[str, Any]]] = []
+        self._lock = threading.Lock()
+
+    def write_blob(self, payload: BlobPayload) -> dict[str, Any]:
+        return self.store.write_blob(payload)
+
+    def write_blob_chunks(
+        self,
+        name: str,
+        chunks: Iterable[np.ndarray],
+        *,
+        role: str,
+        units: str | None = None,
+        digest: str | None = None,
+    ) -> dict[str, Any]:
+        return self.store.write_blob_chunks(name, chunks, role=role, units=units, digest=digest)
+
+    def read_blob(self, ref: str) -> np.ndarray:
+        return self.store.read_blob(ref)
+
+    def open_blob(self, ref: str) -> LazyArray:
+        return self.store.open_blob(ref)
+
+    def save_npz_artifact(self, payload: ArtifactPayload) -> dict[str, Any]:
+        entry: dict[str, Any] = {
+            "name": payload.name,
+            "type": "npz",
+            "ref": None,
+            "mime": "application/octet-stream",
+            "bytes": None,
+        }
+
+        def _write() -> dict[str, Any]:
+            entry.update(self.store.save_npz_artifact(payload))
+            return entry
+
+        self._submit(_write)
+        return entry
+
+    def submit_npz_artifact(self, payload: ArtifactPayload) -> Future[dict[str, Any]]:
+        return self._submit(lambda: self.store.save_npz_artifact(payload))
+
+    def save_json_artifact(self, name: str, payload: dict[str, Any]) -> dict[str, Any]:
+        return self.store.save_json_artifact(name, payload)
+
+    def flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, []
+        errors = [future.exception() for future in pending]
+        for error in errors:
+            if error is not None:
+                raise error
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+    def abort(self) -> None:
+        """Drain queued writes and stop the pool without raising, for a run that already failed."""
+        with contextlib.suppress(Exception):
+            self.close()
+
+    def _submit(self, fn: Any) -> Future[dict[str, Any]]:
+        self._slots.acquire()
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="fiber-link-sim-artifacts"
+                )
+            try:
+                future = self._executor.submit(fn)
+            except BaseException:
+                self._slots.release()
+                raise
+            self._pending.append(future)
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def __getstate__(self) -> dict[str, Any]:
+        self.flush()
+        return {
+            "store": self.store,
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(  # type: ignore[misc]
+            state["store"], max_workers=state["max_workers"], max_pending=state["max_pending"]
+        )
+
+
+def _take_ownership(array: np.ndarray) -> np.ndarray:
+    """A read-only array no reference held by the producer can change.
+
+    An array that owns its memory is frozen in place, so the producer's own reference
+    becomes read-only too and nothing is copied. A view is copied unless its base is
+    already read-only, since the producer could otherwise write through the base.
+    """
+    array = np.asarray(array)
+    if array.flags.owndata:
+        array.flags.writeable = False
+        return array
+    base = array
+    while isinstance(base.base, np.ndarray):
+        base = base.base
+    array = array.copy() if base.flags.writeable else array.view()
+    array.flags.writeable = False
+    return array
+
+
+def _read_blob_file(path: Path) -> LazyArray:
+    if path.suffix == ".chunked":
+        return ChunkedArray(path)
+    if path.suffix == ".npy":
+        return np.load(path, mmap_mode="r", allow_pickle=False)
+    with np.load(path) as data:
+        return np.asarray(data["data"])
+
+
+def _blob_entry(
+    ref: str,
+    payload: BlobPayload,
+    array: np.ndarray,
+    *,
+    codec: str = "npz",
+    nbytes: int,
+) -> dict[str, Any]:
+    return {
+        "ref": ref,
+        "name": payload.name,
+        "type": codec,
+        "codec": codec,
+        "mime": "application/octet-stream",
+        "bytes": nbytes,
+        "shape": list(array.shape),
+        "dtype": str(array.dtype),
+        "role": payload.role,
+        "units": payload.units,
+    }
+
+
+def _chunked_entry(
+    ref: str,
+    name: str,
+    role: str,
+    units: str | None,
+    index: dict[str, Any],
+    nbytes: int,
+) -> dict[str, Any]:
+    return {
+        "ref": ref,
+        "name": name,
+        "type": "chunked",
+        "codec": "chunked",
+        "mime": "application/octet-stream",
+        "bytes": nbytes,
+        "shape": list(index["shape"]),
+        "dtype": str(np.lib.format.descr_to_dtype(index["dtype"])),
+        "role": role,
+        "units": units,
+    }
+
+
+def load_artifact_arrays(artifact_root: Path, name: str) -> dict[str, np.ndarray]:
+    """Load the arrays of one ArtifactsStage output from either artifact layout.
+
+    Returns an empty dict when the run did not produce the artifact.
+    """
+    npz_path = artifact_root / f"{name}.npz"
+    if npz_path.exists():
+        with np.load(npz_path) as data:
+            return {key: np.asarray(data[key]) for key in data.files}
+    bundle_path = artifact_root / BUNDLE_FILENAME
+    if bundle_path.exists():
+        return BundleReader(bundle_path).read_group(f"artifacts/{name}")
+    return {}
+
+
+def artifact_root_for_spec(
+    spec_hash: str, base_dir: Path | None = None, *, create: bool = True
+) -> Path:
     root_dir = base_dir or Path("artifacts")
     root = root_dir / spec_hash
-    root.mkdir(parents=True, exist_ok=True)
+    if create:
+        root.mkdir(parents=True, exist_ok=True)
     return root
 
 
@@ -162,16 +634,18 @@ def compute_psd(signal: np.ndarray, fs_hz: float) -> tuple[np.ndarray, np.ndarra
 
 
 def build_eye_traces(
-    samples: np.ndarray, sps: int, *, span_symbols: int = 2, max_traces: int = 128
+    samples: LazyArray, sps: int, *, span_symbols: int = 2, max_traces: int = 128
 ) -> np.ndarray:
-    samples = np.asarray(samples)
+    segment_len = int(span_symbols * sps)
+    if segment_len <= 0:
+        return np.array([])
+    # Only the first ``max_traces`` segments are used; slicing first keeps lazy
+    # (memory-mapped or chunked) inputs from being read in full.
+    samples = np.asarray(samples[: max_traces * segment_len])
     if samples.ndim > 1:
         samples = samples[:, 0]
     if samples.size == 0:
         return np.array([])
-    segment_len = int(span_symbols * sps)
-    if segment_len <= 0:
-        return np.array([])
     n_segments = samples.size // segment_len
     if n_segments <= 0:
         return np.array([])
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import Future, as_completed
+from typing import Any
+
+from fiber_link_sim.data_models.spec_models import SimulationResult
+from fiber_link_sim.simulate import simulate
+from fiber_link_sim.workers import (
+    SpecInput,
+    default_workers,
+    failure_result,
+    get_pool,
+    shutdown_pools,
+)
+
+
+def iter_simulate_many(
+    specs: Iterable[SpecInput], *, workers: int | None = None, chunksize: int = 1
+) -> Iterator[tuple[int, SimulationResult]]:
+    """Yield ``(index, result)`` pairs as chunks of specs complete on the warm pool.
+
+    Every spec gets a result: ``simulate()`` reports its own errors, and a chunk whose task
+    fails (including a crashed worker, which the pool replaces before its next task) yields
+    a ``runtime_error`` result for each of its specs. ``workers=0`` runs in this process.
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize must be >= 1")
+    spec_list = list(specs)
+    workers = default_workers() if workers is None else workers
+    if workers == 0:
+        for index, spec in enumerate(spec_list):
+            yield index, simulate(spec)
+        return
+
+    pool = get_pool(workers)
+    futures: dict[Future[list[dict[str, Any]]], range] = {}
+    for start in range(0, len(spec_list), chunksize):
+        indices = range(start, min(start + chunksize, len(spec_list)))
+        futures[pool.submit_specs([spec_list[index] for index in indices])] = indices
+    for future in as_completed(futures):
+        indices = futures[future]
+        try:
+            payloads = future.result()
+        except Exception as exc:
+            for index in indices:
+                yield index, failure_result(spec_list[index], exc)
+            continue
+        for index, payload in zip(indices, payloads, strict=True):
+            yield index, SimulationResult.model_validate(payload)
+
+
+def simulate_many(
+    specs: Sequence[SpecInput], *, workers: int | None = None, chunksize: int = 1
+) -> list[SimulationResult]:
+    """Simulate ``specs`` on a reusable process pool and return results in input order.
+
+    ``workers`` defaults to ``FIBER_LINK_SIM_BATCH_WORKERS`` or the CPU count. Workers are
+    spawned once, import OptiCommPy once, and are reused by later calls with the same count
+    (see ``fiber_link_sim.workers.WorkerPool`` for recycling and crash handling).
+    ``chunksize`` specs are sent per task to amortize IPC for small specs.
+    """
+    results: list[SimulationResult | None] = [None] * len(specs)
+    for index, result in iter_simulate_many(specs, workers=workers, chunksize=chunksize):
+        results[index] = result
+    return [result for result in results if result is not None]
+
+
+__all__ = ["default_workers", "get_pool", "iter_simulate_many", "shutdown_pools", "simulate_many"]
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
 import os
-from collections.abc import Iterator
+import subprocess
+import sys
+import time
+from collections.abc import Iterator, Sequence
 from contextlib import contextmanager
 
+DEFAULT_CLI_STARTUP_BUDGET_S = 1.5
+CLI_HELP_COMMAND = (sys.executable, "-m", "fiber_link_sim.cli", "--help")
+
 
 @contextmanager
 def env_overrides(pairs: dict[str, str]) -> Iterator[None]:
@@ -19,3 +25,19 @@ def env_overrides(pairs: dict[str, str]) -> Iterator[None]:
                 os.environ.pop(key, None)
             else:
                 os.environ[key] = previous
+
+
+def cli_startup_budget_s() -> float:
+    """``FIBER_LINK_SIM_CLI_STARTUP_BUDGET_S`` or the default wall-clock budget for ``--help``."""
+    value = os.getenv("FIBER_LINK_SIM_CLI_STARTUP_BUDGET_S", "").strip()
+    return float(value) if value else DEFAULT_CLI_STARTUP_BUDGET_S
+
+
+def time_command(argv: Sequence[str], repeat: int = 3) -> list[float]:
+    """Wall-clock seconds for ``repeat`` fresh runs of ``argv`` (each a cold interpreter)."""
+    timings_s: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(argv, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings_s.append(time.perf_counter() - start)
+    return timings_s
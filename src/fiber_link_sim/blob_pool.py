@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from itertools import chain
+from pathlib import Path, PurePosixPath
+from typing import Any, Literal, cast
+
+import numpy as np
+
+from fiber_link_sim.chunked import (
+    CHUNK_INDEX,
+    DEFAULT_CHUNK_BYTES,
+    chunk_rows,
+    chunked_nbytes,
+    split_chunks,
+    write_chunked,
+)
+
+BLOB_POOL_DIRNAME = "blob_pool"
+# Lineage digests name a stage output by how it was produced rather than by its bytes. They
+# carry this prefix and live under their own directory so they can never alias a content digest.
+LINEAGE_PREFIX = "lineage-"
+LINEAGE_DIRNAME = "lineage"
+DEFAULT_ORPHAN_GRACE_S = 3600.0
+
+# ``chunked`` blobs are directories of fixed-size ``.npy`` chunks plus ``index.json``.
+BlobCodec = Literal["npz", "npy", "chunked"]
+
+
+@dataclass(frozen=True, slots=True)
+class BlobPool:
+    """Content-addressed blob files shared by every run under one artifacts directory.
+
+    Blobs live at ``<base>/blob_pool/<digest[:2]>/<digest>.<codec>`` and are referenced as
+    ``blob://blob_pool/...`` so they resolve against the same base directory as run roots.
+    Lineage digests (``LINEAGE_PREFIX``) go to ``<base>/blob_pool/lineage/`` instead.
+    Identical arrays written by different runs are stored once; a hit only refreshes the
+    file's mtime, which the garbage collector uses as the orphan grace clock.
+    """
+
+    root: Path
+
+    def relative_path(self, digest: str, codec: BlobCodec) -> str:
+        return "/".join((self.root.name, *_location(digest, codec)))
+
+    def ref_for(self, digest: str, codec: BlobCodec) -> str:
+        return f"blob://{self.relative_path(digest, codec)}"
+
+    def path_for(self, digest: str, codec: BlobCodec) -> Path:
+        return self.root.joinpath(*_location(digest, codec))
+
+    @staticmethod
+    def locate(ref: str) -> tuple[str, BlobCodec]:
+        """The digest and codec a pool ref was made from (the inverse of ``ref_for``)."""
+        relative = PurePosixPath(ref.removeprefix("blob://"))
+        digest = relative.stem
+        if relative.parent.parent.name == LINEAGE_DIRNAME:
+            digest = LINEAGE_PREFIX + digest
+        return digest, cast(BlobCodec, relative.suffix[1:])
+
+    def put(
+        self,
+        digest: str,
+        array: np.ndarray,
+        codec: BlobCodec,
+        *,
+        chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    ) -> tuple[str, int]:
+        path = self.path_for(digest, codec)
+        hit = self._touch(path)
+        if hit is not None:
+            return self.ref_for(digest, codec), hit
+        if codec == "chunked":
+            write_chunked(path, split_chunks(array, chunk_rows(array, chunk_bytes)))
+            return self.ref_for(digest, codec), chunked_nbytes(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Concurrent runs may write the same digest; write aside and rename into place.
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{digest}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                if codec == "npy":
+                    np.save(handle, array, allow_pickle=False)
+                else:
+                    np.savez_compressed(handle, data=array)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        return self.ref_for(digest, codec), path.stat().st_size
+
+    def put_chunks(
+        self, chunks: Iterable[np.ndarray], digest: str | None = None
+    ) -> tuple[str, int, dict[str, Any]]:
+        """Stream ``chunks`` into a chunked blob without materializing the whole array.
+
+        Without a precomputed ``digest`` the content digest is accumulated while writing
+        and the store is renamed to its content address afterwards.
+        """
+        if digest is not None and self._touch(self.path_for(digest, "chunked")) is not None:
+            path = self.path_for(digest, "chunked")
+            index = json.loads((path / CHUNK_INDEX).read_text())
+            return self.ref_for(digest, "chunked"), chunked_nbytes(path), index
+        staging = self.root / f".staging-{uuid.uuid4().hex}"
+        index, content_digest = write_chunked(staging, chunks)
+        digest = digest or content_digest
+        path = self.path_for(digest, "chunked")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.rename(staging, path)
+        except OSError:
+            if not (path / CHUNK_INDEX).exists():
+                raise
+            shutil.rmtree(staging, ignore_errors=True)
+        return self.ref_for(digest, "chunked"), chunked_nbytes(path), index
+
+    @staticmethod
+    def _touch(path: Path) -> int | None:
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        if path.is_dir():
+            if not (path / CHUNK_INDEX).exists():
+                return None
+            return chunked_nbytes(path)
+        return path.stat().st_size
+
+
+def _location(digest: str, codec: BlobCodec) -> tuple[str, ...]:
+    if digest.startswith(LINEAGE_PREFIX):
+        name = digest.removeprefix(LINEAGE_PREFIX)
+        return (LINEAGE_DIRNAME, name[:2], f"{name}.{codec}")
+    return (digest[:2], f"{digest}.{codec}")
+
+
+@dataclass(slots=True)
+class GarbageCollectionReport:
+    total_bytes_before: int = 0
+    total_bytes_after: int = 0
+    removed_runs: list[str] = field(default_factory=list)
+    removed_blobs: int = 0
+    freed_bytes: int = 0
+    dry_run: bool = False
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "total_bytes_before": self.total_bytes_before,
+            "total_bytes_after": self.total_bytes_after,
+            "removed_runs": list(self.removed_runs),
+            "removed_blobs": self.removed_blobs,
+            "freed_bytes": self.freed_bytes,
+            "dry_run": self.dry_run,
+        }
+
+
+def parse_byte_size(value: str) -> int:
+    """Parse sizes such as ``500000``, ``512M`` or ``20G`` (binary multiples)."""
+    text = value.strip().upper().removesuffix("B")
+    multipliers = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+    if text and text[-1] in multipliers:
+        return int(float(text[:-1]) * multipliers[text[-1]])
+    return int(text)
+
+
+def collect_garbage(
+    base_dir: Path,
+    max_bytes: int,
+    *,
+    dry_run: bool = False,
+    orphan_grace_s: float = DEFAULT_ORPHAN_GRACE_S,
+) -> GarbageCollectionReport:
+    """Shrink an artifacts directory to ``max_bytes``.
+
+    Pool blobs are reference-counted through the ``refs`` list of each run's
+    ``run_manifest.json``. Unreferenced blobs older than ``orphan_grace_s`` are removed
+    first (younger ones may belong to a run that has not written its manifest yet); then
+    whole runs are evicted least-recently-used first, by manifest mtime, and each blob is
+    deleted once its last referencing run is gone. Runs without a manifest are treated as
+    in progress until they are ``orphan_grace_s`` old.
+    """
+    report = GarbageCollectionReport(dry_run=dry_run)
+    if not base_dir.exists():
+        return report
+    pool = BlobPool(base_dir / BLOB_POOL_DIRNAME)
+    now = time.time()
+
+    blob_sizes: dict[Path, int] = {}
+    blob_mtimes: dict[Path, float] = {}
+    if pool.root.exists():
+        for path in chain(pool.root.glob("*/*"), pool.root.glob(f"{LINEAGE_DIRNAME}/*/*")):
+            if path.name.startswith(".") or path.parent.name.startswith("."):
+                continue  # in-flight temp files and staging directories
+            if path.is_file():
+                blob_sizes[path] = path.stat().st_size
+            elif (path / CHUNK_INDEX).exists():
+                blob_sizes[path] = chunked_nbytes(path)
+            else:
+                continue
+            blob_mtimes[path] = path.stat().st_mtime
+
+    runs: list[tuple[float, Path, int, set[Path]]] = []
+    refcounts: dict[Path, int] = {}
+    for run_dir in base_dir.iterdir():
+        if not run_dir.is_dir() or run_dir.name == BLOB_POOL_DIRNAME:
+            continue
+        manifest_path = run_dir / "run_manifest.json"
+        blobs = _manifest_pool_blobs(manifest_path, base_dir)
+        for blob in blobs:
+            refcounts[blob] = refcounts.get(blob, 0) + 1
+        last_used = (manifest_path if manifest_path.exists() else run_dir).stat().st_mtime
+        runs.append((last_used, run_dir, _tree_size(run_dir), blobs))
+
+    total = sum(blob_sizes.values()) + sum(size for _, _, size, _ in runs)
+    report.total_bytes_before = total
+
+    def _drop_blob(path: Path) -> None:
+        nonlocal total
+        size = blob_sizes.pop(path, None)
+        if size is None:
+            return
+        if not dry_run:
+            if path.is_dir():
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                path.unlink(missing_ok=True)
+        total -= size
+        report.removed_blobs += 1
+        report.freed_bytes += size
+
+    for path in sorted(blob_sizes, key=blob_mtimes.__getitem__):
+        if total <= max_bytes:
+            break
+        if refcounts.get(path, 0) == 0 and now - blob_mtimes[path] >= orphan_grace_s:
+            _drop_blob(path)
+
+    for last_used, run_dir, size, blobs in sorted(runs, key=lambda run: run[0]):
+        if total <= max_bytes:
+            break
+        if not (run_dir / "run_manifest.json").exists() and now - last_used < orphan_grace_s:
+            continue  # probably still running
+        if not dry_run:
+            shutil.rmtree(run_dir, ignore_errors=True)
+        total -= size
+        report.freed_bytes += size
+        report.removed_runs.append(run_dir.name)
+        for blob in blobs:
+            refcounts[blob] -= 1
+            if refcounts[blob] == 0:
+                _drop_blob(blob)
+
+    report.total_bytes_after = total
+    return report
+
+
+def _manifest_pool_blobs(manifest_path: Path, base_dir: Path) -> set[Path]:
+    try:
+        manifest = json.loads(manifest_path.read_text())
+    except (OSError, ValueError):
+        return set()
+    blobs: set[Path] = set()
+    prefix = f"blob://{BLOB_POOL_DIRNAME}/"
+    for entry in manifest.get("refs", []):
+        ref = entry.get("ref", "") if isinstance(entry, dict) else ""
+        if ref.startswith(prefix):
+            blobs.add(base_dir / ref.removeprefix("blob://"))
+    return blobs
+
+
+def _tree_size(path: Path) -> int:
+    return sum(item.stat().st_size for item in path.rglob("*") if item.is_file())
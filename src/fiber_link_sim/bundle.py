@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import uuid
+from collections.abc import Iterable
+from pathlib import Path
+from typing import IO, Any
+
+import numpy as np
+
+BUNDLE_FILENAME = "bundle.bin"
+BUNDLE_VERSION = 1
+
+_MAGIC = b"FLSBNDL1"
+_FOOTER_LEN = 16  # 8-byte index length + magic
+_ALIGN = 64
+
+
+class BundleWriter:
+    """Append named arrays to a single per-run container file.
+
+    Members are stored as raw C-order bytes aligned to 64 bytes; ``index()`` returns the
+    offset table (dtype, shape, offset, nbytes per member) that run manifests embed, and
+    ``finalize()`` also appends it as a JSON footer so the file is self-describing. Members
+    are written to a private temporary file next to ``path`` (see ``location``) that
+    ``finalize()`` renames over ``path``, so concurrent runs of the same spec never write
+    into one file and readers only ever see complete bundles. Appends are serialized with a
+    lock so write-behind threads can share one writer.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.members: dict[str, dict[str, Any]] = {}
+        self._partial = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        self._handle: IO[bytes] | None = None
+        self._started = False
+        self._finalized = False
+        self._lock = threading.Lock()
+
+    @property
+    def location(self) -> Path:
+        """The file holding the members: the temporary file until ``finalize()``."""
+        return self.path if self._finalized else self._partial
+
+    def append(self, member: str, array: np.ndarray) -> dict[str, Any]:
+        array = np.asarray(array)
+        return self.append_chunks(member, [array], dtype=array.dtype, tail=array.shape[1:])
+
+    def append_chunks(
+        self,
+        member: str,
+        chunks: Iterable[np.ndarray],
+        *,
+        dtype: np.dtype[Any] | None = None,
+        tail: tuple[int, ...] | None = None,
+    ) -> dict[str, Any]:
+        """Append chunks split along axis 0 as one contiguous member."""
+        with self._lock:
+            handle = self._open()
+            offset = _align(handle)
+            rows = 0
+            scalar_shape: tuple[int, ...] | None = None
+            for chunk in chunks:
+                chunk = np.ascontiguousarray(chunk)
+                if chunk.dtype.hasobject:
+                    raise ValueError(f"bundle member {member!r} has an object dtype")
+                if dtype is None:
+                    dtype = chunk.dtype
+                if tail is None:
+                    tail = chunk.shape[1:]
+                if chunk.dtype != dtype or chunk.shape[1:] != tail:
+                    raise ValueError("chunks must share dtype and trailing shape")
+                if chunk.ndim == 0:
+                    scalar_shape = ()
+                rows += int(chunk.shape[0]) if chunk.ndim else 1
+                handle.write(chunk.data)
+            if dtype is None:
+                raise ValueError(f"bundle member {member!r} has no data")
+            shape = scalar_shape if scalar_shape is not None else (rows, *(tail or ()))
+            entry = {
+                "offset": offset,
+                "nbytes": handle.tell() - offset,
+                "dtype": np.lib.format.dtype_to_descr(dtype),
+                "shape": list(shape),
+            }
+            self.members[member] = entry
+            return dict(entry)
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._handle is not None:
+                self._handle.flush()
+
+    def index(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "path": self.path.name,
+                "version": BUNDLE_VERSION,
+                "members": {name: dict(entry) for name, entry in self.members.items()},
+            }
+
+    def finalize(self) -> dict[str, Any]:
+        """Append the JSON footer, close the file, and return the offset table."""
+        index = self.index()
+        with self._lock:
+            if not self._started:
+                return index
+            handle = self._open()
+            handle.seek(0, 2)
+            payload = json.dumps(index, sort_keys=True).encode()
+            handle.write(payload)
+            handle.write(len(payload).to_bytes(8, "big"))
+            handle.write(_MAGIC)
+            handle.close()
+            self._handle = None
+            if not self._finalized:
+                os.replace(self._partial, self.path)
+                self._finalized = True
+        return index
+
+    def discard(self) -> None:
+        """Close and delete an unfinalized bundle, e.g. after a failed run."""
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+            if not self._finalized:
+                self._partial.unlink(missing_ok=True)
+
+    def _open(self) -> IO[bytes]:
+        if self._handle is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._handle = self.location.open("r+b" if self._started else "wb")
+            self._handle.seek(0, 2)
+            self._started = True
+        return self._handle
+
+    def __getstate__(self) -> dict[str, Any]:
+        with self._lock:
+            if self._handle is not None:
+                self._handle.flush()
+            return {
+                "path": self.path,
+                "partial": self._partial,
+                "members": self.members,
+                "started": self._started,
+                "finalized": self._finalized,
+            }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(state["path"])  # type: ignore[misc]
+        self._partial = state["partial"]
+        self.members = state["members"]
+        self._started = state["started"]
+        self._finalized = state["finalized"]
+
+
+class BundleReader:
+    """Random access to bundle members with one seek and one read per array.
+
+    Pass the offset table from the run manifest as ``index`` to skip reading the footer.
+    """
+
+    def __init__(self, path: Path, index: dict[str, Any] | None = None) -> None:
+        self.path = path
+        self._index = index if index is not None else read_bundle_index(path)
+
+    @property
+    def members(self) -> dict[str, dict[str, Any]]:
+        return dict(self._index["members"])
+
+    def read(self, member: str) -> np.ndarray:
+        entry = self._entry(member)
+        with self.path.open("rb") as handle:
+            handle.seek(int(entry["offset"]))
+            data = handle.read(int(entry["nbytes"]))
+        dtype = np.lib.format.descr_to_dtype(entry["dtype"])
+        return np.frombuffer(data, dtype=dtype).reshape(entry["shape"])
+
+    def memmap(self, member: str) -> np.ndarray:
+        entry = self._entry(member)
+        dtype = np.lib.format.descr_to_dtype(entry["dtype"])
+        return np.memmap(
+            self.path,
+            dtype=dtype,
+            mode="r",
+            offset=int(entry["offset"]),
+            shape=tuple(entry["shape"]),
+        )
+
+    def read_group(self, prefix: str) -> dict[str, np.ndarray]:
+        """Read every member stored as ``<prefix>/<key>`` (e.g. one NPZ-style artifact)."""
+        start = f"{prefix}/"
+        return {
+            name.removeprefix(start): self.read(name)
+            for name in self._index["members"]
+            if name.startswith(start)
+        }
+
+    def _entry(self, member: str) -> dict[str, Any]:
+        try:
+            return dict(self._index["members"][member])
+        except KeyError:
+            raise KeyError(f"{member!r} is not in bundle {self.path}") from None
+
+
+def read_bundle_index(path: Path) -> dict[str, Any]:
+    with path.open("rb") as handle:
+        handle.seek(-_FOOTER_LEN, 2)
+        footer = handle.read(_FOOTER_LEN)
+        if footer[8:] != _MAGIC:
+            raise ValueError(f"{path} has no bundle footer (was the run finalized?)")
+        length = int.from_bytes(footer[:8], "big")
+        handle.seek(-(_FOOTER_LEN + length), 2)
+        index: dict[str, Any] = json.loads(handle.read(length))
+    return index
+
+
+def _align(handle: IO[bytes]) -> int:
+    position = handle.tell()
+    padding = -position % _ALIGN
+    if padding:
+        handle.write(b"\0" * padding)
+    return position + padding
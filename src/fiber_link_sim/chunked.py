@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+CHUNK_INDEX = "index.json"
+DEFAULT_CHUNK_BYTES = 16 << 20
+
+
+def chunk_rows(array: np.ndarray, chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> int:
+    """Rows (along axis 0) per chunk so that each chunk holds about ``chunk_bytes``."""
+    row_bytes = max(1, array.itemsize * int(np.prod(array.shape[1:], dtype=np.int64)))
+    return max(1, chunk_bytes // row_bytes)
+
+
+def split_chunks(array: np.ndarray, rows: int) -> Iterator[np.ndarray]:
+    array = np.asarray(array)
+    if array.ndim == 0:
+        array = array.reshape(1)
+    for start in range(0, max(array.shape[0], 1), rows):
+        yield array[start : start + rows]
+
+
+def write_chunked(directory: Path, chunks: Iterable[np.ndarray]) -> tuple[dict[str, Any], str]:
+    """Write ``chunks`` (split along axis 0) as ``chunk-NNNNN.npy`` files plus an index.
+
+    The directory is assembled under a temporary name and renamed into place, so readers
+    never observe a partial store; if another writer got there first its copy is kept.
+    Returns the index and a SHA-256 content digest accumulated while streaming.
+    """
+    directory.parent.mkdir(parents=True, exist_ok=True)
+    tmp_dir = Path(tempfile.mkdtemp(dir=directory.parent, prefix=f".{directory.name}."))
+    digest = hashlib.sha256()
+    lengths: list[int] = []
+    dtype: np.dtype[Any] | None = None
+    tail: tuple[int, ...] = ()
+    try:
+        for idx, chunk in enumerate(chunks):
+            chunk = np.ascontiguousarray(chunk)
+            if chunk.ndim == 0:
+                chunk = chunk.reshape(1)
+            if dtype is None:
+                dtype, tail = chunk.dtype, chunk.shape[1:]
+                digest.update(str(dtype).encode())
+            elif chunk.dtype != dtype or chunk.shape[1:] != tail:
+                raise ValueError("chunks must share dtype and trailing shape")
+            np.save(tmp_dir / _chunk_name(idx), chunk, allow_pickle=False)
+            digest.update(chunk.data)
+            lengths.append(int(chunk.shape[0]))
+        if dtype is None:
+            raise ValueError("cannot write an empty chunk sequence")
+        shape = (sum(lengths), *tail)
+        digest.update(str(shape).encode())
+        index = {
+            "version": 1,
+            "dtype": np.lib.format.dtype_to_descr(dtype),
+            "shape": list(shape),
+            "chunk_lengths": lengths,
+        }
+        (tmp_dir / CHUNK_INDEX).write_text(json.dumps(index, sort_keys=True))
+        try:
+            os.rename(tmp_dir, directory)
+        except OSError:
+            if not (directory / CHUNK_INDEX).exists():
+                raise
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return index, digest.hexdigest()
+
+
+def chunked_nbytes(directory: Path) -> int:
+    return sum(path.stat().st_size for path in directory.iterdir() if path.is_file())
+
+
+class ChunkedArray:
+    """Lazy, read-only view of a chunked store directory.
+
+    Slicing along axis 0 only opens the chunks it touches (memory-mapped), ``iter_chunks``
+    streams the signal one chunk at a time, and ``np.asarray`` materializes it.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        index = json.loads((directory / CHUNK_INDEX).read_text())
+        self.directory = directory
+        self.dtype = np.dtype(np.lib.format.descr_to_dtype(index["dtype"]))
+        self.shape: tuple[int, ...] = tuple(int(dim) for dim in index["shape"])
+        self.chunk_lengths: list[int] = [int(length) for length in index["chunk_lengths"]]
+        self._offsets = np.concatenate([[0], np.cumsum(self.chunk_lengths)]).astype(np.int64)
+
+    @property
+    def ndim(self) -> int:
+        return len(self.shape)
+
+    @property
+    def size(self) -> int:
+        return int(np.prod(self.shape, dtype=np.int64))
+
+    @property
+    def nbytes(self) -> int:
+        return self.size * self.dtype.itemsize
+
+    @property
+    def n_chunks(self) -> int:
+        return len(self.chunk_lengths)
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def chunk(self, idx: int) -> np.ndarray:
+        return np.load(self.directory / _chunk_name(idx), mmap_mode="r", allow_pickle=False)
+
+    def iter_chunks(self) -> Iterator[np.ndarray]:
+        for idx in range(self.n_chunks):
+            yield self.chunk(idx)
+
+    def __iter__(self) -> Iterator[Any]:
+        for chunk in self.iter_chunks():
+            yield from chunk
+
+    def __getitem__(self, key: Any) -> Any:
+        rest: tuple[Any, ...] = ()
+        if isinstance(key, tuple):
+            key, rest = (key[0], key[1:]) if key else (slice(None), ())
+        if isinstance(key, (int, np.integer)):
+            row = int(key) + (self.shape[0] if key < 0 else 0)
+            if not 0 <= row < self.shape[0]:
+                raise IndexError("index out of range")
+            idx = int(np.searchsorted(self._offsets, row, side="right")) - 1
+            value = self.chunk(idx)[row - self._offsets[idx]]
+            return value[rest] if rest else value
+        if not isinstance(key, slice):
+            return np.asarray(self)[(key, *rest)]
+        start, stop, step = key.indices(self.shape[0])
+        if step < 0:
+            return np.asarray(self)[(key, *rest)]
+        rows = self._read_rows(start, max(start, stop))[::step]
+        return rows[(slice(None), *rest)] if rest else rows
+
+    def __array__(self, dtype: Any = None, copy: bool | None = None) -> np.ndarray:
+        array = self._read_rows(0, self.shape[0])
+        return array.astype(dtype, copy=False) if dtype is not None else array
+
+    def _read_rows(self, start: int, stop: int) -> np.ndarray:
+        first = int(np.searchsorted(self._offsets, start, side="right")) - 1
+        parts = []
+        for idx in range(max(first, 0), self.n_chunks):
+            lo, hi = int(self._offsets[idx]), int(self._offsets[idx + 1])
+            if lo >= stop:
+                break
+            chunk = self.chunk(idx)
+            parts.append(chunk[max(start, lo) - lo : min(stop, hi) - lo])
+        if not parts:
+            return np.empty((0, *self.shape[1:]), dtype=self.dtype)
+        return np.concatenate(parts, axis=0)
+
+    def __repr__(self) -> str:
+        return (
+            f"ChunkedArray(shape={self.shape}, dtype={self.dtype}, "
+            f"n_chunks={self.n_chunks}, directory={str(self.directory)!r})"
+        )
+
+
+def _chunk_name(idx: int) -> str:
+    return f"chunk-{idx:05d}.npy"
@@ -2,16 +2,30 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 import sys
 from pathlib import Path
 from typing import Any
 
-from fiber_link_sim.simulate import simulate
+from fiber_link_sim.client import (
+    ServerError,
+    ServerUnavailable,
+    default_address,
+    run_context,
+    simulate_remote,
+)
+
+# Physics and storage modules are imported where they are used, so forwarding a spec to a
+# running `fiber-link-sim serve` stays cheap.
 
 
 def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Run a fiber link simulation from a spec file.",
+        epilog=(
+            "Run `fiber-link-sim gc --help` to clean up the artifacts directory and "
+            "`fiber-link-sim serve --help` to keep a warm simulation daemon running."
+        ),
     )
     parser.add_argument(
         "spec",
@@ -25,9 +39,102 @@ def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         default=None,
         help="Optional path to write the SimulationResult JSON output.",
     )
+    parser.add_argument(
+        "--local",
+        action="store_true",
+        help="Simulate in this process even if a `fiber-link-sim serve` daemon is running.",
+    )
+    return parser.parse_args(argv)
+
+
+def _parse_serve_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="fiber-link-sim serve",
+        description="Keep imports and a worker pool warm and serve simulations over HTTP.",
+    )
+    parser.add_argument(
+        "--address",
+        default=None,
+        help=(
+            "unix:/path/to.sock or host:port (default: $FIBER_LINK_SIM_SERVER or a per-user "
+            "Unix socket in the temp directory)."
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes (default: $FIBER_LINK_SIM_BATCH_WORKERS or the CPU count).",
+    )
+    parser.add_argument(
+        "--in-process",
+        action="store_true",
+        help="Run simulations on the server's request threads instead of the worker pool.",
+    )
+    parser.add_argument("--verbose", action="store_true", help="Log every request.")
     return parser.parse_args(argv)
 
 
+def _run_serve(argv: list[str]) -> int:
+    from fiber_link_sim.server import serve
+
+    args = _parse_serve_args(argv)
+    address = args.address or default_address()
+    sys.stderr.write(f"fiber-link-sim serving on {address}\n")
+    serve(address, workers=args.workers, isolate=not args.in_process, verbose=args.verbose)
+    return 0
+
+
+def _parse_gc_args(argv: list[str]) -> argparse.Namespace:
+    from fiber_link_sim.blob_pool import DEFAULT_ORPHAN_GRACE_S, parse_byte_size
+
+    parser = argparse.ArgumentParser(
+        prog="fiber-link-sim gc",
+        description="Evict old runs and unreferenced blobs from an artifacts directory.",
+    )
+    parser.add_argument(
+        "--root",
+        type=Path,
+        default=Path("artifacts"),
+        help="Artifacts directory to collect (default: ./artifacts).",
+    )
+    parser.add_argument(
+        "--max-bytes",
+        type=parse_byte_size,
+        default=os.getenv("FIBER_LINK_SIM_ARTIFACT_MAX_BYTES"),
+        help="Byte budget, e.g. 500M or 20G (default: $FIBER_LINK_SIM_ARTIFACT_MAX_BYTES).",
+    )
+    parser.add_argument(
+        "--orphan-grace-s",
+        type=float,
+        default=DEFAULT_ORPHAN_GRACE_S,
+        help="Minimum age before unreferenced blobs and manifest-less runs are removed.",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Report what would be removed without deleting anything.",
+    )
+    args = parser.parse_args(argv)
+    if args.max_bytes is None:
+        parser.error("--max-bytes or FIBER_LINK_SIM_ARTIFACT_MAX_BYTES is required")
+    return args
+
+
+def _run_gc(argv: list[str]) -> int:
+    from fiber_link_sim.blob_pool import collect_garbage
+
+    args = _parse_gc_args(argv)
+    report = collect_garbage(
+        args.root,
+        args.max_bytes,
+        dry_run=args.dry_run,
+        orphan_grace_s=args.orphan_grace_s,
+    )
+    _write_result(report.to_dict(), None)
+    return 0
+
+
 def _write_result(payload: dict[str, Any], output: Path | None) -> None:
     if output is None:
         json.dump(payload, sys.stdout, indent=2, sort_keys=True)
@@ -38,11 +145,54 @@ def _write_result(payload: dict[str, Any], output: Path | None) -> None:
     output.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n")
 
 
+def _forward(spec_path: Path, address: str) -> dict[str, Any] | None:
+    """The result from a running daemon, or ``None`` to simulate locally.
+
+    Only readable JSON objects are forwarded; anything else is left to the local run, which
+    reports it as a ``validation_error``. The daemon only runs specs from clients that share
+    its working directory and settings, so a forwarded result matches a local one. Failures
+    after the daemon accepted the spec propagate instead of running it a second time.
+    """
+    if address.startswith("unix:") and not os.path.exists(address.removeprefix("unix:")):
+        return None
+    try:
+        spec = json.loads(spec_path.read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(spec, dict):
+        return None
+    try:
+        return simulate_remote(spec, address, context=run_context())
+    except (ServerUnavailable, ServerError):
+        return None
+
+
+def _simulate_locally(spec_path: Path) -> dict[str, Any]:
+    from fiber_link_sim.simulate import simulate
+
+    return simulate(spec_path).model_dump(mode="json")
+
+
 def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "gc":
+        return _run_gc(argv[1:])
+    if argv and argv[0] == "serve":
+        return _run_serve(argv[1:])
     args = _parse_args(argv)
-    result = simulate(args.spec)
-    _write_result(result.model_dump(mode="json"), args.output)
-    return 0 if result.status == "success" else 1
+    address = default_address()
+    try:
+        payload = None if args.local else _forward(args.spec, address)
+    except OSError as exc:
+        sys.stderr.write(
+            f"fiber-link-sim: lost the server at {address} after it accepted the spec ({exc}); "
+            "rerun with --local to simulate here\n"
+        )
+        return 1
+    if payload is None:
+        payload = _simulate_locally(args.spec)
+    _write_result(payload, args.output)
+    return 0 if payload.get("status") == "success" else 1
 
 
 if __name__ == "__main__":
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import http.client
+import json
+import os
+import socket
+import tempfile
+from pathlib import Path
+from typing import Any
+
+# Keep this module to the standard library: the CLI imports it to forward specs to a running
+# `fiber-link-sim serve` without paying for numpy, pydantic or OptiCommPy.
+
+DEFAULT_TCP_ADDRESS = "127.0.0.1:8765"
+CONTEXT_HEADER = "X-Fiber-Link-Sim-Context"
+# Slack on top of the spec's ``runtime.max_runtime_s`` for queueing and the response.
+REMOTE_TIMEOUT_GRACE_S = 60.0
+
+# Settings that only shape the daemon's process management, never a run's outputs.
+_PROCESS_SETTINGS = frozenset(
+    {
+        "FIBER_LINK_SIM_SERVER",
+        "FIBER_LINK_SIM_ISOLATE",
+        "FIBER_LINK_SIM_NO_SUBPROCESS",
+        "FIBER_LINK_SIM_BATCH_WORKERS",
+        "FIBER_LINK_SIM_WORKER_MAX_RUNS",
+        "FIBER_LINK_SIM_CLI_STARTUP_BUDGET_S",
+    }
+)
+
+
+class ServerError(RuntimeError):
+    """The server answered, but not with a result (bad request, unknown path, ...)."""
+
+    def __init__(self, message: str, status: int | None = None) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class ServerUnavailable(ConnectionError):
+    """Nothing accepted a connection at the address, so no request was sent."""
+
+
+def default_address() -> str:
+    """``$FIBER_LINK_SIM_SERVER``, else a per-user Unix socket (or localhost TCP without one)."""
+    value = os.getenv("FIBER_LINK_SIM_SERVER", "").strip()
+    if value:
+        return value
+    if not hasattr(socket, "AF_UNIX"):
+        return DEFAULT_TCP_ADDRESS
+    user = getattr(os, "getuid", lambda: "user")()
+    return f"unix:{Path(tempfile.gettempdir()) / f'fiber-link-sim-{user}.sock'}"
+
+
+def parse_address(address: str) -> tuple[str, Any]:
+    """Split ``unix:/path``, ``http://host:port`` or ``host:port`` into ``(family, target)``."""
+    if address.startswith("unix:"):
+        return "unix", address.removeprefix("unix:")
+    host, _, port = address.removeprefix("http://").rstrip("/").rpartition(":")
+    if not host or not port.isdigit():
+        raise ValueError(f"invalid server address: {address!r}")
+    return "tcp", (host, int(port))
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: str, timeout: float | None = None) -> None:
+        super().__init__("localhost", timeout=timeout)
+        self._path = path
+
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self._path)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+
+
+def run_context() -> dict[str, Any]:
+    """What a run's outputs depend on besides the spec.
+
+    Relative artifact and cache paths resolve against the working directory, and every
+    ``FIBER_LINK_SIM_*`` setting outside process management can change what a run writes.
+    A daemon only accepts forwarded specs whose context matches its own.
+    """
+    settings = {
+        key: value
+        for key, value in sorted(os.environ.items())
+        if key.startswith("FIBER_LINK_SIM_") and key not in _PROCESS_SETTINGS
+    }
+    return {"cwd": os.getcwd(), "settings": settings}
+
+
+def _connection(address: str, timeout: float | None) -> http.client.HTTPConnection:
+    family, target = parse_address(address)
+    if family == "unix":
+        return _UnixHTTPConnection(target, timeout=timeout)
+    host, port = target
+    return http.client.HTTPConnection(host, port, timeout=timeout)
+
+
+def request(
+    address: str,
+    method: str,
+    path: str,
+    payload: Any = None,
+    *,
+    timeout: float | None = None,
+    headers: dict[str, str] | None = None,
+) -> dict[str, Any]:
+    """Send one JSON request and return the decoded JSON response.
+
+    Raises ``ServerUnavailable`` when nothing is listening at ``address`` and ``ServerError``
+    for a non-200 answer. Any other ``OSError`` (a timeout, a dropped connection) happened
+    after the request may have reached the server.
+    """
+    connection = _connection(address, timeout)
+    try:
+        try:
+            connection.connect()
+        except OSError as exc:
+            raise ServerUnavailable(f"no server at {address}: {exc}") from exc
+        body = None if payload is None else json.dumps(payload).encode()
+        request_headers = {"Content-Type": "application/json"} if body is not None else {}
+        request_headers.update(headers or {})
+        connection.request(method, path, body=body, headers=request_headers)
+        response = connection.getresponse()
+        data = json.loads(response.read() or b"{}")
+    finally:
+        connection.close()
+    if response.status != 200:
+        raise ServerError(data.get("error", f"HTTP {response.status}"), response.status)
+    return data
+
+
+def server_health(address: str | None = None, *, timeout: float = 1.0) -> dict[str, Any] | None:
+    """The server's health payload, or ``None`` when no server answers at ``address``."""
+    try:
+        return request(address or default_address(), "GET", "/health", timeout=timeout)
+    except (OSError, ServerError, ValueError):
+        return None
+
+
+def simulate_remote(
+    spec: dict[str, Any],
+    address: str | None = None,
+    *,
+    timeout: float | None = None,
+    context: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Run ``spec`` on a running server and return the ``SimulationResult`` JSON.
+
+    ``timeout`` defaults to the spec's ``runtime.max_runtime_s`` plus
+    ``REMOTE_TIMEOUT_GRACE_S``. With ``context`` (see ``run_context``) the server refuses
+    the spec with a 409 ``ServerError``, before running it, unless its own context matches.
+    """
+    if timeout is None:
+        timeout = _remote_timeout_s(spec)
+    headers = {}
+    if context is not None:
+        headers[CONTEXT_HEADER] = json.dumps(context, sort_keys=True)
+    return request(
+        address or default_address(),
+        "POST",
+        "/simulate",
+        spec,
+        timeout=timeout,
+        headers=headers,
+    )
+
+
+def _remote_timeout_s(spec: dict[str, Any]) -> float:
+    runtime = spec.get("runtime")
+    max_runtime_s = runtime.get("max_runtime_s") if isinstance(runtime, dict) else None
+    if isinstance(max_runtime_s, (int, float)) and max_runtime_s > 0:
+        return float(max_runtime_s) + REMOTE_TIMEOUT_GRACE_S
+    return REMOTE_TIMEOUT_GRACE_S
+
+
+__all__ = [
+    "CONTEXT_HEADER",
+    "DEFAULT_TCP_ADDRESS",
+    "REMOTE_TIMEOUT_GRACE_S",
+    "ServerError",
+    "ServerUnavailable",
+    "default_address",
+    "parse_address",
+    "request",
+    "run_context",
+    "server_health",
+    "simulate_remote",
+]
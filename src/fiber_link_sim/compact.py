@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Literal
+
+import numpy as np
+
+LlrFormat = Literal["float32", "int8"]
+
+LLR_FORMATS: tuple[LlrFormat, ...] = ("float32", "int8")
+_INT8_MAX = 127
+
+
+@dataclass(frozen=True, slots=True)
+class PackedBits:
+    """Hard decisions packed eight to a byte (``np.packbits`` big-endian bit order)."""
+
+    data: np.ndarray
+    n_bits: int
+
+    @classmethod
+    def from_bits(cls, bits: np.ndarray) -> PackedBits:
+        flat = np.asarray(bits).reshape(-1)
+        return cls(data=np.packbits(flat.astype(bool, copy=False)), n_bits=int(flat.size))
+
+    @property
+    def size(self) -> int:
+        return self.n_bits
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.data.nbytes)
+
+    def unpack(self) -> np.ndarray:
+        return np.unpackbits(self.data, count=self.n_bits)
+
+    def count_errors(self, other: PackedBits) -> int:
+        """Hamming distance over the common prefix, computed on the packed bytes."""
+        n_bits = min(self.n_bits, other.n_bits)
+        n_bytes = -(-n_bits // 8)
+        diff = np.bitwise_xor(self.data[:n_bytes], other.data[:n_bytes])
+        if n_bits % 8:
+            diff[-1] &= np.uint8(0xFF << (8 - n_bits % 8) & 0xFF)
+        return _popcount(diff)
+
+
+@dataclass(frozen=True, slots=True)
+class QuantizedLLRs:
+    """LLRs stored as int8 with one scale factor: ``llr ~= data * scale``."""
+
+    data: np.ndarray
+    scale: float
+
+    @property
+    def size(self) -> int:
+        return int(self.data.size)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.data.nbytes)
+
+    def dequantize(self) -> np.ndarray:
+        return self.data.astype(np.float32) * np.float32(self.scale)
+
+    def hard_decisions(self) -> PackedBits:
+        """Bit decisions (LLR < 0 means bit 1) without dequantizing."""
+        return PackedBits.from_bits(self.data < 0)
+
+
+def _popcount(data: np.ndarray) -> int:
+    # np.bitwise_count only exists from numpy 2.0 on; unpacking is the 1.x fallback.
+    if hasattr(np, "bitwise_count"):
+        return int(np.bitwise_count(data).sum())
+    return int(np.unpackbits(data).sum())
+
+
+def quantize_llrs(llrs: np.ndarray) -> QuantizedLLRs:
+    """Symmetric int8 quantization scaled to the largest finite magnitude."""
+    values = np.asarray(llrs, dtype=np.float32).reshape(-1)
+    finite = np.isfinite(values)
+    peak = float(np.max(np.abs(values[finite]))) if finite.any() else 0.0
+    scale = peak / _INT8_MAX if peak > 0.0 else 1.0
+    clipped = np.clip(
+        np.nan_to_num(values, nan=0.0, posinf=peak, neginf=-peak) / scale, -_INT8_MAX, _INT8_MAX
+    )
+    return QuantizedLLRs(data=np.rint(clipped).astype(np.int8), scale=scale)
+
+
+def compact_llrs(llrs: np.ndarray, llr_format: LlrFormat = "float32") -> np.ndarray | QuantizedLLRs:
+    if llr_format == "int8":
+        return quantize_llrs(llrs)
+    return np.asarray(llrs, dtype=np.float32).reshape(-1)
+
+
+def compact_symbols(symbols: np.ndarray) -> np.ndarray:
+    """Single precision symbols: complex64 for complex input, float32 for real floats."""
+    array = np.asarray(symbols)
+    if np.iscomplexobj(array):
+        return array.astype(np.complex64, copy=False)
+    if np.issubdtype(array.dtype, np.floating):
+        return array.astype(np.float32, copy=False)
+    return array
+
+
+def encode_compact(value: PackedBits | QuantizedLLRs) -> tuple[np.ndarray, dict[str, Any]]:
+    """Split a compact value into the array to store and the metadata to keep on its ref."""
+    if isinstance(value, PackedBits):
+        return value.data, {"compact": "packed_bits", "n_bits": value.n_bits}
+    return value.data, {"compact": "int8_llr", "scale": value.scale}
+
+
+def decode_compact(
+    array: np.ndarray, meta: dict[str, Any]
+) -> np.ndarray | PackedBits | QuantizedLLRs:
+    kind = meta.get("compact")
+    if kind == "packed_bits":
+        return PackedBits(data=np.asarray(array, dtype=np.uint8), n_bits=int(meta["n_bits"]))
+    if kind == "int8_llr":
+        return QuantizedLLRs(data=np.asarray(array, dtype=np.int8), scale=float(meta["scale"]))
+    return array
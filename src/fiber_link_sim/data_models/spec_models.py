@@ -207,7 +207,8 @@ class Processing(BaseModel):
 
 
 PropagationModel = Literal["scalar_glnse", "manakov"]
-PropagationBackend = Literal["builtin_ssfm"]
+StepMethod = Literal["nonlinear_phase", "logarithmic", "local_error"]
+PropagationBackend = Literal["builtin_ssfm", "native_ssfm", "gn_model"]
 
 
 class Effects(BaseModel):
@@ -223,6 +224,10 @@ class SSFM(BaseModel):
     model_config = ConfigDict(extra="forbid")
     dz_m: float = Field(100.0, gt=0)
     step_adapt: bool = False
+    step_method: StepMethod = "local_error"
+    max_nonlinear_phase_rad: float = Field(0.02, gt=0)
+    local_error_tol: float = Field(1e-5, gt=0)
+    pmd_sections_per_span: int = Field(10, ge=1)
 
 
 class Propagation(BaseModel):
@@ -231,6 +236,7 @@ class Propagation(BaseModel):
     backend: PropagationBackend = "builtin_ssfm"
     effects: Effects = Field(default_factory=Effects)
     ssfm: SSFM = Field(default_factory=SSFM)
+    linear_phase_threshold_rad: float = Field(1e-3, ge=0)
 
 
 class Runtime(BaseModel):
@@ -331,6 +337,8 @@ class SimulationSpec(BaseModel):
 
         if self.propagation.model == "manakov" and self.signal.n_pol != 2:
             raise ValueError("manakov propagation requires signal.n_pol == 2")
+        if self.propagation.backend == "gn_model" and fmt != "coherent_qpsk":
+            raise ValueError("propagation.backend 'gn_model' supports coherent_qpsk only")
         return self
 
 
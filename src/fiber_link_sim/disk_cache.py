@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import io
+import os
+import tempfile
+from collections.abc import Iterable
+from pathlib import Path
+from types import ModuleType, TracebackType
+from typing import cast
+
+try:
+    import fcntl as _fcntl
+except ImportError:  # pragma: no cover - Windows fallback
+    _fcntl = None  # type: ignore[assignment]
+
+fcntl: ModuleType | None = cast(ModuleType | None, _fcntl)
+
+
+class FileLock:
+    """Exclusive ``flock`` on ``path`` (a no-op where ``fcntl`` is unavailable)."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._fh: io.BufferedWriter | None = None
+
+    def __enter__(self) -> FileLock:
+        if fcntl is None:
+            return self
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = self.path.open("ab")
+        fcntl.flock(self._fh, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if fcntl is None or self._fh is None:
+            return
+        fcntl.flock(self._fh, fcntl.LOCK_UN)
+        self._fh.close()
+        self._fh = None
+
+
+def atomic_write_bytes(path: Path, payload: bytes) -> None:
+    """Write ``payload`` to a temporary sibling and rename it over ``path``."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=path.suffix)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(payload)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def read_and_touch(path: Path) -> bytes | None:
+    """Read an entry and refresh its mtime (the LRU clock); ``None`` if it is gone."""
+    try:
+        payload = path.read_bytes()
+        os.utime(path)
+    except FileNotFoundError:
+        return None
+    return payload
+
+
+def evict_lru(paths: Iterable[Path], max_bytes: int) -> int:
+    """Delete the least recently modified files until the rest fit ``max_bytes``."""
+    stats = []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        stats.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in stats)
+    removed = 0
+    for _, size, path in sorted(stats, key=lambda item: item[0]):
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+        removed += 1
+    return removed
+
+
+def file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import functools
+import hashlib
+import importlib.metadata
+import os
+import threading
+import weakref
+from collections.abc import Iterable
+from typing import Any, Literal, get_args
+
+import numpy as np
+from phys_pipeline.types import hash_ndarray
+
+FingerprintAlgo = Literal["sha256", "blake2b"]
+
+DEFAULT_FINGERPRINT_ALGO: FingerprintAlgo = "sha256"
+
+_CHUNK_BYTES = 1 << 22
+
+_LINEAGE_DEPENDENCIES = ("numpy", "scipy", "OptiCommPy", "numba", "phys-pipeline")
+
+
+def fingerprint_algo() -> FingerprintAlgo:
+    """Return the algorithm selected by ``FIBER_LINK_SIM_FINGERPRINT_ALGO``."""
+    value = os.getenv("FIBER_LINK_SIM_FINGERPRINT_ALGO", DEFAULT_FINGERPRINT_ALGO).strip().lower()
+    if value not in get_args(FingerprintAlgo):
+        raise ValueError(f"unknown fingerprint algorithm: {value!r}")
+    return value  # type: ignore[return-value]
+
+
+def fingerprint_array(array: np.ndarray, algo: FingerprintAlgo | None = None) -> str:
+    """Hex digest of an array's dtype, shape and contents.
+
+    ``sha256`` matches ``phys_pipeline.hash_ndarray`` (and is the fastest choice on CPUs
+    with SHA extensions); ``blake2b`` hashes the buffer in 4 MiB chunks so non-contiguous
+    arrays are never copied whole, and is faster where SHA-256 runs in software. Digests
+    are memoized on the array's identity for read-only arrays and for arrays registered
+    with ``remember_fingerprint``.
+    """
+    algo = algo or fingerprint_algo()
+    array = np.asarray(array)
+    cached = _MEMO.get(array, algo)
+    if cached is not None:
+        return cached
+    if algo == "sha256":
+        digest = hash_ndarray(array).hex()
+    else:
+        digest = _blake2b_chunked(array)
+    _MEMO.put(array, algo, digest)
+    return digest
+
+
+def remember_fingerprint(
+    array: np.ndarray, digest: str, algo: FingerprintAlgo | None = None
+) -> None:
+    """Memoize ``digest`` for an array whose owner guarantees it is never mutated."""
+    _MEMO.put(array, algo or fingerprint_algo(), digest, trusted=True)
+
+
+def lineage_digest(*parts: str) -> str:
+    """Identity for a deterministic output derived from its inputs instead of its bytes."""
+    h = hashlib.blake2b(digest_size=32)
+    for part in parts:
+        encoded = part.encode()
+        h.update(len(encoded).to_bytes(8, "big"))
+        h.update(encoded)
+    return h.hexdigest()
+
+
+@functools.cache
+def dependency_versions() -> str:
+    """Installed versions of the packages whose numerics shape stage outputs.
+
+    Lineage keys include them so an upgrade never replays outputs an older stack produced.
+    Versions come from package metadata, so nothing is imported.
+    """
+    versions = []
+    for name in _LINEAGE_DEPENDENCIES:
+        try:
+            version = importlib.metadata.version(name)
+        except importlib.metadata.PackageNotFoundError:
+            version = "missing"
+        versions.append(f"{name}=={version}")
+    return ";".join(versions)
+
+
+def clear_fingerprint_cache() -> None:
+    _MEMO.clear()
+
+
+def _header(array: np.ndarray) -> hashlib.blake2b:
+    h = hashlib.blake2b(digest_size=32)
+    h.update(str(array.dtype).encode())
+    h.update(str(array.shape).encode())
+    return h
+
+
+def _blake2b_chunked(array: np.ndarray) -> str:
+    h = _header(array)
+    if array.size == 0:
+        return h.hexdigest()
+    step = max(1, _CHUNK_BYTES // max(1, array.itemsize))
+    chunks: Iterable[Any]
+    if array.flags.c_contiguous:
+        flat = array.reshape(-1)
+        chunks = (flat[start : start + step] for start in range(0, flat.size, step))
+    else:
+        chunks = np.nditer(
+            array, flags=["external_loop", "buffered", "zerosize_ok"], buffersize=step, order="C"
+        )
+    for chunk in chunks:
+        h.update(np.ascontiguousarray(chunk).data)
+    return h.hexdigest()
+
+
+class _IdentityMemo:
+    """Digest cache keyed on ``id(array)`` that is only trusted for read-only arrays.
+
+    Entries are dropped when the array is garbage collected, so a recycled ``id`` can
+    never return a stale digest. Writeable arrays are only memoized when their owner
+    vouches for them, because they may change after hashing.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[tuple[int, str], tuple[weakref.ref[np.ndarray], str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, array: np.ndarray, algo: str) -> str | None:
+        with self._lock:
+            entry = self._entries.get((id(array), algo))
+        if entry is None or entry[0]() is not array:
+            return None
+        return entry[1]
+
+    def put(self, array: np.ndarray, algo: str, digest: str, *, trusted: bool = False) -> None:
+        if not trusted and not _is_frozen(array):
+            return
+        key = (id(array), algo)
+        try:
+            ref = weakref.ref(array, lambda _, key=key: self._discard(key))  # type: ignore[misc]
+        except TypeError:
+            return
+        with self._lock:
+            self._entries[key] = (ref, digest)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _discard(self, key: tuple[int, str]) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+def _is_frozen(array: np.ndarray) -> bool:
+    current: object = array
+    while isinstance(current, np.ndarray):
+        if current.flags.writeable:
+            return False
+        current = current.base
+    return True
+
+
+_MEMO = _IdentityMemo()
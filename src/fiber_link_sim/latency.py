@@ -4,7 +4,7 @@ from typing import Any
 
 import numpy as np
 
-from fiber_link_sim.adapters.opticommpy.dsp import resolve_dsp_chain
+from fiber_link_sim.adapters.opticommpy.chain import resolve_dsp_chain
 from fiber_link_sim.data_models.spec_models import Signal
 from fiber_link_sim.data_models.stage_models import DspSpecSlice, MetricsSpecSlice
 from fiber_link_sim.utils import bits_per_symbol, total_link_length_m
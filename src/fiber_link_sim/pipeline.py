@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from dataclasses import replace
+
 from phys_pipeline import SequentialPipeline
 
 import fiber_link_sim._compat  # noqa: F401
@@ -13,6 +15,7 @@ from fiber_link_sim.data_models.stage_models import (
     RxFrontEndSpecSlice,
     TxSpecSlice,
 )
+from fiber_link_sim.stages.base import Stage
 from fiber_link_sim.stages.configs import (
     ArtifactsStageConfig,
     ChannelStageConfig,
@@ -27,24 +30,47 @@ from fiber_link_sim.stages.core import (
     ChannelStage,
     DSPStage,
     FECStage,
+    GnModelStage,
     MetricsStage,
     RxFrontEndStage,
     TxStage,
 )
+from fiber_link_sim.stages.memo import MemoizedStage, StageMemo, stage_memo_from_env
 
 
-def build_pipeline(spec: SimulationSpec) -> SequentialPipeline:
-    stages = [
-        TxStage(cfg=TxStageConfig(name="tx", spec=TxSpecSlice.from_spec(spec))),
-        ChannelStage(cfg=ChannelStageConfig(name="channel", spec=ChannelSpecSlice.from_spec(spec))),
-        RxFrontEndStage(
-            cfg=RxFrontEndStageConfig(name="rx_frontend", spec=RxFrontEndSpecSlice.from_spec(spec))
-        ),
-        DSPStage(cfg=DSPStageConfig(name="dsp", spec=DspSpecSlice.from_spec(spec))),
-        FECStage(cfg=FECStageConfig(name="fec", spec=FecSpecSlice.from_spec(spec))),
+def build_pipeline(spec: SimulationSpec, *, memo: StageMemo | None = None) -> SequentialPipeline:
+    """Build the stage chain for ``spec``.
+
+    The ``gn_model`` backend replaces Tx through FEC with one ``GnModelStage``. With a stage
+    memo (``memo`` or ``stage_memo_from_env()``) every compute stage is wrapped in
+    ``MemoizedStage``; ArtifactsStage always runs because it writes files.
+    """
+    memo = memo if memo is not None else stage_memo_from_env()
+    channel_cfg = ChannelStageConfig(name="channel", spec=ChannelSpecSlice.from_spec(spec))
+    stages: list[Stage]
+    if spec.propagation.backend == "gn_model":
+        stages = [GnModelStage(cfg=replace(channel_cfg, name="gn_model"))]
+    else:
+        stages = [
+            TxStage(cfg=TxStageConfig(name="tx", spec=TxSpecSlice.from_spec(spec))),
+            ChannelStage(cfg=channel_cfg),
+            RxFrontEndStage(
+                cfg=RxFrontEndStageConfig(
+                    name="rx_frontend", spec=RxFrontEndSpecSlice.from_spec(spec)
+                )
+            ),
+            DSPStage(cfg=DSPStageConfig(name="dsp", spec=DspSpecSlice.from_spec(spec))),
+            FECStage(cfg=FECStageConfig(name="fec", spec=FecSpecSlice.from_spec(spec))),
+        ]
+    stages += [
         MetricsStage(cfg=MetricsStageConfig(name="metrics", spec=MetricsSpecSlice.from_spec(spec))),
         ArtifactsStage(
             cfg=ArtifactsStageConfig(name="artifacts", spec=ArtifactsSpecSlice.from_spec(spec))
         ),
     ]
+    if memo is not None:
+        stages = [
+            stage if isinstance(stage, ArtifactsStage) else MemoizedStage(stage=stage, memo=memo)
+            for stage in stages
+        ]
     return SequentialPipeline(stages, name="fiber_link_sim")
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass
+import threading
+from dataclasses import dataclass, field, replace
 from pathlib import Path
 from typing import Any, cast
 
@@ -11,11 +12,19 @@ from phys_pipeline import (
     DagExecutor,
     LocalScheduler,
     NodeSpec,
+    SequentialPipeline,
+    StageConfig,
+    StageResult,
+    State,
     build_cache_backend,
 )
+from phys_pipeline.hashing import hash_dag_node, hash_model, hash_state
+from phys_pipeline.types import DagState
 
 import fiber_link_sim._compat  # noqa: F401
-from fiber_link_sim.stages.base import SimulationState
+from fiber_link_sim.fingerprint import lineage_digest
+from fiber_link_sim.stages.base import SimulationState, Stage
+from fiber_link_sim.stages.core import ArtifactsStage, LatencyStage, MetricsStage
 
 
 @dataclass(frozen=True, slots=True)
@@ -25,28 +34,193 @@ class PipelineExecutionMetadata:
     cache_hits: int = 0
 
 
+class SimulationCancelled(RuntimeError):
+    """Raised at a stage boundary once a run's cancel event is set."""
+
+
+def _check_cancelled(cancel: threading.Event | None) -> None:
+    if cancel is not None and cancel.is_set():
+        raise SimulationCancelled("simulation cancelled")
+
+
+@dataclass(slots=True)
+class _Checkpoint(Stage):
+    """Check ``cancel`` before running ``stage``; sequential runs wrap every stage in one."""
+
+    stage: Stage
+    cancel: threading.Event
+    cfg: StageConfig = field(init=False)
+    name: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.cfg = self.stage.cfg
+        self.name = self.stage.name
+
+    def process(self, state: State, *, policy: object | None = None) -> StageResult:
+        _check_cancelled(self.cancel)
+        return self.stage.process(state, policy=policy)  # type: ignore[arg-type]
+
+
+def _stage_node_name(stage: Any) -> str:
+    return stage.cfg.name if getattr(stage, "cfg", None) is not None else stage.__class__.__name__
+
+
 def _build_linear_nodes(stages: list[Any]) -> list[NodeSpec]:
     nodes: list[NodeSpec] = []
     for index, stage in enumerate(stages):
-        node_id = (
-            stage.cfg.name if getattr(stage, "cfg", None) is not None else stage.__class__.__name__
-        )
+        node_id = _stage_node_name(stage)
         deps = [nodes[index - 1].id] if index > 0 else []
         nodes.append(NodeSpec(id=node_id, deps=deps, op_name=node_id, version="v2", stage=stage))
     return nodes
 
 
-def run_pipeline(pipeline: Any, state: SimulationState) -> PipelineExecutionMetadata:
-    mode = os.getenv("FIBER_LINK_SIM_PIPELINE_EXECUTOR", "sequential").strip().lower()
-    if mode != "dag":
-        pipeline.run(state)
-        return PipelineExecutionMetadata(mode="sequential", cache_backend=None)
+_PIPELINE_STAGES = ("tx", "channel", "rx_frontend", "dsp", "fec", "metrics", "artifacts")
+_ARTIFACT_SOURCES = {"tx": "tx", "channel": "channel", "rx": "rx_frontend", "dsp": "dsp"}
+
+
+@dataclass(slots=True)
+class _GraphStage(Stage):
+    """DAG node wrapper: fork a single input or merge several, then run ``stage``.
+
+    Forking keeps siblings from mutating the parent state they share. ``key`` (assigned by
+    ``assign_node_keys``) is stamped on the output as its ``node_key``. A set ``cancel`` event
+    stops the node before it starts.
+    """
+
+    stage: Stage
+    key: str | None = None
+    cancel: threading.Event | None = None
+    cfg: StageConfig = field(init=False)
+    name: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.cfg = self.stage.cfg
+        self.name = self.stage.name
+
+    def process(self, state: State, *, policy: object | None = None) -> StageResult:
+        _check_cancelled(self.cancel)
+        if isinstance(state, DagState):
+            branch = SimulationState.merge(
+                [cast(SimulationState, state.inputs[dep]) for dep in state.inputs]
+            )
+        else:
+            branch = cast(SimulationState, state).fork()
+        result = self.stage.process(branch, policy=policy)  # type: ignore[arg-type]
+        result.state.node_key = self.key
+        return result
+
 
-    scheduler = LocalScheduler(
+def assign_node_keys(nodes: list[NodeSpec], initial_state: SimulationState) -> dict[str, str]:
+    """Give every graph node a Merkle key: its id, version, config hash and upstream keys.
+
+    Roots chain from the initial state's hash, which only covers small run metadata. Each
+    output state carries its key, so ``hashable_repr`` (and with it the DAG cache key) is O(1)
+    in the data size, and every key is known before any node runs. Returns ``{}`` (full state
+    hashing) unless every node is a ``_GraphStage``.
+    """
+    if not all(isinstance(node.stage, _GraphStage) for node in nodes):
+        return {}
+    root = hash_state(initial_state)
+    keys: dict[str, str] = {}
+    for node in nodes:
+        stage = cast(_GraphStage, node.stage)
+        upstream = [keys[dep] for dep in node.deps] if node.deps else [root]
+        stage.key = lineage_digest(node.id, node.version, hash_model(stage.cfg), *upstream)
+        keys[node.id] = stage.key
+    return keys
+
+
+def _dag_cache_key(node: NodeSpec, keys: dict[str, str]) -> str:
+    """The key ``DagExecutor`` computes for ``node`` once its inputs carry ``keys``."""
+    inputs = {dep: SimulationState(node_key=keys[dep]) for dep in node.deps}
+    input_state: State = next(iter(inputs.values())) if len(inputs) == 1 else DagState(dict(inputs))
+    return hash_dag_node(
+        node_id=node.id,
+        op_name=node.op_name or node.id,
+        version=node.version or "v2",
+        cfg_hash=hash_model(cast(Stage, node.stage).cfg),
+        input_hash=hash_state(input_state),
+        dep_hashes={dep: hash_state(dep_state) for dep, dep_state in inputs.items()},
+        policy_hash=None,
+    )
+
+
+def _build_dag_nodes(stages: list[Any]) -> list[NodeSpec]:
+    """Dependency graph for the standard pipeline; other stage lists run as a linear chain.
+
+    Latency budgeting runs off the channel stage, metrics joins it with FEC, and each artifact
+    product hangs off the stage whose signals it reads. The final ``artifacts`` node merges
+    the metrics and artifact branches.
+    """
+    by_name = {_stage_node_name(stage): stage for stage in stages}
+    if tuple(by_name) != _PIPELINE_STAGES:
+        return _build_linear_nodes(stages)
+
+    # Memoized stages wrap the real stage; the extra nodes are built from the inner configs.
+    metrics = cast(MetricsStage, getattr(by_name["metrics"], "stage", by_name["metrics"]))
+    artifacts = cast(ArtifactsStage, getattr(by_name["artifacts"], "stage", by_name["artifacts"]))
+    latency_cfg = replace(metrics.cfg, name="latency")
+    graph: list[tuple[str, list[str], Any]] = [
+        ("tx", [], by_name["tx"]),
+        ("channel", ["tx"], by_name["channel"]),
+        ("rx_frontend", ["channel"], by_name["rx_frontend"]),
+        ("dsp", ["rx_frontend"], by_name["dsp"]),
+        ("fec", ["dsp"], by_name["fec"]),
+        ("latency", ["channel"], LatencyStage(cfg=latency_cfg)),
+        ("metrics", ["fec", "latency"], by_name["metrics"]),
+    ]
+    for product, source in _ARTIFACT_SOURCES.items():
+        node_id = f"artifacts_{product}"
+        product_cfg = replace(artifacts.cfg, name=node_id)
+        graph.append(
+            (node_id, [source], ArtifactsStage(cfg=product_cfg, name=node_id, products=(product,)))
+        )
+    graph.append(
+        (
+            "artifacts",
+            ["metrics", *(f"artifacts_{product}" for product in _ARTIFACT_SOURCES)],
+            ArtifactsStage(cfg=artifacts.cfg, products=()),
+        )
+    )
+    return [
+        NodeSpec(
+            id=node_id,
+            deps=deps,
+            op_name=node_id,
+            version="v2",
+            stage=_GraphStage(stage=stage),
+        )
+        for node_id, deps, stage in graph
+    ]
+
+
+def _scheduler_from_env() -> LocalScheduler:
+    return LocalScheduler(
         max_workers=max(1, int(os.getenv("FIBER_LINK_SIM_PIPELINE_MAX_WORKERS", "2"))),
         max_cpu=max(1, int(os.getenv("FIBER_LINK_SIM_PIPELINE_MAX_CPU", "2"))),
         max_gpu=0,
     )
+
+
+def run_pipeline(
+    pipeline: Any, state: SimulationState, *, cancel: threading.Event | None = None
+) -> PipelineExecutionMetadata:
+    """Run ``pipeline`` on ``state`` in place, sequentially or as a DAG.
+
+    With ``cancel``, every stage boundary checks the event and raises ``SimulationCancelled``
+    once it is set; a stage that already started runs to completion.
+    """
+    mode = os.getenv("FIBER_LINK_SIM_PIPELINE_EXECUTOR", "sequential").strip().lower()
+    if mode != "dag":
+        if cancel is not None:
+            pipeline = SequentialPipeline(
+                [_Checkpoint(stage=stage, cancel=cancel) for stage in pipeline.stages],
+                name=pipeline.name,
+            )
+        pipeline.run(state)
+        return PipelineExecutionMetadata(mode="sequential", cache_backend=None)
+
+    scheduler = _scheduler_from_env()
     cache_backend_name = os.getenv("FIBER_LINK_SIM_PIPELINE_CACHE_BACKEND", "disk").strip().lower()
     cache = None
     if cache_backend_name != "none":
@@ -54,17 +228,32 @@ def run_pipeline(pipeline: Any, state: SimulationState) -> PipelineExecutionMeta
         cache_cfg = CacheConfig(backend=cache_backend_name, disk_root=cache_root)
         cache = DagCache(build_cache_backend(cache_cfg))
 
+    nodes = _build_dag_nodes(pipeline.stages)
+    if cancel is not None:
+        for node in nodes:
+            if isinstance(node.stage, _GraphStage):
+                node.stage.cancel = cancel
+        nodes = [
+            (
+                node
+                if isinstance(node.stage, _GraphStage)
+                else replace(node, stage=_Checkpoint(stage=cast(Stage, node.stage), cancel=cancel))
+            )
+            for node in nodes
+        ]
+    keys = assign_node_keys(nodes, state)
+    if cache is not None and keys:
+        # Fully warm runs load only the final node's state; no upstream node is touched.
+        cached = cache.get(_dag_cache_key(nodes[-1], keys))
+        if cached is not None:
+            state.adopt(cast(SimulationState, cached.state))
+            return PipelineExecutionMetadata(
+                mode="dag", cache_backend=cache_backend_name, cache_hits=len(nodes)
+            )
+
     executor = DagExecutor(scheduler=scheduler, cache=cache)
-    nodes = _build_linear_nodes(pipeline.stages)
     run_result = executor.run(state, nodes)
-    final_state = cast(SimulationState, run_result.results[nodes[-1].id].state)
-    state.meta = final_state.meta
-    state.refs = final_state.refs
-    state.signals = final_state.signals
-    state.rx = final_state.rx
-    state.stats = final_state.stats
-    state.artifacts = final_state.artifacts
-    state.artifact_store = final_state.artifact_store
+    state.adopt(cast(SimulationState, run_result.results[nodes[-1].id].state))
 
     cache_hits = sum(
         1 for record in run_result.provenance.get("node_runs", []) if record.get("cache_hit")
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import ArrayLike
+from scipy.constants import h as PLANCK_J_S  # type: ignore[import-untyped]
+
+from fiber_link_sim.data_models.stage_models import ChannelSpecSlice
+from fiber_link_sim.utils import channel_layout
+
+# Closed-form Gaussian-noise model behind ``propagation.backend = "gn_model"``: SNR from ASE
+# and nonlinear interference without propagating a waveform. Units follow the native
+# split-step engines (km, 1/km, s^2/km, 1/(W km)).
+
+# OSNR reference bandwidth (0.1 nm at 1550 nm), as in OptiCommPy's ``calcLinOSNR``.
+OSNR_REFERENCE_BANDWIDTH_HZ = 12.5e9
+
+_NEPER_PER_DB = 1.0 / (10.0 * math.log10(math.e))
+
+
+@dataclass(frozen=True, slots=True)
+class GnLink:
+    """One dual-polarization channel over ``n_spans`` identical spans.
+
+    Each amplifier restores its span loss, as in the split-step backends; any gain mismatch
+    they apply afterwards scales signal and noise alike and leaves the SNR unchanged.
+    """
+
+    n_spans: int
+    span_length_km: float
+    symbol_rate_baud: float
+    carrier_hz: float
+    alpha_db_per_km: float
+    beta2_s2_per_km: float
+    gamma_w_inv_km: float
+    amplified: bool = True
+    noise_figure_db: float | None = None
+
+    @classmethod
+    def from_spec(cls, spec: ChannelSpecSlice, *, carrier_hz: float) -> GnLink:
+        effects = spec.propagation.effects
+        layout = channel_layout(spec.path, spec.spans)
+        amplified = spec.spans.amplifier.type == "edfa"
+        return cls(
+            n_spans=layout.n_spans,
+            span_length_km=layout.span_length_km,
+            symbol_rate_baud=spec.signal.symbol_rate_baud,
+            carrier_hz=carrier_hz,
+            alpha_db_per_km=spec.fiber.alpha_db_per_km,
+            beta2_s2_per_km=spec.fiber.beta2_s2_per_m * 1e3 if effects.dispersion else 0.0,
+            gamma_w_inv_km=spec.fiber.gamma_w_inv_m * 1e3 if effects.nonlinearity else 0.0,
+            amplified=amplified,
+            noise_figure_db=(
+                (spec.spans.amplifier.noise_figure_db or 0.0) if amplified and effects.ase else None
+            ),
+        )
+
+    @property
+    def alpha_per_km(self) -> float:
+        """Power attenuation coefficient in 1/km."""
+        return self.alpha_db_per_km * _NEPER_PER_DB
+
+
+@dataclass(frozen=True, slots=True)
+class GnEstimate:
+    """Per-launch-power results; every array has the shape of the launch powers passed in."""
+
+    launch_power_w: np.ndarray
+    ase_w: np.ndarray
+    nli_w: np.ndarray
+    snr_db: np.ndarray
+    osnr_db: np.ndarray | None
+
+
+def nli_coefficient(link: GnLink) -> float:
+    """``eta`` in ``P_NLI = eta * P**3`` (1/W^2) at the receiver, over the whole link.
+
+    Closed-form GN model for a Nyquist channel of bandwidth ``R_s`` (Poggiolini, JLT 2012,
+    Eq. 15) with incoherent accumulation over spans: ``(8/27) gamma^2 L_eff^2
+    asinh(pi^2/2 |beta2| L_eff,a R_s^2) / (pi |beta2| L_eff,a R_s^2)`` per span, where
+    ``L_eff,a = 1 / alpha``. Without amplifiers the link is one long span. Without dispersion
+    the ``asinh(x) / x`` factor takes its limit of 1.
+    """
+    if link.gamma_w_inv_km == 0.0:
+        return 0.0
+    n_spans, length_km = link.n_spans, link.span_length_km
+    if not link.amplified:
+        n_spans, length_km = 1, link.n_spans * link.span_length_km
+    alpha = link.alpha_per_km
+    if alpha > 0.0:
+        effective_km = -math.expm1(-alpha * length_km) / alpha
+        asymptotic_km = 1.0 / alpha
+    else:
+        effective_km = asymptotic_km = length_km
+    x = 0.5 * math.pi**2 * abs(link.beta2_s2_per_km) * asymptotic_km * link.symbol_rate_baud**2
+    spread = math.asinh(x) / x if x > 0.0 else 1.0
+    per_span = (8.0 / 27.0) * link.gamma_w_inv_km**2 * effective_km**2 * spread * math.pi / 2.0
+    return n_spans * per_span
+
+
+def ase_power_w(link: GnLink, bandwidth_hz: float) -> float:
+    """ASE of every amplifier in ``bandwidth_hz``, both polarizations, at the receiver.
+
+    Same per-amplifier model as the native split-step engines, ``(G NF - 1) h nu / 2`` per
+    polarization and Hz.
+    """
+    if link.noise_figure_db is None or not link.amplified:
+        return 0.0
+    if link.noise_figure_db < 3.0:
+        raise ValueError("EDFA noise figure must be at least 3 dB")
+    gain = 10 ** (link.alpha_db_per_km * link.span_length_km / 10.0)
+    noise_figure = 10 ** (link.noise_figure_db / 10.0)
+    per_amplifier = (gain * noise_figure - 1.0) * PLANCK_J_S * link.carrier_hz * bandwidth_hz
+    return link.n_spans * per_amplifier
+
+
+def gn_estimate(link: GnLink, launch_power_dbm: ArrayLike) -> GnEstimate:
+    """Evaluate the link at every launch power (dBm, any shape) in one vectorized pass.
+
+    ``SNR = P / (P_ASE + eta P^3)`` with ASE and NLI in the symbol-rate bandwidth; ``osnr_db``
+    is ASE-only in the 12.5 GHz reference bandwidth and ``None`` without ASE. Raises
+    ``ValueError`` when the link has neither ASE nor nonlinearity to limit the SNR.
+    """
+    power_w = 1e-3 * 10 ** (np.asarray(launch_power_dbm, dtype=np.float64) / 10.0)
+    ase_w = ase_power_w(link, link.symbol_rate_baud)
+    eta = nli_coefficient(link)
+    if ase_w == 0.0 and eta == 0.0:
+        raise ValueError("gn_model needs ASE or nonlinearity to estimate a finite SNR")
+    nli_w = eta * power_w**3
+    noise_w = ase_w + nli_w
+    osnr_db = None
+    if ase_w > 0.0:
+        osnr_db = 10.0 * np.log10(power_w / ase_power_w(link, OSNR_REFERENCE_BANDWIDTH_HZ))
+    return GnEstimate(
+        launch_power_w=power_w,
+        ase_w=np.broadcast_to(np.float64(ase_w), power_w.shape),
+        nli_w=nli_w,
+        snr_db=10.0 * np.log10(power_w / noise_w),
+        osnr_db=osnr_db,
+    )
+
+
+def optimal_launch_power_dbm(link: GnLink) -> float:
+    """Launch power maximizing the SNR, where ``P_NLI = P_ASE / 2``."""
+    ase_w = ase_power_w(link, link.symbol_rate_baud)
+    eta = nli_coefficient(link)
+    if ase_w == 0.0 or eta == 0.0:
+        raise ValueError("the optimal launch power needs both ASE and nonlinearity")
+    return 10.0 * math.log10((ase_w / (2.0 * eta)) ** (1.0 / 3.0) / 1e-3)
+
+
+__all__ = [
+    "OSNR_REFERENCE_BANDWIDTH_HZ",
+    "GnEstimate",
+    "GnLink",
+    "ase_power_w",
+    "gn_estimate",
+    "nli_coefficient",
+    "optimal_launch_power_dbm",
+]
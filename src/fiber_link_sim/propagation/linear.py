@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING
+
+import numpy as np
+from scipy import fft as sp_fft  # type: ignore[import-untyped]
+
+from fiber_link_sim.propagation.ssfm import (
+    LinkModel,
+    add_ase,
+    amplifier_gain,
+    angular_frequency,
+    fft_workers,
+    linear_exponent,
+)
+
+if TYPE_CHECKING:
+    from fiber_link_sim.propagation.manakov import PmdSections
+
+# Closed-form propagation for links whose Kerr phase is negligible. Attenuation, dispersion and
+# amplifier gain collapse into one transfer function, so the whole link costs one FFT pair
+# however many spans or split steps it would otherwise take.
+
+
+def nonlinear_phase_rad(model: LinkModel, power_w: float, *, coefficient: float = 1.0) -> float:
+    """Kerr phase ``gamma * P * L_eff`` accumulated over the link at launch power ``power_w``.
+
+    Amplified spans each restart from the launch power; without amplifiers the power keeps
+    decaying, so the link counts as one long span.
+    """
+    gamma = model.gamma_w_inv_km * coefficient
+    if gamma == 0.0 or power_w <= 0.0:
+        return 0.0
+    n_spans, length_km = model.n_spans, model.span_length_km
+    if model.amplifier == "none":
+        n_spans, length_km = 1, model.n_spans * model.span_length_km
+    alpha = model.alpha_per_km
+    effective_km = -math.expm1(-alpha * length_km) / alpha if alpha > 0.0 else length_km
+    return gamma * power_w * effective_km * n_spans
+
+
+def linear_link(
+    signal: np.ndarray,
+    model: LinkModel,
+    *,
+    rng: np.random.Generator,
+    pmd: PmdSections | None = None,
+) -> np.ndarray:
+    """Propagate ``signal`` through the link with the Kerr term dropped.
+
+    ``signal`` is shaped as for ``ssfm`` or ``manakov_ssfm``. The field is multiplied once by
+    the link's transfer function. Each amplifier restores its span loss, so each span's ASE
+    reaches the receiver through all-pass operators only: the spans' draws add up to one draw
+    of ``n_spans`` times the power. PMD sections, when given, are unitary and commute with the
+    scalar operators, so they are applied in order on the same spectrum.
+    """
+    field = np.array(signal, dtype=np.complex128, copy=True)
+    squeeze = field.ndim == 1
+    if squeeze:
+        field = field[:, None]
+    workers = fft_workers()
+    spectrum = sp_fft.fft(field, axis=0, overwrite_x=True, workers=workers)
+    omega = angular_frequency(field.shape[0], model.sample_rate_hz)
+    exponent = linear_exponent(model, omega) * (model.n_spans * model.span_length_km)
+    spectrum *= np.exp(exponent + model.n_spans * math.log(amplifier_gain(model)))
+    if pmd is not None:
+        for span in range(model.n_spans):
+            pmd.apply_span(spectrum, span)
+    if model.amplifier == "edfa":
+        add_ase(spectrum, model, rng, n_amplifiers=model.n_spans)
+    field = sp_fft.ifft(spectrum, axis=0, overwrite_x=True, workers=workers)
+    return field[:, 0] if squeeze else field
+
+
+__all__ = ["linear_link", "nonlinear_phase_rad"]
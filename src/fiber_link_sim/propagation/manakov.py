@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+from fiber_link_sim.propagation.ssfm import KerrStep, LinkModel, angular_frequency, split_step
+from fiber_link_sim.propagation.stepping import StepStats
+
+# Polarization-averaged Kerr coefficient of the Manakov equation (random birefringence).
+MANAKOV_KERR_FACTOR = 8.0 / 9.0
+
+# Mean over RMS of a Maxwellian DGD distribution, sqrt(8 / (3 pi)).
+_MAXWELLIAN_MEAN_OVER_RMS = math.sqrt(8.0 / (3.0 * math.pi))
+
+
+def random_jones_rotations(rng: np.random.Generator, shape: tuple[int, ...]) -> np.ndarray:
+    """Haar-uniform SU(2) matrices of shape ``shape + (2, 2)``."""
+    q = rng.standard_normal((*shape, 4))
+    q /= np.linalg.norm(q, axis=-1, keepdims=True)
+    a = q[..., 0] + 1j * q[..., 1]
+    b = q[..., 2] + 1j * q[..., 3]
+    return np.stack(
+        [np.stack([a, -b.conj()], axis=-1), np.stack([b, a.conj()], axis=-1)],
+        axis=-2,
+    )
+
+
+def section_dgd_s(model: LinkModel) -> float:
+    """Differential group delay of one waveplate section.
+
+    Sections of fixed DGD and random orientation concatenate to a Maxwellian link DGD whose
+    mean is ``pmd_ps_sqrt_km * sqrt(L)``, however many sections the link is cut into.
+    """
+    section_km = model.span_length_km / model.pmd_sections_per_span
+    return model.pmd_ps_sqrt_km * 1e-12 * math.sqrt(section_km) / _MAXWELLIAN_MEAN_OVER_RMS
+
+
+@dataclass(frozen=True, slots=True)
+class PmdSections:
+    """Coarse-step PMD: random waveplates applied to the spectrum at step boundaries.
+
+    Each section is a random rotation followed by a fixed DGD between the rotated axes,
+    ``diag(exp(i w tau / 2), exp(-i w tau / 2))``. The waveplate count per span is
+    independent of the split-step size; with fixed steps a section ending inside a step is
+    applied at the nearest step boundary, while adaptive steps are cut to end at every section.
+    """
+
+    rotations: np.ndarray
+    birefringence: np.ndarray
+    at_boundary: tuple[tuple[int, ...], ...]
+    section_km: float
+
+    @classmethod
+    def build(cls, model: LinkModel, n_samples: int, rng: np.random.Generator) -> PmdSections:
+        n_sections = model.pmd_sections_per_span
+        n_steps = model.steps_per_span
+        ends = [max(1, round((index + 1) * n_steps / n_sections)) for index in range(n_sections)]
+        omega = angular_frequency(n_samples, model.sample_rate_hz)
+        return cls(
+            rotations=random_jones_rotations(rng, (model.n_spans, n_sections)),
+            birefringence=np.exp(0.5j * omega * section_dgd_s(model)),
+            at_boundary=tuple(
+                tuple(index for index, end in enumerate(ends) if end == boundary)
+                for boundary in range(n_steps + 1)
+            ),
+            section_km=model.span_length_km / n_sections,
+        )
+
+    def _apply_section(self, spectrum: np.ndarray, jones: np.ndarray) -> None:
+        pairs = spectrum.view()
+        pairs.shape = (spectrum.shape[0], -1, 2)
+        x = jones[0, 0] * pairs[..., 0] + jones[0, 1] * pairs[..., 1]
+        y = jones[1, 0] * pairs[..., 0] + jones[1, 1] * pairs[..., 1]
+        np.multiply(x, self.birefringence, out=pairs[..., 0])
+        np.multiply(y, self.birefringence.conj(), out=pairs[..., 1])
+
+    def apply(self, spectrum: np.ndarray, span: int, boundary: int) -> None:
+        """Apply the sections of ``span`` that end at step ``boundary`` (1..steps_per_span)."""
+        for index in self.at_boundary[boundary]:
+            self._apply_section(spectrum, self.rotations[span, index])
+
+    def apply_through(self, spectrum: np.ndarray, span: int, first: int, z_km: float) -> int:
+        """Apply the sections of ``span`` from ``first`` on that end by ``z_km``.
+
+        Returns the index of the next section still ahead.
+        """
+        index = first
+        while index < self.rotations.shape[1] and (index + 1) * self.section_km <= z_km + 1e-9:
+            self._apply_section(spectrum, self.rotations[span, index])
+            index += 1
+        return index
+
+    def apply_span(self, spectrum: np.ndarray, span: int) -> None:
+        """Apply every section of ``span`` in order."""
+        for jones in self.rotations[span]:
+            self._apply_section(spectrum, jones)
+
+
+def manakov_ssfm(
+    signal: np.ndarray, model: LinkModel, *, rng: np.random.Generator
+) -> tuple[np.ndarray, StepStats]:
+    """Propagate a dual-polarization field with the Manakov equation.
+
+    ``signal`` is ``(n_samples, 2 * n_modes)`` with x/y interleaved per mode, as in
+    OptiCommPy's ``manakovSSF``. Both polarizations go through one batched FFT per
+    transform. With ``model.pmd_ps_sqrt_km > 0`` the waveplates are drawn from ``rng`` before
+    propagation, so a seed fixes the fiber's PMD realization as well as its ASE. Returns the
+    output field and the step statistics.
+    """
+    field = np.array(signal, dtype=np.complex128, copy=True)
+    if field.ndim != 2 or field.shape[1] % 2:
+        raise ValueError("manakov propagation needs (n_samples, 2 * n_modes) x/y columns")
+    pmd = PmdSections.build(model, field.shape[0], rng) if model.pmd_ps_sqrt_km > 0 else None
+    kerr = KerrStep.build(field.shape, polarizations=2, coefficient=MANAKOV_KERR_FACTOR)
+    return split_step(field, model, rng, kerr=kerr, pmd=pmd)
+
+
+__all__ = [
+    "MANAKOV_KERR_FACTOR",
+    "PmdSections",
+    "manakov_ssfm",
+    "random_jones_rotations",
+    "section_dgd_s",
+]
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Literal
+
+# Step-size rules for the native split-step engines. They only compute lengths (km); the
+# propagation loops that call them live in ``fiber_link_sim.propagation.ssfm``.
+
+StepMethod = Literal["fixed", "nonlinear_phase", "logarithmic", "local_error"]
+
+# Adaptive step sizes are rounded down to powers of 2**(1/3) so their operators can be cached
+# and reused; the local-error controller grows and shrinks steps by the same factor.
+LADDER_STEPS_PER_OCTAVE = 3
+
+
+@dataclass(slots=True)
+class StepStats:
+    """What a propagation run did, reported back in ``ChannelOutput.params``.
+
+    ``error_estimate`` is only set by the local-error method: the sum of the relative
+    step-doubling differences, a conservative bound on the extrapolated field's error.
+    """
+
+    steps: int = 0
+    rejected_steps: int = 0
+    max_nonlinear_phase_rad: float = 0.0
+    error_estimate: float | None = None
+
+
+def ladder_length_km(reference_km: float, rung: int) -> float:
+    return reference_km * 2.0 ** (rung / LADDER_STEPS_PER_OCTAVE)
+
+
+def ladder_rung_below(reference_km: float, length_km: float) -> int:
+    """Highest rung whose length does not exceed ``length_km``."""
+    rung = math.floor(LADDER_STEPS_PER_OCTAVE * math.log2(length_km / reference_km))
+    while ladder_length_km(reference_km, rung) > length_km:
+        rung -= 1
+    return rung
+
+
+def nonlinear_phase_step_km(max_phase_rad: float, gamma_w_inv_km: float, peak_w: float) -> float:
+    """Longest step whose Kerr rotation stays within ``max_phase_rad`` at ``peak_w``."""
+    if gamma_w_inv_km <= 0.0 or peak_w <= 0.0:
+        return math.inf
+    return max_phase_rad / (gamma_w_inv_km * peak_w)
+
+
+def logarithmic_boundaries_km(
+    span_length_km: float,
+    alpha_per_km: float,
+    *,
+    max_phase_rad: float,
+    gamma_w_inv_km: float,
+    peak_w: float,
+) -> list[float]:
+    """Step boundaries that give every step the same Kerr phase in an attenuating span.
+
+    With power decaying as ``exp(-alpha z)``, boundaries at
+    ``z_k = -ln(1 - k (1 - exp(-alpha L)) / n) / alpha`` split the effective length evenly, so
+    steps lengthen along the span. ``n`` is the fewest steps keeping each step's phase
+    (``gamma * peak * L_eff / n``) within ``max_phase_rad``.
+    """
+    if alpha_per_km > 0.0:
+        decay = -math.expm1(-alpha_per_km * span_length_km)
+        effective_km = decay / alpha_per_km
+    else:
+        decay, effective_km = 1.0, span_length_km
+    total_phase = gamma_w_inv_km * peak_w * effective_km
+    n_steps = max(1, math.ceil(total_phase / max_phase_rad - 1e-9))
+    if alpha_per_km <= 0.0:
+        return [span_length_km * k / n_steps for k in range(1, n_steps + 1)]
+    boundaries = [-math.log1p(-k * decay / n_steps) / alpha_per_km for k in range(1, n_steps)]
+    return [*boundaries, span_length_km]
+
+
+def local_error_rung(rung: int, error: float, tolerance: float) -> int | None:
+    """Next ladder rung after a step-doubling trial, or ``None`` to reject and retry.
+
+    Sinkin et al. (JLT 2003): reject above ``2 tol``, shrink above ``tol``, grow below
+    ``tol / 2``.
+    """
+    if error > 2.0 * tolerance:
+        return None
+    if error > tolerance:
+        return rung - 1
+    if error < tolerance / 2.0:
+        return rung + 1
+    return rung
+
+
+__all__ = [
+    "LADDER_STEPS_PER_OCTAVE",
+    "StepMethod",
+    "StepStats",
+    "ladder_length_km",
+    "ladder_rung_below",
+    "local_error_rung",
+    "logarithmic_boundaries_km",
+    "nonlinear_phase_step_km",
+]
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from pydantic import ConfigDict
+
+from fiber_link_sim.blob_pool import parse_byte_size
+from fiber_link_sim.data_models.spec_models import SimulationResult
+from fiber_link_sim.disk_cache import (
+    FileLock,
+    atomic_write_bytes,
+    evict_lru,
+    file_size,
+    read_and_touch,
+)
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 64 << 20
+DEFAULT_DISK_MAX_BYTES = 256 << 20
+
+
+class FrozenSimulationResult(SimulationResult):
+    """A ``SimulationResult`` that rejects attribute assignment.
+
+    Cached frozen results are shared between callers: nested models and lists are not copied,
+    so treat them as read-only too.
+    """
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+
+def freeze_result(result: SimulationResult) -> FrozenSimulationResult:
+    if isinstance(result, FrozenSimulationResult):
+        return result
+    return FrozenSimulationResult.model_construct(
+        _fields_set=set(result.model_fields_set),
+        **{name: getattr(result, name) for name in SimulationResult.model_fields},
+    )
+
+
+@dataclass(slots=True)
+class ResultCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+    def to_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class ResultCache:
+    """In-process LRU cache of simulation results with entry and byte budgets.
+
+    Entry size is the length of the result's JSON form, which tracks what the cache retains.
+    Hits return a deep copy unless ``frozen`` is set, in which case the cache stores and returns
+    one shared ``FrozenSimulationResult`` per key. A result larger than ``max_bytes`` is not
+    cached. All operations are guarded by a lock so threads can share one cache.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        *,
+        frozen: bool = False,
+    ) -> None:
+        if max_entries < 0 or max_bytes < 0:
+            raise ValueError("cache budgets must be >= 0")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.frozen = frozen
+        self._entries: OrderedDict[Hashable, tuple[SimulationResult, int]] = OrderedDict()
+        self._stats = ResultCacheStats()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> ResultCache:
+        """Budgets from ``FIBER_LINK_SIM_RESULT_CACHE_{ENTRIES,BYTES,FROZEN}``."""
+        entries = os.getenv("FIBER_LINK_SIM_RESULT_CACHE_ENTRIES", "").strip()
+        max_bytes = os.getenv("FIBER_LINK_SIM_RESULT_CACHE_BYTES", "").strip()
+        frozen = os.getenv("FIBER_LINK_SIM_RESULT_CACHE_FROZEN", "0").strip().lower()
+        return cls(
+            max_entries=int(entries) if entries else DEFAULT_MAX_ENTRIES,
+            max_bytes=parse_byte_size(max_bytes) if max_bytes else DEFAULT_MAX_BYTES,
+            frozen=frozen in {"1", "true", "yes"},
+        )
+
+    def get(self, key: Hashable) -> SimulationResult | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            result = entry[0]
+        return result if self.frozen else result.model_copy(deep=True)
+
+    def put(self, key: Hashable, result: SimulationResult) -> SimulationResult:
+        """Cache ``result`` and return the object the caller should hand out.
+
+        In frozen mode that is the shared frozen copy; otherwise ``result`` itself, with the
+        cache keeping its own deep copy.
+        """
+        stored: SimulationResult = (
+            freeze_result(result) if self.frozen else result.model_copy(deep=True)
+        )
+        size = len(result.model_dump_json())
+        with self._lock:
+            self._discard(key)
+            if self.max_entries and size <= self.max_bytes:
+                self._entries[key] = (stored, size)
+                self._stats.bytes += size
+                self._evict()
+        return stored if self.frozen else result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._stats = ResultCacheStats()
+
+    def stats(self) -> ResultCacheStats:
+        with self._lock:
+            return ResultCacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                entries=len(self._entries),
+                bytes=self._stats.bytes,
+            )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._entries
+
+    def _discard(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._stats.bytes -= entry[1]
+
+    def _evict(self) -> None:
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._stats.bytes > self.max_bytes
+        ):
+            _, (_, size) = self._entries.popitem(last=False)
+            self._stats.bytes -= size
+            self._stats.evictions += 1
+
+
+class DiskResultCache:
+    """Result cache shared by every process that points at the same directory.
+
+    Entries live at ``<root>/<sim_version>/<spec_hash[:2]>/<spec_hash>.json``. Writes go to a
+    temporary file that is renamed into place, so readers never need the lock; ``put`` and
+    eviction hold an exclusive ``flock`` on ``<root>/.lock`` so concurrent writers agree on the
+    size budget. Reads refresh the entry mtime, and eviction removes the least recently used
+    entries until the cache fits ``max_bytes``.
+    """
+
+    def __init__(self, root: Path, max_bytes: int = DEFAULT_DISK_MAX_BYTES) -> None:
+        if max_bytes < 0:
+            raise ValueError("cache budgets must be >= 0")
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+
+    @classmethod
+    def from_env(cls) -> DiskResultCache | None:
+        """``FIBER_LINK_SIM_RESULT_CACHE_DIR`` enables the cache; ``..._DISK_BYTES`` caps it."""
+        root = os.getenv("FIBER_LINK_SIM_RESULT_CACHE_DIR", "").strip()
+        if not root:
+            return None
+        max_bytes = os.getenv("FIBER_LINK_SIM_RESULT_CACHE_DISK_BYTES", "").strip()
+        return cls(Path(root), parse_byte_size(max_bytes) if max_bytes else DEFAULT_DISK_MAX_BYTES)
+
+    def path_for(self, spec_hash: str, sim_version: str) -> Path:
+        return self.root / sim_version / spec_hash[:2] / f"{spec_hash}.json"
+
+    def get(self, spec_hash: str, sim_version: str) -> SimulationResult | None:
+        path = self.path_for(spec_hash, sim_version)
+        payload = read_and_touch(path)
+        if payload is None:
+            return None
+        try:
+            return SimulationResult.model_validate_json(payload)
+        except ValueError:
+            path.unlink(missing_ok=True)
+            return None
+
+    def put(self, spec_hash: str, sim_version: str, result: SimulationResult) -> None:
+        payload = result.model_dump_json().encode()
+        if len(payload) > self.max_bytes:
+            return
+        with FileLock(self.root / ".lock"):
+            atomic_write_bytes(self.path_for(spec_hash, sim_version), payload)
+            evict_lru(self.entries(), self.max_bytes)
+
+    def entries(self) -> list[Path]:
+        if not self.root.exists():
+            return []
+        return [path for path in self.root.glob("*/*/*.json") if not path.name.startswith(".")]
+
+    def total_bytes(self) -> int:
+        return sum(file_size(path) for path in self.entries())
+
+    def clear(self) -> None:
+        with FileLock(self.root / ".lock"):
+            for path in self.entries():
+                path.unlink(missing_ok=True)
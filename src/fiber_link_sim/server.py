@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import json
+import os
+import signal
+import socket
+import socketserver
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+from fiber_link_sim.client import CONTEXT_HEADER, parse_address, run_context
+from fiber_link_sim.simulate import SIM_VERSION, simulate
+from fiber_link_sim.workers import get_pool, shutdown_pools
+
+_MAX_BODY_BYTES = 64 * 1024 * 1024
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "fiber-link-sim"
+    protocol_version = "HTTP/1.1"
+
+    def _send_json(self, status: int, payload: dict[str, Any]) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        if self.path != "/health":
+            self._send_json(404, {"error": f"unknown path: {self.path}"})
+            return
+        self._send_json(
+            200,
+            {"status": "ok", "sim_version": SIM_VERSION, "pid": os.getpid(), "cwd": os.getcwd()},
+        )
+
+    def do_POST(self) -> None:
+        if self.path != "/simulate":
+            self._send_json(404, {"error": f"unknown path: {self.path}"})
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > _MAX_BODY_BYTES:
+            self.close_connection = True
+            self._send_json(413, {"error": "spec too large"})
+            return
+        try:
+            spec = json.loads(self.rfile.read(length))
+        except json.JSONDecodeError as exc:
+            self._send_json(400, {"error": f"invalid JSON: {exc}"})
+            return
+        if not isinstance(spec, dict):
+            self._send_json(400, {"error": "spec must be a JSON object"})
+            return
+        context = self.headers.get(CONTEXT_HEADER)
+        try:
+            client_context = json.loads(context) if context is not None else None
+        except json.JSONDecodeError as exc:
+            self._send_json(400, {"error": f"invalid {CONTEXT_HEADER} header: {exc}"})
+            return
+        if context is not None and client_context != run_context():
+            # Artifact paths and FIBER_LINK_SIM_* settings would differ from a local run.
+            self._send_json(409, {"error": "client working directory or settings differ"})
+            return
+        self._send_json(200, simulate(spec).model_dump(mode="json"))
+
+    def address_string(self) -> str:
+        return str(self.client_address[0]) if self.client_address else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if getattr(self.server, "verbose", False):
+            super().log_message(format, *args)
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    verbose = False
+
+
+class _TCPHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    verbose = False
+
+
+def _clear_stale_socket(path: str) -> None:
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+    else:
+        raise OSError(f"a server is already listening on {path}")
+    finally:
+        probe.close()
+
+
+def make_server(address: str, *, verbose: bool = False) -> _UnixHTTPServer | _TCPHTTPServer:
+    """Bind (but do not start) the HTTP server for ``address`` (see ``client.parse_address``).
+
+    ``POST /simulate`` takes a spec and answers with the ``SimulationResult`` JSON; a request
+    carrying a ``client.run_context()`` header that differs from the server's is refused with
+    409 before it runs. ``GET /health`` reports the version, pid and working directory. A
+    stale Unix socket file is replaced.
+    """
+    family, target = parse_address(address)
+    server: _UnixHTTPServer | _TCPHTTPServer
+    if family == "unix":
+        _clear_stale_socket(target)
+        server = _UnixHTTPServer(target, _Handler)
+    else:
+        server = _TCPHTTPServer(target, _Handler)
+    server.verbose = verbose
+    return server
+
+
+def serve(
+    address: str,
+    *,
+    workers: int | None = None,
+    isolate: bool = True,
+    verbose: bool = False,
+) -> None:
+    """Serve simulations at ``address`` until interrupted (SIGINT/SIGTERM).
+
+    Every request goes through ``simulate()`` in this process, so its result cache is shared
+    by all requests. With ``isolate`` (the default) cache misses run on the warm worker pool,
+    which is started before the server accepts connections, and a crash in native code
+    costs one worker rather than the daemon.
+    """
+    if workers is not None:
+        os.environ["FIBER_LINK_SIM_BATCH_WORKERS"] = str(workers)
+    if isolate:
+        os.environ["FIBER_LINK_SIM_ISOLATE"] = "1"
+        get_pool().warm()
+    else:
+        os.environ.pop("FIBER_LINK_SIM_ISOLATE", None)
+        import fiber_link_sim.pipeline  # noqa: F401
+
+    server = make_server(address, verbose=verbose)
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        family, target = parse_address(address)
+        if family == "unix":
+            Path(target).unlink(missing_ok=True)
+        if isolate:
+            shutdown_pools()
+
+
+__all__ = ["make_server", "serve"]
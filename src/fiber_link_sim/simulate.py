@@ -2,16 +2,24 @@ from __future__ import annotations
 
 import json
 import os
+import threading
 import time
-from multiprocessing import get_context
 from pathlib import Path
 from typing import Any
 
 from pydantic import ValidationError
 
-from fiber_link_sim.artifacts import LocalArtifactStore, artifact_root_for_spec
+from fiber_link_sim.artifacts import (
+    ArtifactStore,
+    AsyncArtifactWriter,
+    BundleArtifactStore,
+    HybridArtifactStore,
+    artifact_root_for_spec,
+)
+from fiber_link_sim.blob_pool import parse_byte_size
 from fiber_link_sim.data_models.spec_models import (
     Artifact,
+    ErrorCode,
     ErrorInfo,
     Provenance,
     SimulationResult,
@@ -20,11 +28,12 @@ from fiber_link_sim.data_models.spec_models import (
 )
 from fiber_link_sim.pipeline import build_pipeline
 from fiber_link_sim.pipeline_execution import run_pipeline
+from fiber_link_sim.result_cache import DiskResultCache, ResultCache
 from fiber_link_sim.stages.base import SimulationState
 from fiber_link_sim.utils import compute_spec_hash
 
-SIM_VERSION = "1.0.0"
-_SIMULATION_CACHE: dict[tuple[str, int], SimulationResult] = {}
+SIM_VERSION = "1.1.0"
+_SIMULATION_CACHE = ResultCache.from_env()
 
 
 def _local_cache_enabled() -> bool:
@@ -33,37 +42,41 @@ def _local_cache_enabled() -> bool:
     return os.getenv("FIBER_LINK_SIM_LOCAL_CACHE", "1").strip().lower() not in {"0", "false", "no"}
 
 
-def _simulate_worker(spec_payload: dict[str, Any], queue: Any) -> None:
-    os.environ["FIBER_LINK_SIM_NO_SUBPROCESS"] = "1"
-    result = simulate(spec_payload)
-    queue.put(result.model_dump())
-
-
-def _run_in_subprocess(spec_payload: dict[str, Any]) -> SimulationResult:
-    ctx = get_context("spawn")
-    queue = ctx.Queue()
-    process = ctx.Process(target=_simulate_worker, args=(spec_payload, queue))
-    process.start()
-    process.join()
-    if process.exitcode != 0 or queue.empty():
-        return SimulationResult(
-            v="v0.2",
-            status="error",
-            error=ErrorInfo(
-                code="runtime_error",
-                message="subprocess simulation failed",
-                details={"exitcode": process.exitcode},
-            ),
-            provenance=Provenance(
-                sim_version=SIM_VERSION,
-                spec_hash="unknown",
-                seed=0,
-                runtime_s=0.0,
-                backend=None,
-                model=None,
-            ),
-        )
-    return SimulationResult.model_validate(queue.get())
+def _artifact_writer_workers() -> int:
+    # Cached DAG node states are pickled as soon as a node finishes, so artifact entries
+    # must be complete by then; write-behind only applies to the sequential executor.
+    if os.getenv("FIBER_LINK_SIM_PIPELINE_EXECUTOR", "sequential").strip().lower() == "dag":
+        return 0
+    return max(0, int(os.getenv("FIBER_LINK_SIM_ARTIFACT_WRITERS", "2")))
+
+
+def _spill_bytes() -> int | None:
+    value = os.getenv("FIBER_LINK_SIM_SPILL_BYTES", "").strip()
+    return parse_byte_size(value) if value else None
+
+
+def _artifact_layout() -> str:
+    layout = os.getenv("FIBER_LINK_SIM_ARTIFACT_LAYOUT", "files").strip().lower()
+    if layout not in {"files", "bundle"}:
+        raise ValueError(f"unknown FIBER_LINK_SIM_ARTIFACT_LAYOUT: {layout!r}")
+    return layout
+
+
+def _bundle_store(store: ArtifactStore) -> BundleArtifactStore | None:
+    if isinstance(store, AsyncArtifactWriter):
+        store = store.store
+    return store if isinstance(store, BundleArtifactStore) else None
+
+
+def _isolation_enabled() -> bool:
+    return os.getenv("FIBER_LINK_SIM_ISOLATE", "").strip().lower() in {"1", "true", "yes"}
+
+
+def _run_isolated(spec_model: SimulationSpec) -> SimulationResult:
+    """Run ``spec_model`` on the shared warm worker pool instead of in this process."""
+    from fiber_link_sim.workers import get_pool
+
+    return get_pool().run(spec_model)
 
 
 def _load_spec(spec: dict[str, Any] | str | Path | SimulationSpec) -> SimulationSpec:
@@ -76,57 +89,153 @@ def _load_spec(spec: dict[str, Any] | str | Path | SimulationSpec) -> Simulation
     return SimulationSpec.model_validate(spec)
 
 
-def simulate(spec: dict[str, Any] | str | Path | SimulationSpec) -> SimulationResult:
+def _error_result(
+    spec_model: SimulationSpec | None,
+    spec_hash: str,
+    code: ErrorCode,
+    message: str,
+    details: dict[str, Any],
+    runtime_s: float,
+    warnings: list[str] | None = None,
+) -> SimulationResult:
+    return SimulationResult(
+        v=spec_model.v if spec_model is not None else "v0.2",
+        status="error",
+        error=ErrorInfo(code=code, message=message, details=details),
+        provenance=Provenance(
+            sim_version=SIM_VERSION,
+            spec_hash=spec_hash,
+            seed=spec_model.runtime.seed if spec_model is not None else 0,
+            runtime_s=runtime_s,
+            backend=spec_model.propagation.backend if spec_model is not None else None,
+            model=spec_model.propagation.model if spec_model is not None else None,
+        ),
+        warnings=warnings or [],
+    )
+
+
+def _cached_result(spec_hash: str, seed: int) -> SimulationResult | None:
+    """Look a run up in the in-process result cache, then in the disk cache."""
+    cache_key = (spec_hash, seed)
+    if _local_cache_enabled():
+        cached = _SIMULATION_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+    disk_cache = DiskResultCache.from_env()
+    if disk_cache is not None:
+        cached = disk_cache.get(spec_hash, SIM_VERSION)
+        if cached is not None:
+            if _local_cache_enabled():
+                return _SIMULATION_CACHE.put(cache_key, cached)
+            return cached
+    return None
+
+
+def _remember_result(spec_hash: str, seed: int, result: SimulationResult) -> SimulationResult:
+    """Fill the disk and in-process result caches with a successful run."""
+    disk_cache = DiskResultCache.from_env()
+    if disk_cache is not None:
+        disk_cache.put(spec_hash, SIM_VERSION, result)
+    if _local_cache_enabled():
+        return _SIMULATION_CACHE.put((spec_hash, seed), result)
+    return result
+
+
+def _success_result(
+    spec_model: SimulationSpec,
+    spec_hash: str,
+    state: SimulationState,
+    runtime_s: float,
+    bundle_index: dict[str, Any] | None,
+) -> SimulationResult:
+    """Write the run manifest (unless ``artifact_level`` is ``none``) and build the result."""
+    warnings = state.meta.get("warnings", [])
+    artifacts = state.artifacts
+    summary_payload = state.stats.get("summary")
+    summary = Summary.model_validate(summary_payload) if summary_payload else None
+
+    if spec_model.outputs.artifact_level != "none":
+        manifest = {
+            "version": "v1",
+            "spec_hash": spec_hash,
+            "seed": spec_model.runtime.seed,
+            "sim_version": SIM_VERSION,
+            "pipeline": "fiber_link_sim",
+            "stage_timings_s": state.meta.get("stage_timings", {}),
+            "refs": list(state.refs.values()),
+            "artifacts": artifacts,
+        }
+        if bundle_index is not None:
+            manifest["bundle"] = bundle_index
+        artifacts.append(state.artifact_store.save_json_artifact("run_manifest", manifest))
+
+    return SimulationResult(
+        v=spec_model.v,
+        status="success",
+        summary=summary,
+        provenance=Provenance(
+            sim_version=SIM_VERSION,
+            spec_hash=spec_hash,
+            seed=spec_model.runtime.seed,
+            runtime_s=runtime_s,
+            backend=spec_model.propagation.backend,
+            model=spec_model.propagation.model,
+        ),
+        warnings=warnings,
+        artifacts=[Artifact.model_validate(artifact) for artifact in artifacts],
+    )
+
+
+def simulate(
+    spec: dict[str, Any] | str | Path | SimulationSpec, *, cancel: threading.Event | None = None
+) -> SimulationResult:
+    """Run one simulation and report the outcome as a ``SimulationResult``.
+
+    Setting ``cancel`` from another thread stops the run at the next stage boundary; the
+    result is then a ``runtime_error`` whose ``exception_type`` is ``SimulationCancelled``.
+    """
     start = time.perf_counter()
     try:
         spec_model = _load_spec(spec)
     except (ValidationError, OSError, json.JSONDecodeError) as exc:
         runtime_s = time.perf_counter() - start
-        return SimulationResult(
-            v="v0.2",
-            status="error",
-            error=ErrorInfo(code="validation_error", message=str(exc)),
-            provenance=Provenance(
-                sim_version=SIM_VERSION,
-                spec_hash="invalid",
-                seed=0,
-                runtime_s=runtime_s,
-                backend=None,
-                model=None,
-            ),
-        )
+        return _error_result(None, "invalid", "validation_error", str(exc), {}, runtime_s)
 
     spec_hash = compute_spec_hash(spec_model)
     cache_key = (spec_hash, spec_model.runtime.seed)
-    if _local_cache_enabled():
-        cached = _SIMULATION_CACHE.get(cache_key)
-        if cached is not None:
-            return SimulationResult.model_validate(cached.model_dump())
+    cached = _cached_result(spec_hash, spec_model.runtime.seed)
+    if cached is not None:
+        return cached
 
     if spec_model.processing.autotune and spec_model.processing.autotune.enabled:
         runtime_s = time.perf_counter() - start
-        return SimulationResult(
-            v=spec_model.v,
-            status="error",
-            error=ErrorInfo(
-                code="not_implemented",
-                message="processing.autotune.enabled is not implemented",
-                details={
-                    "budget_trials": spec_model.processing.autotune.budget_trials,
-                    "targets": spec_model.processing.autotune.targets,
-                },
-            ),
-            provenance=Provenance(
-                sim_version=SIM_VERSION,
-                spec_hash=spec_hash,
-                seed=spec_model.runtime.seed,
-                runtime_s=runtime_s,
-                backend=spec_model.propagation.backend,
-                model=spec_model.propagation.model,
-            ),
+        return _error_result(
+            spec_model,
+            spec_hash,
+            "not_implemented",
+            "processing.autotune.enabled is not implemented",
+            {
+                "budget_trials": spec_model.processing.autotune.budget_trials,
+                "targets": spec_model.processing.autotune.targets,
+            },
+            runtime_s,
         )
 
-    artifact_store = LocalArtifactStore(artifact_root_for_spec(spec_hash))
+    if _isolation_enabled() and not os.environ.get("FIBER_LINK_SIM_NO_SUBPROCESS"):
+        result = _run_isolated(spec_model)
+        if result.status == "success" and _local_cache_enabled():
+            return _SIMULATION_CACHE.put(cache_key, result)
+        return result
+
+    store_cls = BundleArtifactStore if _artifact_layout() == "bundle" else HybridArtifactStore
+    artifact_store: ArtifactStore = store_cls(
+        artifact_root_for_spec(spec_hash, create=False),
+        persist_blobs=spec_model.outputs.artifact_level == "debug",
+        spill_bytes=_spill_bytes(),
+    )
+    writer_workers = _artifact_writer_workers()
+    if writer_workers and spec_model.outputs.artifact_level != "none":
+        artifact_store = AsyncArtifactWriter(artifact_store, max_workers=writer_workers)
     state = SimulationState(
         meta={
             "seed": spec_model.runtime.seed,
@@ -140,30 +249,22 @@ def simulate(spec: dict[str, Any] | str | Path | SimulationSpec) -> SimulationRe
     timeout_s = spec_model.runtime.max_runtime_s - (time.perf_counter() - start)
     if timeout_s <= 0:
         runtime_s = time.perf_counter() - start
-        return SimulationResult(
-            v=spec_model.v,
-            status="error",
-            error=ErrorInfo(
-                code="timeout",
-                message="runtime exceeded max_runtime_s before pipeline execution",
-                details={
-                    "max_runtime_s": spec_model.runtime.max_runtime_s,
-                    "elapsed_s": runtime_s,
-                },
-            ),
-            provenance=Provenance(
-                sim_version=SIM_VERSION,
-                spec_hash=spec_hash,
-                seed=spec_model.runtime.seed,
-                runtime_s=runtime_s,
-                backend=spec_model.propagation.backend,
-                model=spec_model.propagation.model,
-            ),
-            warnings=state.meta.get("warnings", []),
+        return _error_result(
+            spec_model,
+            spec_hash,
+            "timeout",
+            "runtime exceeded max_runtime_s before pipeline execution",
+            {"max_runtime_s": spec_model.runtime.max_runtime_s, "elapsed_s": runtime_s},
+            runtime_s,
+            state.meta.get("warnings", []),
         )
 
     try:
-        execution = run_pipeline(pipeline, state)
+        execution = run_pipeline(pipeline, state, cancel=cancel)
+        if isinstance(state.artifact_store, AsyncArtifactWriter):
+            state.artifact_store.close()
+        bundle_store = _bundle_store(state.artifact_store)
+        bundle_index = bundle_store.finalize() if bundle_store is not None else None
         state.meta.setdefault("pipeline_execution", {})
         state.meta["pipeline_execution"].update(
             {
@@ -173,85 +274,36 @@ def simulate(spec: dict[str, Any] | str | Path | SimulationSpec) -> SimulationRe
             }
         )
     except Exception as exc:
+        if isinstance(state.artifact_store, AsyncArtifactWriter):
+            # A failed or cancelled run must not leave writer threads behind.
+            state.artifact_store.abort()
+        bundle_store = _bundle_store(state.artifact_store)
+        if bundle_store is not None:
+            bundle_store.discard()
         if isinstance(exc, SystemError) and not os.environ.get("FIBER_LINK_SIM_NO_SUBPROCESS"):
-            return _run_in_subprocess(spec_model.model_dump())
+            return _run_isolated(spec_model)
         runtime_s = time.perf_counter() - start
-        return SimulationResult(
-            v=spec_model.v,
-            status="error",
-            error=ErrorInfo(
-                code="runtime_error",
-                message=str(exc),
-                details={"exception_type": exc.__class__.__name__},
-            ),
-            provenance=Provenance(
-                sim_version=SIM_VERSION,
-                spec_hash=state.meta["spec_hash"],
-                seed=spec_model.runtime.seed,
-                runtime_s=runtime_s,
-                backend=spec_model.propagation.backend,
-                model=spec_model.propagation.model,
-            ),
-            warnings=state.meta.get("warnings", []),
+        return _error_result(
+            spec_model,
+            state.meta["spec_hash"],
+            "runtime_error",
+            str(exc),
+            {"exception_type": exc.__class__.__name__},
+            runtime_s,
+            state.meta.get("warnings", []),
         )
 
     runtime_s = time.perf_counter() - start
     if runtime_s > spec_model.runtime.max_runtime_s:
-        return SimulationResult(
-            v=spec_model.v,
-            status="error",
-            error=ErrorInfo(
-                code="timeout",
-                message="runtime exceeded max_runtime_s during pipeline execution",
-                details={
-                    "max_runtime_s": spec_model.runtime.max_runtime_s,
-                    "elapsed_s": runtime_s,
-                },
-            ),
-            provenance=Provenance(
-                sim_version=SIM_VERSION,
-                spec_hash=state.meta["spec_hash"],
-                seed=spec_model.runtime.seed,
-                runtime_s=runtime_s,
-                backend=spec_model.propagation.backend,
-                model=spec_model.propagation.model,
-            ),
-            warnings=state.meta.get("warnings", []),
+        return _error_result(
+            spec_model,
+            state.meta["spec_hash"],
+            "timeout",
+            "runtime exceeded max_runtime_s during pipeline execution",
+            {"max_runtime_s": spec_model.runtime.max_runtime_s, "elapsed_s": runtime_s},
+            runtime_s,
+            state.meta.get("warnings", []),
         )
 
-    warnings = state.meta.get("warnings", [])
-    artifacts = state.artifacts
-    summary_payload = state.stats.get("summary")
-    summary = Summary.model_validate(summary_payload) if summary_payload else None
-
-    if spec_model.outputs.artifact_level != "none":
-        manifest = {
-            "version": "v1",
-            "spec_hash": spec_hash,
-            "seed": spec_model.runtime.seed,
-            "sim_version": SIM_VERSION,
-            "pipeline": "fiber_link_sim",
-            "stage_timings_s": state.meta.get("stage_timings", {}),
-            "refs": list(state.refs.values()),
-            "artifacts": artifacts,
-        }
-        artifacts.append(state.artifact_store.save_json_artifact("run_manifest", manifest))
-
-    result = SimulationResult(
-        v=spec_model.v,
-        status="success",
-        summary=summary,
-        provenance=Provenance(
-            sim_version=SIM_VERSION,
-            spec_hash=spec_hash,
-            seed=spec_model.runtime.seed,
-            runtime_s=runtime_s,
-            backend=spec_model.propagation.backend,
-            model=spec_model.propagation.model,
-        ),
-        warnings=warnings,
-        artifacts=[Artifact.model_validate(artifact) for artifact in artifacts],
-    )
-    if _local_cache_enabled():
-        _SIMULATION_CACHE[cache_key] = result
-    return SimulationResult.model_validate(result.model_dump())
+    result = _success_result(spec_model, spec_hash, state, runtime_s, bundle_index)
+    return _remember_result(spec_hash, spec_model.runtime.seed, result)
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-import copy
 import hashlib
+from collections.abc import Iterable, Iterator, Sequence
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Literal, overload
 
 import numpy as np
 from phys_pipeline import (
@@ -12,10 +12,19 @@ from phys_pipeline import (
     StageResult,
     State,
 )
-from phys_pipeline.types import hash_ndarray, hash_small
+from phys_pipeline.types import hash_small
 
 import fiber_link_sim._compat  # noqa: F401
-from fiber_link_sim.artifacts import ArtifactStore, BlobPayload, InMemoryArtifactStore
+from fiber_link_sim.artifacts import (
+    ArtifactStore,
+    BlobPayload,
+    InMemoryArtifactStore,
+    LazyArray,
+)
+from fiber_link_sim.blob_pool import LINEAGE_PREFIX
+from fiber_link_sim.chunked import ChunkedArray
+from fiber_link_sim.compact import PackedBits, QuantizedLLRs, decode_compact, encode_compact
+from fiber_link_sim.fingerprint import dependency_versions, fingerprint_array, lineage_digest
 
 
 @dataclass(slots=True)
@@ -27,11 +36,69 @@ class SimulationState(State):
     stats: dict[str, Any] = field(default_factory=dict)
     artifacts: list[dict[str, Any]] = field(default_factory=list)
     artifact_store: ArtifactStore = field(default_factory=InMemoryArtifactStore)
+    node_key: str | None = None
 
     def deepcopy(self) -> SimulationState:
-        return copy.deepcopy(self)
+        """Cheap structurally shared copy; see ``fork``."""
+        return self.fork()
+
+    def fork(self) -> SimulationState:
+        """Structurally shared copy for a new branch or DAG node.
+
+        Blob arrays are immutable (stores hold read-only views) and stay in the shared artifact
+        store, and ref and artifact entries are replaced rather than edited once recorded, so
+        all of them are shared by reference. Only the containers a stage writes into are
+        copied: the top-level dicts and the dicts and lists directly under them (``signals``
+        sections, ``stage_timings``, ``warnings``, ...). ``node_key`` is not inherited because
+        the copy is about to diverge.
+        """
+        return SimulationState(
+            meta=_cow_copy(self.meta),
+            refs=dict(self.refs),
+            signals=_cow_copy(self.signals),
+            rx=_cow_copy(self.rx),
+            stats=_cow_copy(self.stats),
+            artifacts=list(self.artifacts),
+            artifact_store=self.artifact_store,
+        )
+
+    def adopt(self, other: SimulationState) -> None:
+        """Take over ``other``'s bookkeeping and store in place, without copying."""
+        self.meta = other.meta
+        self.refs = other.refs
+        self.signals = other.signals
+        self.rx = other.rx
+        self.stats = other.stats
+        self.artifacts = other.artifacts
+        self.artifact_store = other.artifact_store
+        self.node_key = other.node_key
+
+    @classmethod
+    def merge(cls, branches: Sequence[SimulationState]) -> SimulationState:
+        """Join branches forked from a common ancestor.
+
+        Branches only add to what they inherited, so earlier branches win on shared keys and
+        later ones contribute the keys, list items and artifacts they added.
+        """
+        merged = branches[0].fork()
+        for branch in branches[1:]:
+            for target, source in (
+                (merged.meta, branch.meta),
+                (merged.refs, branch.refs),
+                (merged.signals, branch.signals),
+                (merged.rx, branch.rx),
+                (merged.stats, branch.stats),
+            ):
+                _merge_added(target, source)
+            merged.artifacts.extend(
+                artifact for artifact in branch.artifacts if artifact not in merged.artifacts
+            )
+        return merged
 
     def hashable_repr(self) -> bytes:
+        """The Merkle ``node_key`` when a DAG node assigned one, else a hash of the contents."""
+        if self.node_key is not None:
+            return self.node_key.encode()
         h = hashlib.sha256()
         for payload in (self.meta, self.refs, self.signals, self.rx, self.stats):
             h.update(_hash_payload(payload))
@@ -43,6 +110,17 @@ class SimulationState(State):
         seed = int(self.meta.get("seed", 0))
         return derive_stage_rng(seed, stage_name)
 
+    def lineage_key(self, stage_name: str, slice_hash: str, inputs: Iterable[str] = ()) -> str:
+        """Identity of a deterministic stage invocation: config, seed, upstream refs, versions."""
+        return lineage_digest(
+            str(self.meta.get("version", "")),
+            dependency_versions(),
+            stage_name,
+            slice_hash,
+            str(self.meta.get("seed", 0)),
+            *inputs,
+        )
+
     def store_blob(
         self,
         name: str,
@@ -50,14 +128,45 @@ class SimulationState(State):
         *,
         role: str,
         units: str | None = None,
+        lineage: str | None = None,
     ) -> str:
+        """Store ``array`` and return its ref.
+
+        With ``lineage`` (see ``lineage_key``) the blob identity is derived from the
+        producing stage instead of hashing the array's bytes.
+        """
+        digest = _lineage_blob_digest(lineage, name, role) if lineage is not None else None
         payload = self.artifact_store.write_blob(
-            BlobPayload(name=name, array=np.asarray(array), role=role, units=units)
+            BlobPayload(name=name, array=np.asarray(array), role=role, units=units, digest=digest)
         )
+        if digest is not None:
+            payload["digest"] = digest
         ref = payload["ref"]
         self.refs[ref] = payload
         return ref
 
+    def store_compact(
+        self,
+        name: str,
+        value: np.ndarray | PackedBits | QuantizedLLRs,
+        *,
+        role: str,
+        units: str | None = None,
+        lineage: str | None = None,
+    ) -> str:
+        """Store a packed/quantized value; its decoding metadata is kept on the ref.
+
+        The encoding is folded into ``lineage`` so packed and unpacked forms never share a blob.
+        """
+        if isinstance(value, np.ndarray):
+            return self.store_blob(name, value, role=role, units=units, lineage=lineage)
+        array, meta = encode_compact(value)
+        if lineage is not None:
+            lineage = lineage_digest(lineage, meta["compact"])
+        ref = self.store_blob(name, array, role=role, units=units, lineage=lineage)
+        self.refs[ref].update(meta)
+        return ref
+
     def store_signal(
         self,
         section: str,
@@ -65,28 +174,99 @@ class SimulationState(State):
         array: np.ndarray,
         *,
         units: str | None = None,
+        lineage: str | None = None,
+    ) -> str:
+        ref = self.store_blob(name, array, role=f"signal:{section}", units=units, lineage=lineage)
+        self.signals.setdefault(section, {})[name] = ref
+        return ref
+
+    def store_signal_chunks(
+        self,
+        section: str,
+        name: str,
+        chunks: Iterable[np.ndarray],
+        *,
+        units: str | None = None,
+        lineage: str | None = None,
     ) -> str:
-        ref = self.store_blob(name, array, role=f"signal:{section}", units=units)
+        """Stream a signal into a chunked blob without holding it in memory."""
+        role = f"signal:{section}"
+        digest = _lineage_blob_digest(lineage, name, role) if lineage is not None else None
+        payload = self.artifact_store.write_blob_chunks(
+            name, chunks, role=role, units=units, digest=digest
+        )
+        if digest is not None:
+            payload["digest"] = digest
+        ref = payload["ref"]
+        self.refs[ref] = payload
         self.signals.setdefault(section, {})[name] = ref
         return ref
 
     def load_ref(self, ref: str) -> np.ndarray:
         return np.asarray(self.artifact_store.read_blob(ref))
 
-    def load_signal(self, section: str, name: str) -> np.ndarray | None:
+    def load_compact(self, ref: str) -> np.ndarray | PackedBits | QuantizedLLRs:
+        return decode_compact(self.load_ref(ref), self.refs.get(ref, {}))
+
+    def load_packed_bits(self, ref: str) -> PackedBits:
+        value = self.load_compact(ref)
+        if isinstance(value, QuantizedLLRs):
+            raise ValueError(f"{ref} holds quantized LLRs, not bits")
+        return value if isinstance(value, PackedBits) else PackedBits.from_bits(value)
+
+    def load_llrs(self, ref: str) -> np.ndarray | QuantizedLLRs:
+        value = self.load_compact(ref)
+        if isinstance(value, PackedBits):
+            raise ValueError(f"{ref} holds packed bits, not LLRs")
+        return value
+
+    @overload
+    def load_signal(
+        self, section: str, name: str, *, lazy: Literal[False] = False
+    ) -> np.ndarray | None: ...
+
+    @overload
+    def load_signal(self, section: str, name: str, *, lazy: bool) -> LazyArray | None: ...
+
+    def load_signal(self, section: str, name: str, *, lazy: bool = False) -> LazyArray | None:
+        """Load a signal by section/name.
+
+        ``lazy=True`` returns the store's view without materializing it: an in-memory or
+        memory-mapped array, or a ``ChunkedArray`` that only reads the chunks it touches.
+        """
         ref = self.signals.get(section, {}).get(name)
         if ref is None:
             return None
+        if lazy:
+            return self.artifact_store.open_blob(ref)
         return self.load_ref(ref)
 
+    def iter_signal_chunks(
+        self, section: str, name: str, *, chunk_len: int | None = None
+    ) -> Iterator[np.ndarray]:
+        """Yield a signal in pieces along axis 0 (stored chunks unless ``chunk_len`` is set)."""
+        signal = self.load_signal(section, name, lazy=True)
+        if signal is None:
+            return
+        if isinstance(signal, ChunkedArray) and chunk_len is None:
+            yield from signal.iter_chunks()
+            return
+        step = chunk_len or max(len(signal), 1)
+        for start in range(0, len(signal), step):
+            yield np.asarray(signal[start : start + step])
+
 
 class Stage(PipelineStage[SimulationState, StageConfig]):
     name: str = "stage"
 
 
+def _lineage_blob_digest(lineage: str, name: str, role: str) -> str:
+    return LINEAGE_PREFIX + lineage_digest(lineage, name, role)
+
+
 def _hash_payload(payload: Any) -> bytes:
     if isinstance(payload, np.ndarray):
-        return hash_ndarray(payload)
+        return bytes.fromhex(fingerprint_array(payload))
     if isinstance(payload, dict):
         h = hashlib.sha256()
         for key in sorted(payload.keys()):
@@ -101,4 +281,28 @@ def _hash_payload(payload: Any) -> bytes:
     return hash_small(payload)
 
 
+def _cow_value(value: Any) -> Any:
+    return value.copy() if isinstance(value, (dict, list)) else value
+
+
+def _cow_copy(mapping: dict[str, Any]) -> dict[str, Any]:
+    return {key: _cow_value(value) for key, value in mapping.items()}
+
+
+def _merge_added(target: dict[str, Any], source: dict[str, Any]) -> None:
+    # ``target`` is owned by the merged state, but the containers below it may still be shared
+    # with the branches and their ancestor, so each one is copied before it is changed.
+    for key, value in source.items():
+        current = target.get(key)
+        if key not in target:
+            target[key] = _cow_value(value)
+        elif current is value:
+            continue
+        elif isinstance(current, dict) and isinstance(value, dict):
+            target[key] = _cow_copy(current)
+            _merge_added(target[key], value)
+        elif isinstance(current, list) and isinstance(value, list):
+            target[key] = [*current, *(item for item in value if item not in current)]
+
+
 __all__ = ["SimulationState", "Stage", "StageConfig", "StageResult"]
@@ -1,19 +1,23 @@
 from __future__ import annotations
 
 import time
+from collections.abc import Callable, Iterator
 from dataclasses import dataclass
 from math import log10
+from typing import TYPE_CHECKING
 
 import numpy as np
 
-from fiber_link_sim.adapters.opticommpy import ADAPTERS
 from fiber_link_sim.artifacts import (
     ArtifactPayload,
     build_eye_traces,
     compute_phase_error,
     compute_psd,
 )
+from fiber_link_sim.compact import PackedBits, compact_symbols
+from fiber_link_sim.data_models.stage_models import ArtifactsSpecSlice
 from fiber_link_sim.latency import compute_latency_budget
+from fiber_link_sim.metrics import ber_from_snr_linear, evm_from_snr_linear
 from fiber_link_sim.stages.base import SimulationState, Stage, StageResult
 from fiber_link_sim.stages.configs import (
     ArtifactsStageConfig,
@@ -24,7 +28,22 @@ from fiber_link_sim.stages.configs import (
     RxFrontEndStageConfig,
     TxStageConfig,
 )
-from fiber_link_sim.utils import bits_per_symbol, total_link_length_m
+from fiber_link_sim.utils import bits_per_symbol, compute_slice_hash, total_link_length_m
+
+if TYPE_CHECKING:
+    from fiber_link_sim.adapters.opticommpy.metrics import MetricsOutput
+    from fiber_link_sim.adapters.opticommpy.stages import OptiCommPyAdapters
+
+
+def _adapters() -> OptiCommPyAdapters:
+    """The OptiCommPy adapters, imported when the first stage runs rather than with this module.
+
+    Importing ``optic`` takes seconds, and validation, hashing, cache hits and the latency
+    model never need it.
+    """
+    from fiber_link_sim.adapters.opticommpy.stages import ADAPTERS
+
+    return ADAPTERS
 
 
 @dataclass(slots=True)
@@ -36,15 +55,18 @@ class TxStage(Stage):
         start = time.perf_counter()
         spec = self.cfg.spec
         rng = state.stage_rng(self.name)
-        tx_out = ADAPTERS.tx.run(spec, int(rng.integers(0, 2**31 - 1)))
+        tx_out = _adapters().tx.run(spec, int(rng.integers(0, 2**31 - 1)))
 
         total_bits = int(spec.runtime.n_symbols * bits_per_symbol(spec.signal))
         if tx_out.signal is None:
             raise ValueError("missing tx waveform")
         if tx_out.symbols is None:
             raise ValueError("missing tx symbols")
-        state.store_signal("tx", "symbols", tx_out.symbols, units="symbols")
-        state.store_signal("tx", "waveform", tx_out.signal, units="arb")
+        lineage = state.lineage_key(self.name, compute_slice_hash(spec))
+        state.store_signal(
+            "tx", "symbols", compact_symbols(tx_out.symbols), units="symbols", lineage=lineage
+        )
+        state.store_signal("tx", "waveform", tx_out.signal, units="arb", lineage=lineage)
         state.stats["bits_per_symbol"] = bits_per_symbol(spec.signal)
         state.stats["n_symbols"] = spec.runtime.n_symbols
         state.stats["total_bits"] = total_bits
@@ -64,15 +86,63 @@ class ChannelStage(Stage):
         signal = state.load_signal("tx", "waveform")
         if signal is None:
             raise ValueError("missing tx waveform for channel stage")
-        channel_out = ADAPTERS.channel.run(spec, signal, int(rng.integers(0, 2**31 - 1)))
+        channel_out = _adapters().channel.run(spec, signal, int(rng.integers(0, 2**31 - 1)))
 
         total_length_m = total_link_length_m(spec.path)
-        state.store_signal("optical", "waveform", channel_out.signal, units="arb")
+        lineage = state.lineage_key(
+            self.name, compute_slice_hash(spec), [state.signals["tx"]["waveform"]]
+        )
+        state.store_signal("optical", "waveform", channel_out.signal, units="arb", lineage=lineage)
         state.stats.update(
             {
                 "total_length_m": total_length_m,
                 "n_spans": channel_out.n_spans,
                 "osnr_db": channel_out.osnr_db,
+                "propagation_path": channel_out.propagation_path,
+            }
+        )
+        state.meta.setdefault("stage_timings", {})[self.name] = time.perf_counter() - start
+        return StageResult(state=state)
+
+
+@dataclass(slots=True)
+class GnModelStage(Stage):
+    """Closed-form GN model in place of Tx through FEC (``propagation.backend = "gn_model"``).
+
+    No waveform is generated: OSNR, SNR, EVM and BER come straight from the link parameters
+    at the spec's launch power, and MetricsStage builds the summary from them.
+    """
+
+    cfg: ChannelStageConfig
+    name: str = "gn_model"
+
+    def process(self, state: SimulationState, *, policy: object | None = None) -> StageResult:
+        from fiber_link_sim.adapters.opticommpy import units
+        from fiber_link_sim.propagation.gn_model import GnLink, gn_estimate
+
+        start = time.perf_counter()
+        spec = self.cfg.spec
+        link = GnLink.from_spec(spec, carrier_hz=units.carrier_frequency_hz())
+        estimate = gn_estimate(link, spec.transceiver.tx.launch_power_dbm)
+        snr_linear = 10 ** (float(estimate.snr_db) / 10.0)
+        # QPSK carries two bits per symbol, so its per-bit SNR is half the symbol SNR.
+        pre_fec_ber = ber_from_snr_linear(spec.signal.format, snr_linear / 2.0)
+        total_bits = int(spec.runtime.n_symbols * bits_per_symbol(spec.signal))
+        state.stats.update(
+            {
+                "bits_per_symbol": bits_per_symbol(spec.signal),
+                "n_symbols": spec.runtime.n_symbols,
+                "total_bits": total_bits,
+                "total_length_m": total_link_length_m(spec.path),
+                "n_spans": link.n_spans,
+                "osnr_db": None if estimate.osnr_db is None else float(estimate.osnr_db),
+                "snr_db": float(estimate.snr_db),
+                "evm_rms": evm_from_snr_linear(snr_linear),
+                "pre_fec_ber": pre_fec_ber,
+                # No decoded frames to count: post-FEC follows the FEC adapter's fallback.
+                "post_fec_ber": pre_fec_ber,
+                "fer": min(1.0, pre_fec_ber * 10.0),
+                "propagation_path": "gn_model",
             }
         )
         state.meta.setdefault("stage_timings", {})[self.name] = time.perf_counter() - start
@@ -91,8 +161,11 @@ class RxFrontEndStage(Stage):
         signal = state.load_signal("optical", "waveform")
         if signal is None:
             raise ValueError("missing optical waveform for rx frontend")
-        rx_out = ADAPTERS.rx_frontend.run(spec, signal, int(rng.integers(0, 2**31 - 1)))
-        state.store_signal("rx", "samples", rx_out.samples, units="arb")
+        rx_out = _adapters().rx_frontend.run(spec, signal, int(rng.integers(0, 2**31 - 1)))
+        lineage = state.lineage_key(
+            self.name, compute_slice_hash(spec), [state.signals["optical"]["waveform"]]
+        )
+        state.store_signal("rx", "samples", rx_out.samples, units="arb", lineage=lineage)
         state.rx["frontend"] = rx_out.params
         state.meta.setdefault("stage_timings", {})[self.name] = time.perf_counter() - start
         return StageResult(state=state)
@@ -109,16 +182,27 @@ class DSPStage(Stage):
         samples = state.load_signal("rx", "samples")
         if samples is None:
             raise ValueError("missing rx samples for DSP stage")
-        dsp_out = ADAPTERS.dsp.run(spec, samples, spec.processing.dsp_chain)
-        state.store_signal("rx", "dsp_samples", dsp_out.samples, units="arb")
-        state.store_signal("rx", "symbols", dsp_out.symbols, units="symbols")
+        dsp_out = _adapters().dsp.run(spec, samples, spec.processing.dsp_chain)
+        lineage = state.lineage_key(
+            self.name, compute_slice_hash(spec), [state.signals["rx"]["samples"]]
+        )
+        state.store_signal("rx", "dsp_samples", dsp_out.samples, units="arb", lineage=lineage)
+        state.store_signal(
+            "rx", "symbols", compact_symbols(dsp_out.symbols), units="symbols", lineage=lineage
+        )
         if dsp_out.hard_bits is not None:
-            ref = state.store_blob(
-                "hard_bits", dsp_out.hard_bits, role="rx:hard_bits", units="bits"
+            ref = state.store_compact(
+                "hard_bits",
+                PackedBits.from_bits(dsp_out.hard_bits),
+                role="rx:hard_bits",
+                units="bits",
+                lineage=lineage,
             )
             state.rx["hard_bits_ref"] = ref
         if dsp_out.llrs is not None:
-            ref = state.store_blob("llrs", dsp_out.llrs, role="rx:llrs", units="llr")
+            ref = state.store_compact(
+                "llrs", dsp_out.llrs, role="rx:llrs", units="llr", lineage=lineage
+            )
             state.rx["llrs_ref"] = ref
         state.stats["dsp"] = dsp_out.params
         state.meta.setdefault("stage_timings", {})[self.name] = time.perf_counter() - start
@@ -138,24 +222,17 @@ class FECStage(Stage):
             symb_tx = state.load_signal("tx", "symbols")
             if symb_rx is None or symb_tx is None:
                 raise ValueError("missing symbols for FEC stage")
-            metrics = ADAPTERS.metrics.compute(symb_rx, symb_tx, spec)
-            state.stats.update(
-                {
-                    "pre_fec_ber": metrics.pre_fec_ber,
-                    "snr_db": metrics.snr_db,
-                    "evm_rms": metrics.evm_rms,
-                }
-            )
+            _record_metrics(state, _adapters().metrics.compute(symb_rx, symb_tx, spec))
         pre_fec_ber = float(state.stats.get("pre_fec_ber", 0.0))
         llrs_ref = state.rx.get("llrs_ref")
         hard_bits_ref = state.rx.get("hard_bits_ref")
-        llrs = state.load_ref(llrs_ref) if llrs_ref else None
-        hard_bits = state.load_ref(hard_bits_ref) if hard_bits_ref else None
+        llrs = state.load_llrs(llrs_ref) if llrs_ref else None
+        hard_bits = state.load_packed_bits(hard_bits_ref) if hard_bits_ref else None
         tx_symbols = state.load_signal("tx", "symbols")
         if tx_symbols is None:
             raise ValueError("missing tx symbols for FEC stage")
         try:
-            fec_out = ADAPTERS.fec.run(spec, tx_symbols, llrs, hard_bits, pre_fec_ber)
+            fec_out = _adapters().fec.run(spec, tx_symbols, llrs, hard_bits, pre_fec_ber)
             post_fec_ber = fec_out.post_fec_ber
             fer = fec_out.fer
         except Exception as exc:
@@ -174,6 +251,36 @@ class FECStage(Stage):
         return StageResult(state=state)
 
 
+def _record_metrics(state: SimulationState, metrics: MetricsOutput) -> None:
+    state.stats.update(
+        {
+            "pre_fec_ber": metrics.pre_fec_ber,
+            "snr_db": metrics.snr_db,
+            "evm_rms": metrics.evm_rms,
+        }
+    )
+    if metrics.ber_fallback is not None:
+        state.meta.setdefault("warnings", []).append(
+            f"pre-FEC BER is the theoretical value at the measured SNR: {metrics.ber_fallback}."
+        )
+
+
+@dataclass(slots=True)
+class LatencyStage(Stage):
+    """Latency budget as its own step: it needs the link geometry but not DSP or FEC results."""
+
+    cfg: MetricsStageConfig
+    name: str = "latency"
+
+    def process(self, state: SimulationState, *, policy: object | None = None) -> StageResult:
+        start = time.perf_counter()
+        latency_budget, latency_metadata = compute_latency_budget(self.cfg.spec, state.stats)
+        state.stats["latency_budget"] = latency_budget
+        state.stats["latency_metadata"] = latency_metadata
+        state.meta.setdefault("stage_timings", {})[self.name] = time.perf_counter() - start
+        return StageResult(state=state)
+
+
 @dataclass(slots=True)
 class MetricsStage(Stage):
     cfg: MetricsStageConfig
@@ -187,19 +294,16 @@ class MetricsStage(Stage):
             symb_tx = state.load_signal("tx", "symbols")
             if symb_rx is None or symb_tx is None:
                 raise ValueError("missing symbols for metrics stage")
-            metrics = ADAPTERS.metrics.compute(symb_rx, symb_tx, spec)
-            state.stats.update(
-                {
-                    "pre_fec_ber": metrics.pre_fec_ber,
-                    "snr_db": metrics.snr_db,
-                    "evm_rms": metrics.evm_rms,
-                }
-            )
+            _record_metrics(state, _adapters().metrics.compute(symb_rx, symb_tx, spec))
 
         bits_per_symbol_val = int(state.stats.get("bits_per_symbol", 1))
         total_bits = int(state.stats.get("total_bits", 0))
 
-        latency_budget, latency_metadata = compute_latency_budget(spec, state.stats)
+        if "latency_budget" in state.stats:
+            latency_budget = state.stats["latency_budget"]
+            latency_metadata = state.stats["latency_metadata"]
+        else:
+            latency_budget, latency_metadata = compute_latency_budget(spec, state.stats)
 
         raw_line_rate = spec.signal.symbol_rate_baud * bits_per_symbol_val
         if spec.processing.fec.enabled:
@@ -237,10 +341,34 @@ class MetricsStage(Stage):
         return StageResult(state=state)
 
 
+ARTIFACT_PRODUCTS: tuple[str, ...] = ("tx", "channel", "rx", "dsp")
+"""Artifact groups, each keyed by the stage whose signals it reads."""
+
+_ARTIFACT_ORDER = (
+    "tx_waveform",
+    "optical_waveform",
+    "rx_samples",
+    "tx_psd",
+    "channel_psd",
+    "rx_eye",
+    "dsp_eye",
+    "dsp_constellation",
+    "dsp_phase_error",
+    "tx_constellation",
+)
+
+
 @dataclass(slots=True)
 class ArtifactsStage(Stage):
+    """Write the artifact ``products`` for the run.
+
+    The default writes every product; DAG execution runs one stage per product next to the
+    compute chain and a final stage with no products that only orders the merged entries.
+    """
+
     cfg: ArtifactsStageConfig
     name: str = "artifacts"
+    products: tuple[str, ...] = ARTIFACT_PRODUCTS
 
     def process(self, state: SimulationState, *, policy: object | None = None) -> StageResult:
         start = time.perf_counter()
@@ -251,104 +379,99 @@ class ArtifactsStage(Stage):
         if not spec.outputs.return_waveforms:
             return StageResult(state=state)
 
-        waveforms: list[tuple[str, np.ndarray | None]] = [
-            ("tx_waveform", state.load_signal("tx", "waveform")),
-            ("optical_waveform", state.load_signal("optical", "waveform")),
-            ("rx_samples", state.load_signal("rx", "samples")),
-        ]
-
-        for name, waveform in waveforms:
-            if waveform is None:
-                continue
-            state.artifacts.append(
-                state.artifact_store.save_npz_artifact(
-                    ArtifactPayload(name=name, arrays={"data": np.asarray(waveform)})
-                )
-            )
-
-        fs_hz = spec.signal.symbol_rate_baud * spec.runtime.samples_per_symbol
-        tx_waveform = state.load_signal("tx", "waveform")
-        if tx_waveform is not None:
-            freqs, psd_db = compute_psd(np.asarray(tx_waveform), fs_hz)
-            if freqs.size:
-                state.artifacts.append(
-                    state.artifact_store.save_npz_artifact(
-                        ArtifactPayload(name="tx_psd", arrays={"freq_hz": freqs, "psd_db": psd_db})
-                    )
-                )
-
-        optical_waveform = state.load_signal("optical", "waveform")
-        if optical_waveform is not None:
-            freqs, psd_db = compute_psd(np.asarray(optical_waveform), fs_hz)
-            if freqs.size:
-                state.artifacts.append(
-                    state.artifact_store.save_npz_artifact(
-                        ArtifactPayload(
-                            name="channel_psd", arrays={"freq_hz": freqs, "psd_db": psd_db}
-                        )
-                    )
-                )
-
-        rx_samples = state.load_signal("rx", "samples")
-        if rx_samples is not None:
-            traces = build_eye_traces(np.asarray(rx_samples), spec.runtime.samples_per_symbol)
-            if traces.size:
-                state.artifacts.append(
-                    state.artifact_store.save_npz_artifact(
-                        ArtifactPayload(name="rx_eye", arrays={"traces": traces})
-                    )
-                )
-
-        dsp_samples = state.load_signal("rx", "dsp_samples")
-        if dsp_samples is not None:
-            traces = build_eye_traces(np.asarray(dsp_samples), spec.runtime.samples_per_symbol)
-            if traces.size:
-                state.artifacts.append(
-                    state.artifact_store.save_npz_artifact(
-                        ArtifactPayload(name="dsp_eye", arrays={"traces": traces})
-                    )
-                )
-
-        rx_symbols = state.load_signal("rx", "symbols")
-        if rx_symbols is not None:
-            symbols = np.asarray(rx_symbols).reshape(-1)
-            if symbols.size:
-                state.artifacts.append(
-                    state.artifact_store.save_npz_artifact(
-                        ArtifactPayload(name="dsp_constellation", arrays={"symbols": symbols})
-                    )
-                )
-
-            tx_symbols = state.load_signal("tx", "symbols")
-            phase_error = compute_phase_error(symbols, tx_symbols)
-            if phase_error.size:
-                state.artifacts.append(
-                    state.artifact_store.save_npz_artifact(
-                        ArtifactPayload(name="dsp_phase_error", arrays={"radians": phase_error})
-                    )
-                )
-
-        if spec.outputs.artifact_level == "debug":
-            tx_symbols = state.load_signal("tx", "symbols")
-            if tx_symbols is not None:
-                symbols = np.asarray(tx_symbols).reshape(-1)
-                if symbols.size:
-                    state.artifacts.append(
-                        state.artifact_store.save_npz_artifact(
-                            ArtifactPayload(name="tx_constellation", arrays={"symbols": symbols})
-                        )
-                    )
+        for product in self.products:
+            for payload in _ARTIFACT_BUILDERS[product](state, spec):
+                state.artifacts.append(state.artifact_store.save_npz_artifact(payload))
+        state.artifacts.sort(key=_artifact_rank)
 
         state.meta.setdefault("stage_timings", {})[self.name] = time.perf_counter() - start
         return StageResult(state=state)
 
 
+def _artifact_rank(artifact: dict[str, object]) -> int:
+    name = artifact.get("name")
+    return _ARTIFACT_ORDER.index(name) if name in _ARTIFACT_ORDER else len(_ARTIFACT_ORDER)
+
+
+def _sample_rate_hz(spec: ArtifactsSpecSlice) -> float:
+    return spec.signal.symbol_rate_baud * spec.runtime.samples_per_symbol
+
+
+def _tx_artifacts(state: SimulationState, spec: ArtifactsSpecSlice) -> Iterator[ArtifactPayload]:
+    tx_waveform = state.load_signal("tx", "waveform")
+    if tx_waveform is not None:
+        yield ArtifactPayload(name="tx_waveform", arrays={"data": np.asarray(tx_waveform)})
+        freqs, psd_db = compute_psd(np.asarray(tx_waveform), _sample_rate_hz(spec))
+        if freqs.size:
+            yield ArtifactPayload(name="tx_psd", arrays={"freq_hz": freqs, "psd_db": psd_db})
+
+    if spec.outputs.artifact_level == "debug":
+        tx_symbols = state.load_signal("tx", "symbols")
+        if tx_symbols is not None:
+            symbols = np.asarray(tx_symbols).reshape(-1)
+            if symbols.size:
+                yield ArtifactPayload(name="tx_constellation", arrays={"symbols": symbols})
+
+
+def _channel_artifacts(
+    state: SimulationState, spec: ArtifactsSpecSlice
+) -> Iterator[ArtifactPayload]:
+    optical_waveform = state.load_signal("optical", "waveform")
+    if optical_waveform is not None:
+        yield ArtifactPayload(
+            name="optical_waveform", arrays={"data": np.asarray(optical_waveform)}
+        )
+        freqs, psd_db = compute_psd(np.asarray(optical_waveform), _sample_rate_hz(spec))
+        if freqs.size:
+            yield ArtifactPayload(name="channel_psd", arrays={"freq_hz": freqs, "psd_db": psd_db})
+
+
+def _rx_artifacts(state: SimulationState, spec: ArtifactsSpecSlice) -> Iterator[ArtifactPayload]:
+    rx_samples = state.load_signal("rx", "samples")
+    if rx_samples is not None:
+        yield ArtifactPayload(name="rx_samples", arrays={"data": np.asarray(rx_samples)})
+        traces = build_eye_traces(rx_samples, spec.runtime.samples_per_symbol)
+        if traces.size:
+            yield ArtifactPayload(name="rx_eye", arrays={"traces": traces})
+
+
+def _dsp_artifacts(state: SimulationState, spec: ArtifactsSpecSlice) -> Iterator[ArtifactPayload]:
+    dsp_samples = state.load_signal("rx", "dsp_samples", lazy=True)
+    if dsp_samples is not None:
+        traces = build_eye_traces(dsp_samples, spec.runtime.samples_per_symbol)
+        if traces.size:
+            yield ArtifactPayload(name="dsp_eye", arrays={"traces": traces})
+
+    rx_symbols = state.load_signal("rx", "symbols")
+    if rx_symbols is not None:
+        symbols = np.asarray(rx_symbols).reshape(-1)
+        if symbols.size:
+            yield ArtifactPayload(name="dsp_constellation", arrays={"symbols": symbols})
+
+        tx_symbols = state.load_signal("tx", "symbols")
+        phase_error = compute_phase_error(symbols, tx_symbols)
+        if phase_error.size:
+            yield ArtifactPayload(name="dsp_phase_error", arrays={"radians": phase_error})
+
+
+_ARTIFACT_BUILDERS: dict[
+    str, Callable[[SimulationState, ArtifactsSpecSlice], Iterator[ArtifactPayload]]
+] = {
+    "tx": _tx_artifacts,
+    "channel": _channel_artifacts,
+    "rx": _rx_artifacts,
+    "dsp": _dsp_artifacts,
+}
+
+
 __all__ = [
     "TxStage",
     "ChannelStage",
     "RxFrontEndStage",
     "DSPStage",
     "FECStage",
+    "LatencyStage",
     "MetricsStage",
     "ArtifactsStage",
+    "ARTIFACT_PRODUCTS",
 ]
@@ -0,0 +1,363 @@
+from __future__ import annotations
+
+import copy
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from phys_pipeline import StageConfig
+
+from fiber_link_sim.artifacts import BlobPayload
+from fiber_link_sim.blob_pool import parse_byte_size
+from fiber_link_sim.disk_cache import FileLock, atomic_write_bytes, evict_lru, read_and_touch
+from fiber_link_sim.fingerprint import dependency_versions, lineage_digest
+from fiber_link_sim.stages.base import SimulationState, Stage, StageResult, _hash_payload
+from fiber_link_sim.utils import compute_slice_hash
+
+DEFAULT_MEMO_BYTES = 512 << 20
+DEFAULT_MEMO_DISK_BYTES = 2 << 30
+MEMO_KEYS = "memo_keys"
+
+# Charged per entry on top of its arrays so array-free stages (FEC, metrics) still count.
+_ENTRY_OVERHEAD = 1024
+
+
+@dataclass(slots=True)
+class StageOutputs:
+    """What one stage invocation added to the state, replayable onto another state.
+
+    ``arrays`` holds the in-memory blobs by ref; refs without an array are file-backed
+    (pool or chunked) and are re-attached by ref only.
+    """
+
+    signals: dict[str, dict[str, str]]
+    refs: dict[str, dict[str, Any]]
+    arrays: dict[str, np.ndarray]
+    rx: dict[str, Any]
+    stats: dict[str, Any]
+    warnings: list[str]
+
+    @property
+    def nbytes(self) -> int:
+        return _ENTRY_OVERHEAD + sum(int(array.nbytes) for array in self.arrays.values())
+
+
+@dataclass(slots=True)
+class StageMemoStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+    def to_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class StageMemo:
+    """Two-tier memo of stage outputs keyed by ``stage_memo_key``.
+
+    The memory tier is an LRU bounded by ``max_bytes`` of retained arrays. With ``disk_root``
+    every entry is also pickled to ``<disk_root>/<key[:2]>/<key>.pkl`` (atomic rename, LRU
+    eviction to ``disk_max_bytes`` under an ``flock``), so other processes and later runs
+    can replay it; disk hits are promoted to memory.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MEMO_BYTES,
+        *,
+        disk_root: Path | None = None,
+        disk_max_bytes: int = DEFAULT_MEMO_DISK_BYTES,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.disk_root = Path(disk_root) if disk_root is not None else None
+        self.disk_max_bytes = disk_max_bytes
+        self._entries: OrderedDict[str, StageOutputs] = OrderedDict()
+        self._bytes = 0
+        self._stats = StageMemoStats()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> StageOutputs | None:
+        with self._lock:
+            outputs = self._entries.get(key)
+            if outputs is not None:
+                self._entries.move_to_end(key)
+                self._stats.memory_hits += 1
+                return outputs
+        outputs = self._read_disk(key)
+        with self._lock:
+            if outputs is None:
+                self._stats.misses += 1
+                return None
+            self._stats.disk_hits += 1
+            self._insert(key, outputs)
+        return outputs
+
+    def put(self, key: str, outputs: StageOutputs) -> None:
+        with self._lock:
+            self._insert(key, outputs)
+        if self.disk_root is not None:
+            payload = pickle.dumps(outputs, protocol=pickle.HIGHEST_PROTOCOL)
+            if len(payload) <= self.disk_max_bytes:
+                with FileLock(self.disk_root / ".lock"):
+                    atomic_write_bytes(self._disk_path(key), payload)
+                    evict_lru(self.disk_root.glob("*/*.pkl"), self.disk_max_bytes)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._stats = StageMemoStats()
+
+    def stats(self) -> StageMemoStats:
+        with self._lock:
+            return StageMemoStats(
+                memory_hits=self._stats.memory_hits,
+                disk_hits=self._stats.disk_hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                entries=len(self._entries),
+                bytes=self._bytes,
+            )
+
+    def _insert(self, key: str, outputs: StageOutputs) -> None:
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous.nbytes
+        if outputs.nbytes > self.max_bytes:
+            return
+        self._entries[key] = outputs
+        self._bytes += outputs.nbytes
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes
+            self._stats.evictions += 1
+
+    def _disk_path(self, key: str) -> Path:
+        assert self.disk_root is not None
+        return self.disk_root / key[:2] / f"{key}.pkl"
+
+    def _read_disk(self, key: str) -> StageOutputs | None:
+        if self.disk_root is None:
+            return None
+        payload = read_and_touch(self._disk_path(key))
+        if payload is None:
+            return None
+        try:
+            outputs = pickle.loads(payload)
+        except Exception:
+            self._disk_path(key).unlink(missing_ok=True)
+            return None
+        return outputs if isinstance(outputs, StageOutputs) else None
+
+
+_MEMOS: dict[tuple[int, str | None, int], StageMemo] = {}
+_MEMOS_LOCK = threading.Lock()
+
+
+def stage_memo_from_env() -> StageMemo | None:
+    """Process-wide memo configured by ``FIBER_LINK_SIM_STAGE_MEMO*`` (``None`` when off).
+
+    ``FIBER_LINK_SIM_STAGE_MEMO=1`` enables the memory tier (``..._BYTES`` caps it);
+    ``FIBER_LINK_SIM_STAGE_MEMO_DIR`` adds the disk tier (``..._DISK_BYTES`` caps it).
+    Calls with the same settings share one memo.
+    """
+    enabled = os.getenv("FIBER_LINK_SIM_STAGE_MEMO", "0").strip().lower() in {"1", "true", "yes"}
+    disk_root = os.getenv("FIBER_LINK_SIM_STAGE_MEMO_DIR", "").strip() or None
+    if not enabled and disk_root is None:
+        return None
+    max_bytes = os.getenv("FIBER_LINK_SIM_STAGE_MEMO_BYTES", "").strip()
+    disk_bytes = os.getenv("FIBER_LINK_SIM_STAGE_MEMO_DISK_BYTES", "").strip()
+    key = (
+        parse_byte_size(max_bytes) if max_bytes else DEFAULT_MEMO_BYTES,
+        disk_root,
+        parse_byte_size(disk_bytes) if disk_bytes else DEFAULT_MEMO_DISK_BYTES,
+    )
+    with _MEMOS_LOCK:
+        memo = _MEMOS.get(key)
+        if memo is None:
+            memo = StageMemo(
+                key[0], disk_root=Path(disk_root) if disk_root else None, disk_max_bytes=key[2]
+            )
+            _MEMOS[key] = memo
+    return memo
+
+
+def stage_memo_key(
+    state: SimulationState, stage_name: str, slice_hash: str, upstream: Iterable[str] = ()
+) -> str:
+    """Identity of a stage invocation: versions, stage, slice hash, seed, and upstream keys.
+
+    The stage seed is derived from the run seed and the stage name, so both are hashed.
+    """
+    return lineage_digest(
+        "stage-memo",
+        str(state.meta.get("version", "")),
+        dependency_versions(),
+        stage_name,
+        slice_hash,
+        str(state.meta.get("seed", 0)),
+        *upstream,
+    )
+
+
+@dataclass(slots=True)
+class MemoizedStage(Stage):
+    """Replay a stage's recorded outputs instead of running it when its key is memoized.
+
+    ``upstream`` names the stages whose memo keys feed this one; ``None`` uses every stage
+    that ran before it (the pipeline prefix). Stages that append artifacts or produce bundle
+    refs are run but never recorded.
+    """
+
+    stage: Stage
+    memo: StageMemo
+    upstream: tuple[str, ...] | None = None
+    cfg: StageConfig = field(init=False)
+    name: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.cfg = self.stage.cfg
+        self.name = self.stage.name
+
+    def process(self, state: SimulationState, *, policy: object | None = None) -> StageResult:
+        start = time.perf_counter()
+        keys: dict[str, str] = state.meta.setdefault(MEMO_KEYS, {})
+        names = list(keys) if self.upstream is None else self.upstream
+        upstream = [keys[name] for name in names if name in keys]
+        spec = getattr(self.cfg, "spec", None)
+        slice_hash = compute_slice_hash(spec) if spec is not None else ""
+        key = stage_memo_key(state, self.name, slice_hash, upstream)
+
+        cached = self.memo.get(key)
+        if cached is not None and _replay(state, cached):
+            keys[self.name] = key
+            state.meta.setdefault("stage_memo_hits", []).append(self.name)
+            state.meta.setdefault("stage_timings", {})[self.name] = time.perf_counter() - start
+            return StageResult(state=state)
+
+        before = _Snapshot.take(state)
+        result = self.stage.process(state, policy=policy)  # type: ignore[arg-type]
+        outputs = before.diff(result.state)
+        if outputs is not None:
+            self.memo.put(key, outputs)
+        result.state.meta.setdefault(MEMO_KEYS, {})[self.name] = key
+        return result
+
+
+@dataclass(slots=True)
+class _Snapshot:
+    signals: dict[str, dict[str, str]]
+    refs: set[str]
+    rx: dict[str, bytes]
+    stats: dict[str, bytes]
+    n_warnings: int
+    n_artifacts: int
+
+    @classmethod
+    def take(cls, state: SimulationState) -> _Snapshot:
+        return cls(
+            signals={section: dict(names) for section, names in state.signals.items()},
+            refs=set(state.refs),
+            rx=_digests(state.rx),
+            stats=_digests(state.stats),
+            n_warnings=len(state.meta.get("warnings", [])),
+            n_artifacts=len(state.artifacts),
+        )
+
+    def diff(self, state: SimulationState) -> StageOutputs | None:
+        if len(state.artifacts) != self.n_artifacts:
+            return None
+        refs = {ref: dict(entry) for ref, entry in state.refs.items() if ref not in self.refs}
+        arrays: dict[str, np.ndarray] = {}
+        for ref in refs:
+            if "#" in ref:
+                return None
+            blob = state.artifact_store.open_blob(ref)
+            if isinstance(blob, np.ndarray) and not isinstance(blob, np.memmap):
+                arrays[ref] = blob
+        signals: dict[str, dict[str, str]] = {}
+        for section, names in state.signals.items():
+            old = self.signals.get(section, {})
+            changed = {name: ref for name, ref in names.items() if old.get(name) != ref}
+            if changed:
+                signals[section] = changed
+        return StageOutputs(
+            signals=signals,
+            refs=refs,
+            arrays=arrays,
+            rx=_changed(self.rx, state.rx),
+            stats=_changed(self.stats, state.stats),
+            warnings=list(state.meta.get("warnings", [])[self.n_warnings :]),
+        )
+
+
+def _digests(section: dict[str, Any]) -> dict[str, bytes]:
+    # Digests rather than references, so a value the stage mutated in place still shows up.
+    return {key: _hash_payload(value) for key, value in section.items()}
+
+
+def _changed(before: dict[str, bytes], after: dict[str, Any]) -> dict[str, Any]:
+    return copy.deepcopy(
+        {key: value for key, value in after.items() if before.get(key) != _hash_payload(value)}
+    )
+
+
+def _replay(state: SimulationState, outputs: StageOutputs) -> bool:
+    store = state.artifact_store
+    for ref in outputs.refs:
+        if ref in outputs.arrays:
+            continue
+        try:
+            store.open_blob(ref)
+        except (OSError, KeyError, ValueError):
+            return False
+
+    remap: dict[str, str] = {}
+    for ref, entry in outputs.refs.items():
+        array = outputs.arrays.get(ref)
+        if array is None:
+            state.refs[ref] = dict(entry)
+            continue
+        written = store.write_blob(
+            BlobPayload(
+                name=entry["name"],
+                array=array,
+                role=entry["role"],
+                units=entry.get("units"),
+                digest=entry.get("digest"),
+            )
+        )
+        state.refs[written["ref"]] = {**entry, **written}
+        if written["ref"] != ref:
+            remap[ref] = written["ref"]
+
+    for section, names in outputs.signals.items():
+        state.signals.setdefault(section, {}).update(
+            {name: remap.get(ref, ref) for name, ref in names.items()}
+        )
+    for key, value in copy.deepcopy(outputs.rx).items():
+        state.rx[key] = remap.get(value, value) if isinstance(value, str) else value
+    state.stats.update(copy.deepcopy(outputs.stats))
+    if outputs.warnings:
+        state.meta.setdefault("warnings", []).extend(outputs.warnings)
+    return True
+
+
+__all__ = [
+    "MemoizedStage",
+    "StageMemo",
+    "StageMemoStats",
+    "StageOutputs",
+    "stage_memo_from_env",
+    "stage_memo_key",
+]
@@ -0,0 +1,384 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, cast
+
+import numpy as np
+from phys_pipeline import DagExecutor, NodeSpec, StageConfig
+from pydantic import ValidationError
+
+import fiber_link_sim._compat  # noqa: F401
+from fiber_link_sim.artifacts import (
+    ArtifactStore,
+    BundleArtifactStore,
+    HybridArtifactStore,
+    artifact_root_for_spec,
+)
+from fiber_link_sim.data_models.spec_models import SimulationResult, SimulationSpec
+from fiber_link_sim.fingerprint import lineage_digest
+from fiber_link_sim.pipeline import build_pipeline
+from fiber_link_sim.pipeline_execution import _scheduler_from_env, _stage_node_name
+from fiber_link_sim.simulate import (
+    SIM_VERSION,
+    _artifact_layout,
+    _cached_result,
+    _error_result,
+    _load_spec,
+    _remember_result,
+    _spill_bytes,
+    _success_result,
+    simulate,
+)
+from fiber_link_sim.stages.base import SimulationState, Stage, StageResult
+from fiber_link_sim.utils import compute_slice_hash, compute_spec_hash
+
+SWEEP_ERROR = "sweep_error"
+
+
+@dataclass(slots=True)
+class SweepNode:
+    """One unique stage invocation in the prefix trie, shared by ``spec_indices``."""
+
+    id: str
+    stage_name: str
+    key: str
+    parent: str | None
+    stage: Stage
+    spec_indices: list[int] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class SweepPlan:
+    """Prefix trie over the per-stage slice hashes of a list of specs.
+
+    Node keys chain ``SIM_VERSION``, the seed, and each stage's slice hash, so two specs
+    share a node exactly when every stage up to and including it sees identical inputs.
+    Leaves (ArtifactsStage) are per spec hash because they write to the spec's artifact root.
+    """
+
+    specs: list[SimulationSpec]
+    spec_hashes: list[str]
+    nodes: dict[str, SweepNode]
+    leaves: list[str]
+
+    @property
+    def stage_runs(self) -> int:
+        return len(self.nodes)
+
+    @property
+    def unshared_stage_runs(self) -> int:
+        return sum(len(node.spec_indices) for node in self.nodes.values())
+
+
+@dataclass(slots=True)
+class SweepResult:
+    results: list[SimulationResult]
+    stage_runs: int
+    unshared_stage_runs: int
+    runtime_s: float
+
+
+def plan_sweep(specs: Sequence[SimulationSpec]) -> SweepPlan:
+    nodes: dict[str, SweepNode] = {}
+    leaves: list[str] = []
+    spec_hashes = [compute_spec_hash(spec) for spec in specs]
+    for index, spec in enumerate(specs):
+        parent: SweepNode | None = None
+        key = lineage_digest("sweep", SIM_VERSION, str(spec.runtime.seed))
+        for stage in cast(list[Stage], build_pipeline(spec).stages):
+            name = _stage_node_name(stage)
+            spec_slice = getattr(stage.cfg, "spec", None)
+            slice_hash = compute_slice_hash(spec_slice) if spec_slice is not None else ""
+            key = lineage_digest(key, name, slice_hash)
+            if parent is not None and name == "artifacts":
+                key = lineage_digest(key, spec_hashes[index])
+            node_id = f"{name}-{key[:16]}"
+            node = nodes.get(node_id)
+            if node is None:
+                node = SweepNode(
+                    id=node_id,
+                    stage_name=name,
+                    key=key,
+                    parent=parent.id if parent is not None else None,
+                    stage=stage,
+                )
+                nodes[node_id] = node
+            node.spec_indices.append(index)
+            parent = node
+        assert parent is not None
+        leaves.append(parent.id)
+    return SweepPlan(list(specs), spec_hashes, nodes, leaves)
+
+
+@dataclass(slots=True)
+class _BranchStage(Stage):
+    """Run ``stage`` on a fork of its input so sibling branches never share bookkeeping.
+
+    Roots seed the run metadata and every node writes through its own store. A failure, or a
+    branch that has already spent ``budget_s`` (the largest ``max_runtime_s`` below it), is
+    recorded in ``meta["sweep_error"]`` and every descendant passes the state through.
+    ``on_done`` sees the input and output state of every node, skipped or not.
+    """
+
+    stage: Stage
+    meta: dict[str, Any] = field(default_factory=dict)
+    artifact_store: ArtifactStore | None = None
+    budget_s: float | None = None
+    on_done: Callable[[SimulationState, SimulationState], None] | None = None
+    cfg: StageConfig = field(init=False)
+    name: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.cfg = self.stage.cfg
+        self.name = self.stage.name
+
+    def process(self, state: SimulationState, *, policy: object | None = None) -> StageResult:
+        result = self._run(state, policy)
+        if self.on_done is not None:
+            self.on_done(state, cast(SimulationState, result.state))
+        return result
+
+    def _run(self, state: SimulationState, policy: object | None) -> StageResult:
+        if SWEEP_ERROR in state.meta:
+            return StageResult(state=state)
+        branch = state.fork()
+        branch.meta.update(self.meta)
+        if self.artifact_store is not None:
+            branch.artifact_store = self.artifact_store
+        if self.budget_s is not None and _branch_runtime_s(branch) > self.budget_s:
+            branch.meta[SWEEP_ERROR] = {
+                "stage": self.name,
+                "message": "runtime exceeded max_runtime_s",
+                "exception_type": "TimeoutError",
+            }
+            return StageResult(state=branch)
+        try:
+            return self.stage.process(branch, policy=policy)  # type: ignore[arg-type]
+        except Exception as exc:
+            branch.meta[SWEEP_ERROR] = {
+                "stage": self.name,
+                "message": str(exc),
+                "exception_type": exc.__class__.__name__,
+            }
+            return StageResult(state=branch)
+
+
+@dataclass(slots=True)
+class _BlobLedger:
+    """Drop in-memory blobs as soon as no leaf still waiting for its result can read them.
+
+    ``pending`` counts, per node, the leaves below it whose result is not built yet; once it
+    reaches zero the blobs that node added are released unless another live node added the
+    same (content-addressed) ref.
+    """
+
+    blobs: dict[str, np.ndarray]
+    parents: dict[str, str | None]
+    pending: dict[str, int]
+    added: dict[str, list[str]] = field(default_factory=dict)
+    holders: dict[str, int] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    @classmethod
+    def for_plan(cls, plan: SweepPlan, blobs: dict[str, np.ndarray]) -> _BlobLedger:
+        parents = {node.id: node.parent for node in plan.nodes.values()}
+        pending = dict.fromkeys(parents, 0)
+        for leaf in set(plan.leaves):
+            node_id: str | None = leaf
+            while node_id is not None:
+                pending[node_id] += 1
+                node_id = parents[node_id]
+        return cls(blobs=blobs, parents=parents, pending=pending)
+
+    def record(self, node_id: str, before: SimulationState, after: SimulationState) -> None:
+        added = [ref for ref in after.refs if ref not in before.refs]
+        with self.lock:
+            self.added[node_id] = added
+            for ref in added:
+                self.holders[ref] = self.holders.get(ref, 0) + 1
+
+    def release(self, leaf_id: str) -> None:
+        with self.lock:
+            node_id: str | None = leaf_id
+            while node_id is not None:
+                self.pending[node_id] -= 1
+                if self.pending[node_id] == 0:
+                    for ref in self.added.pop(node_id, []):
+                        self.holders[ref] -= 1
+                        if self.holders[ref] == 0:
+                            del self.holders[ref]
+                            self.blobs.pop(ref, None)
+                node_id = self.parents[node_id]
+
+
+def run_sweep(specs: Sequence[dict[str, Any] | str | Path | SimulationSpec]) -> SweepResult:
+    """Simulate every spec, running each shared stage prefix once.
+
+    Results are returned in input order and match ``simulate()`` for each spec apart from
+    timings, including its ``max_runtime_s`` timeout and the result caches, which are read
+    before planning and filled with every success. Specs that fail validation get
+    ``validation_error`` results; specs with autotune enabled are delegated to
+    ``simulate()``. Branches run on the DAG scheduler (``FIBER_LINK_SIM_PIPELINE_MAX_WORKERS``)
+    without the stage cache.
+    """
+    start = time.perf_counter()
+    results: list[SimulationResult | None] = [None] * len(specs)
+    runnable: list[tuple[int, SimulationSpec]] = []
+    for index, spec in enumerate(specs):
+        try:
+            spec_model = _load_spec(spec)
+        except (ValidationError, OSError, json.JSONDecodeError) as exc:
+            results[index] = _error_result(None, "invalid", "validation_error", str(exc), {}, 0.0)
+            continue
+        if spec_model.processing.autotune and spec_model.processing.autotune.enabled:
+            results[index] = simulate(spec_model)
+            continue
+        cached = _cached_result(compute_spec_hash(spec_model), spec_model.runtime.seed)
+        if cached is not None:
+            results[index] = cached
+            continue
+        runnable.append((index, spec_model))
+
+    plan = plan_sweep([spec for _, spec in runnable])
+    if plan.specs:
+        positions: dict[str, list[int]] = {}
+        for position, leaf in enumerate(plan.leaves):
+            positions.setdefault(leaf, []).append(position)
+
+        def finish(leaf: str, state: SimulationState) -> None:
+            # Specs sharing a leaf have the same spec hash, so they share one result.
+            first = positions[leaf][0]
+            spec_model = runnable[first][1]
+            result = _branch_result(spec_model, plan.spec_hashes[first], state)
+            for position in positions[leaf]:
+                results[runnable[position][0]] = result
+
+        _execute(plan, finish)
+    return SweepResult(
+        results=cast(list[SimulationResult], results),
+        stage_runs=plan.stage_runs,
+        unshared_stage_runs=plan.unshared_stage_runs,
+        runtime_s=time.perf_counter() - start,
+    )
+
+
+def _execute(plan: SweepPlan, finish: Callable[[str, SimulationState], None]) -> None:
+    """Run the trie; ``finish`` gets each leaf's state before its blobs are released."""
+    store_cls = BundleArtifactStore if _artifact_layout() == "bundle" else HybridArtifactStore
+    blobs: dict[str, np.ndarray] = {}
+    ledger = _BlobLedger.for_plan(plan, blobs)
+    leaves = set(plan.leaves)
+    node_specs: list[NodeSpec] = []
+    for node in plan.nodes.values():
+        below = [plan.specs[index] for index in node.spec_indices]
+        first = below[0]
+        root = artifact_root_for_spec(plan.spec_hashes[node.spec_indices[0]], create=False)
+        # Persist a node's blobs only when a debug spec below it lists them in its manifest.
+        persist_blobs = any(spec.outputs.artifact_level == "debug" for spec in below)
+        branch = _BranchStage(
+            stage=node.stage,
+            artifact_store=(store_cls if node.id in leaves else HybridArtifactStore)(
+                root, persist_blobs=persist_blobs, spill_bytes=_spill_bytes(), blobs=blobs
+            ),
+            budget_s=max(spec.runtime.max_runtime_s for spec in below),
+            on_done=_node_done(node.id, ledger, finish if node.id in leaves else None),
+        )
+        if node.parent is None:
+            branch.meta = {"seed": first.runtime.seed, "version": SIM_VERSION}
+        if node.id in leaves:
+            branch.meta = {**branch.meta, "spec_hash": plan.spec_hashes[node.spec_indices[0]]}
+        node_specs.append(
+            NodeSpec(
+                id=node.id,
+                deps=[node.parent] if node.parent is not None else [],
+                op_name=node.stage_name,
+                version="v2",
+                stage=branch,
+            )
+        )
+    executor = DagExecutor(scheduler=_scheduler_from_env(), cache=None)
+    initial = HybridArtifactStore(
+        artifact_root_for_spec(plan.spec_hashes[0], create=False), blobs=blobs
+    )
+    executor.run(SimulationState(artifact_store=initial), node_specs)
+
+
+def _node_done(
+    node_id: str,
+    ledger: _BlobLedger,
+    finish: Callable[[str, SimulationState], None] | None,
+) -> Callable[[SimulationState, SimulationState], None]:
+    def done(before: SimulationState, after: SimulationState) -> None:
+        ledger.record(node_id, before, after)
+        if finish is None:
+            return
+        try:
+            finish(node_id, after)
+        finally:
+            ledger.release(node_id)
+
+    return done
+
+
+def _branch_runtime_s(state: SimulationState) -> float:
+    return float(sum(state.meta.get("stage_timings", {}).values()))
+
+
+def _branch_result(
+    spec_model: SimulationSpec, spec_hash: str, state: SimulationState
+) -> SimulationResult:
+    runtime_s = _branch_runtime_s(state)
+    warnings = state.meta.get("warnings", [])
+    if runtime_s > spec_model.runtime.max_runtime_s:
+        _discard_bundle(state)
+        return _error_result(
+            spec_model,
+            spec_hash,
+            "timeout",
+            "runtime exceeded max_runtime_s during pipeline execution",
+            {"max_runtime_s": spec_model.runtime.max_runtime_s, "elapsed_s": runtime_s},
+            runtime_s,
+            warnings,
+        )
+    error = state.meta.get(SWEEP_ERROR)
+    if error is not None:
+        _discard_bundle(state)
+        return _error_result(
+            spec_model,
+            spec_hash,
+            "runtime_error",
+            error["message"],
+            {"exception_type": error["exception_type"], "stage": error["stage"]},
+            runtime_s,
+            warnings,
+        )
+    try:
+        bundle_index = None
+        if isinstance(state.artifact_store, BundleArtifactStore):
+            bundle_index = state.artifact_store.finalize()
+        result = _success_result(spec_model, spec_hash, state, runtime_s, bundle_index)
+    except Exception as exc:
+        _discard_bundle(state)
+        return _error_result(
+            spec_model,
+            spec_hash,
+            "runtime_error",
+            str(exc),
+            {"exception_type": exc.__class__.__name__},
+            runtime_s,
+            warnings,
+        )
+    return _remember_result(spec_hash, spec_model.runtime.seed, result)
+
+
+def _discard_bundle(state: SimulationState) -> None:
+    if isinstance(state.artifact_store, BundleArtifactStore):
+        state.artifact_store.discard()
+
+
+__all__ = ["SweepNode", "SweepPlan", "SweepResult", "plan_sweep", "run_sweep"]
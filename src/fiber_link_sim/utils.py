@@ -4,10 +4,12 @@ import hashlib
 import json
 from collections.abc import Generator
 from contextlib import contextmanager
+from dataclasses import dataclass, fields, is_dataclass
+from typing import Any
 
 import numpy as np
 
-from fiber_link_sim.data_models.spec_models import Path, Signal, SimulationSpec
+from fiber_link_sim.data_models.spec_models import Path, Signal, SimulationSpec, Spans
 
 
 def compute_spec_hash(spec: SimulationSpec) -> str:
@@ -15,6 +17,17 @@ def compute_spec_hash(spec: SimulationSpec) -> str:
     return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
 
+def compute_slice_hash(spec_slice: Any) -> str:
+    """Hash a stage spec slice (a dataclass of spec sub-models) like ``compute_spec_hash``."""
+    if not is_dataclass(spec_slice):
+        raise TypeError(f"expected a spec slice dataclass, got {type(spec_slice).__name__}")
+    data = {
+        field.name: getattr(spec_slice, field.name).model_dump() for field in fields(spec_slice)
+    }
+    payload = json.dumps(data, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
 def create_root_rng(seed: int) -> np.random.Generator:
     return np.random.default_rng(seed)
 
@@ -43,6 +56,28 @@ def total_link_length_m(path: Path) -> float:
     return float(sum(segment.length_m for segment in path.segments))
 
 
+@dataclass(frozen=True)
+class ChannelLayout:
+    total_length_km: float
+    span_length_km: float
+    n_spans: int
+
+
+def channel_layout(path: Path, spans: Spans) -> ChannelLayout:
+    total_length_km = total_link_length_m(path) / 1000.0
+    if spans.mode == "from_path_segments":
+        n_spans = max(len(path.segments), 1)
+        span_length_km = total_length_km / n_spans if n_spans > 0 else total_length_km
+    else:
+        span_length_km = spans.span_length_m / 1000.0
+        n_spans = max(1, int(round(total_length_km / span_length_km)))
+    return ChannelLayout(
+        total_length_km=total_length_km,
+        span_length_km=span_length_km,
+        n_spans=n_spans,
+    )
+
+
 def bits_per_symbol(signal: Signal) -> int:
     if signal.format == "coherent_qpsk":
         return 2 * signal.n_pol
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import atexit
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any
+
+from fiber_link_sim.data_models.spec_models import SimulationResult, SimulationSpec
+from fiber_link_sim.simulate import _error_result, _load_spec, simulate
+from fiber_link_sim.utils import compute_spec_hash
+
+SpecInput = dict[str, Any] | str | Path | SimulationSpec
+
+_POOLS: dict[int, WorkerPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def _init_worker() -> None:
+    # The stages load their OptiCommPy adapters lazily, so import them here: the worker pays
+    # for OptiCommPy once at start-up and every task reuses it.
+    # Workers never isolate or fall back to another process themselves.
+    os.environ["FIBER_LINK_SIM_NO_SUBPROCESS"] = "1"
+    os.environ.pop("FIBER_LINK_SIM_ISOLATE", None)
+    import fiber_link_sim.adapters.opticommpy.stages  # noqa: F401
+    import fiber_link_sim.pipeline  # noqa: F401
+
+
+def _simulate_chunk(payloads: list[Any]) -> list[dict[str, Any]]:
+    return [simulate(payload).model_dump() for payload in payloads]
+
+
+def _simulate_cancellable(payload: Any, cancel: Any) -> dict[str, Any]:
+    return simulate(payload, cancel=cancel).model_dump()
+
+
+def _ready() -> bool:
+    return True
+
+
+def payload_for(spec: SpecInput) -> Any:
+    """A picklable, JSON-like form of ``spec`` to send to a worker."""
+    if isinstance(spec, SimulationSpec):
+        return spec.model_dump(mode="json")
+    if isinstance(spec, Path):
+        return str(spec)
+    return spec
+
+
+def failure_result(spec: SpecInput, exc: BaseException) -> SimulationResult:
+    """The ``runtime_error`` result for a spec whose worker task failed."""
+    try:
+        spec_model = _load_spec(spec)
+    except Exception:
+        spec_model = None
+    return _error_result(
+        spec_model,
+        compute_spec_hash(spec_model) if spec_model is not None else "unknown",
+        "runtime_error",
+        str(exc) or "worker process failed",
+        {"exception_type": exc.__class__.__name__},
+        0.0,
+    )
+
+
+def default_workers() -> int:
+    value = os.getenv("FIBER_LINK_SIM_BATCH_WORKERS", "").strip()
+    return max(1, int(value) if value else os.cpu_count() or 1)
+
+
+def default_max_runs() -> int | None:
+    value = os.getenv("FIBER_LINK_SIM_WORKER_MAX_RUNS", "100").strip()
+    return int(value) if value and int(value) > 0 else None
+
+
+class WorkerPool:
+    """Supervised pool of pre-warmed, spawn-context simulation workers.
+
+    Each worker imports the pipeline (and OptiCommPy) once and then serves tasks until it has
+    run ``max_runs`` of them, when it is replaced by a fresh process. A worker that dies takes
+    the executor down with it (``BrokenProcessPool``); the pool notices from the failed future,
+    drops the broken executor and starts a new one on the next submission, so one crash never
+    poisons later runs.
+    """
+
+    def __init__(self, workers: int = 1, *, max_runs: int | None = None) -> None:
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        self.workers = workers
+        self.max_runs = max_runs
+        self.crashes = 0
+        self.starts = 0
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def _ensure(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=get_context("spawn"),
+                    initializer=_init_worker,
+                    max_tasks_per_child=self.max_runs,
+                )
+                self.starts += 1
+            return self._executor
+
+    def _discard(self, executor: ProcessPoolExecutor, *, crashed: bool) -> None:
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+            if crashed:
+                self.crashes += 1
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _watch(self, executor: ProcessPoolExecutor, future: Future[Any]) -> None:
+        if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+            self._discard(executor, crashed=True)
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future[Any]:
+        executor = self._ensure()
+        try:
+            future = executor.submit(fn, *args)
+        except BrokenProcessPool:
+            self._discard(executor, crashed=True)
+            executor = self._ensure()
+            future = executor.submit(fn, *args)
+        future.add_done_callback(lambda done: self._watch(executor, done))
+        return future
+
+    def submit_specs(self, specs: list[SpecInput]) -> Future[list[dict[str, Any]]]:
+        """Simulate ``specs`` as one task; the future holds each result's ``model_dump()``."""
+        return self.submit(_simulate_chunk, [payload_for(spec) for spec in specs])
+
+    def submit_cancellable(self, spec: SpecInput, cancel: Any) -> Future[dict[str, Any]]:
+        """Simulate one spec; setting ``cancel`` stops it at the worker's next stage boundary.
+
+        ``cancel`` must reach the worker, so it is a ``multiprocessing`` manager ``Event``.
+        """
+        return self.submit(_simulate_cancellable, payload_for(spec), cancel)
+
+    def warm(self) -> None:
+        """Start every worker now so the first runs do not pay the import cost."""
+        wait([self.submit(_ready) for _ in range(self.workers)])
+
+    def run(self, spec: SpecInput, *, timeout: float | None = None) -> SimulationResult:
+        """Simulate one spec on a worker; a crash or failed task becomes a ``runtime_error``."""
+        future = self.submit_specs([spec])
+        try:
+            [payload] = future.result(timeout=timeout)
+        except Exception as exc:
+            return failure_result(spec, exc)
+        return SimulationResult.model_validate(payload)
+
+    def restart(self) -> None:
+        """Replace every worker, e.g. after changing environment the workers should see."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    def shutdown(self) -> None:
+        self.restart()
+
+
+def get_pool(workers: int | None = None) -> WorkerPool:
+    """The shared pool with ``workers`` processes (default ``default_workers()``)."""
+    workers = default_workers() if workers is None else workers
+    with _POOLS_LOCK:
+        pool = _POOLS.get(workers)
+        if pool is None:
+            pool = _POOLS[workers] = WorkerPool(workers, max_runs=default_max_runs())
+        return pool
+
+
+def shutdown_pools() -> None:
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.shutdown()
+
+
+atexit.register(shutdown_pools)
+
+
+__all__ = [
+    "WorkerPool",
+    "default_max_runs",
+    "default_workers",
+    "failure_result",
+    "get_pool",
+    "payload_for",
+    "shutdown_pools",
+]
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+EXAMPLE = Path(__file__).resolve().parents[1] / "src/fiber_link_sim/schema/examples/ook_smoke.json"
+
+
+@pytest.fixture()
+def autotune_spec() -> Callable[..., dict[str, Any]]:
+    """Build ``ook_smoke`` specs with autotune enabled.
+
+    Autotune specs are answered with ``not_implemented`` before the pipeline runs, which keeps
+    tests of the batch, async and server plumbing about that plumbing rather than the physics.
+    """
+
+    def _build(seed: int | None = None) -> dict[str, Any]:
+        data = json.loads(EXAMPLE.read_text())
+        if seed is not None:
+            data["runtime"]["seed"] = seed
+        data["processing"]["autotune"] = {"enabled": True, "budget_trials": 2}
+        return data
+
+    return _build
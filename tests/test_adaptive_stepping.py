@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import math
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from fiber_link_sim.propagation.manakov import manakov_ssfm
+from fiber_link_sim.propagation.ssfm import LinkModel, ssfm
+from fiber_link_sim.propagation.stepping import local_error_rung, logarithmic_boundaries_km
+
+_MODEL = LinkModel(
+    n_spans=2,
+    span_length_km=40.0,
+    step_km=0.1,
+    sample_rate_hz=64e9,
+    carrier_hz=193.1e12,
+    alpha_db_per_km=0.2,
+    beta2_s2_per_km=-21.7e-24,
+    beta3_s3_per_km=0.0,
+    gamma_w_inv_km=1.3,
+    amplifier="ideal",
+)
+
+
+def _field(n: int = 1024, power_w: float = 1e-2) -> np.ndarray:
+    rng = np.random.default_rng(5)
+    return (rng.standard_normal(n) + 1j * rng.standard_normal(n)) * np.sqrt(power_w / 2)
+
+
+def _relative_error(actual: np.ndarray, reference: np.ndarray) -> float:
+    return float(np.linalg.norm(actual - reference) / np.linalg.norm(reference))
+
+
+def test_logarithmic_boundaries_split_the_effective_length_evenly() -> None:
+    alpha = _MODEL.alpha_per_km
+    boundaries = logarithmic_boundaries_km(
+        80.0, alpha, max_phase_rad=0.05, gamma_w_inv_km=1.3, peak_w=0.01
+    )
+    starts = [0.0, *boundaries[:-1]]
+    effective = [
+        (math.exp(-alpha * a) - math.exp(-alpha * b)) / alpha for a, b in zip(starts, boundaries)
+    ]
+
+    assert boundaries[-1] == 80.0
+    assert len(boundaries) == math.ceil(1.3 * 0.01 * -math.expm1(-alpha * 80.0) / alpha / 0.05)
+    assert max(effective) == pytest.approx(min(effective), rel=1e-9)
+    # Power falls along the span, so the steps lengthen.
+    assert np.all(np.diff(np.diff([0.0, *boundaries])) > 0)
+
+
+def test_local_error_rung_rejects_shrinks_holds_and_grows() -> None:
+    assert local_error_rung(4, 3e-5, 1e-5) is None
+    assert local_error_rung(4, 1.5e-5, 1e-5) == 3
+    assert local_error_rung(4, 0.7e-5, 1e-5) == 4
+    assert local_error_rung(4, 0.2e-5, 1e-5) == 5
+
+
+@pytest.mark.parametrize(
+    ("method", "settings"),
+    [
+        ("nonlinear_phase", {"max_nonlinear_phase_rad": 0.005}),
+        ("logarithmic", {"max_nonlinear_phase_rad": 0.005}),
+        ("local_error", {"local_error_tol": 1e-5}),
+    ],
+)
+def test_adaptive_methods_take_fewer_steps_than_the_fixed_reference(
+    method: str, settings: dict[str, float]
+) -> None:
+    signal = _field()
+    reference, fixed = ssfm(signal, replace(_MODEL, step_km=0.02), rng=np.random.default_rng())
+
+    model = replace(_MODEL, step_method=method, **settings)  # type: ignore[arg-type]
+    actual, stats = ssfm(signal, model, rng=np.random.default_rng())
+
+    error = _relative_error(actual, reference)
+    assert stats.steps * 4 < fixed.steps
+    assert error < 1e-4
+    if method == "local_error":
+        # The summed step-doubling differences bound the extrapolated result's error.
+        assert stats.error_estimate is not None and error < stats.error_estimate
+    else:
+        assert stats.error_estimate is None
+    if method == "nonlinear_phase":
+        # Steps are sized from the peak of the previous step, which dispersion can still raise.
+        assert stats.max_nonlinear_phase_rad == pytest.approx(0.005, rel=0.01)
+
+
+def test_local_error_tolerance_trades_steps_for_accuracy() -> None:
+    signal = _field()
+    reference, _ = ssfm(signal, replace(_MODEL, step_km=0.02), rng=np.random.default_rng())
+
+    runs = []
+    for tolerance in (1e-4, 1e-6):
+        model = replace(_MODEL, step_method="local_error", local_error_tol=tolerance)
+        out, stats = ssfm(signal, model, rng=np.random.default_rng())
+        runs.append((stats.steps, _relative_error(out, reference)))
+
+    (coarse_steps, coarse_error), (fine_steps, fine_error) = runs
+    assert coarse_steps < fine_steps
+    assert fine_error < coarse_error
+
+
+def test_adaptive_manakov_tracks_the_fixed_step_reference_with_pmd() -> None:
+    model = replace(_MODEL, pmd_ps_sqrt_km=0.5, pmd_sections_per_span=8)
+    x = _field()
+    field = np.stack([x, 1j * x[::-1]], axis=1)
+    # The waveplates are drawn from the seed before propagation, so both runs share them.
+    reference, _ = manakov_ssfm(field, replace(model, step_km=0.01), rng=np.random.default_rng(2))
+
+    adaptive = replace(model, step_method="local_error", local_error_tol=1e-5)
+    out, stats = manakov_ssfm(field, adaptive, rng=np.random.default_rng(2))
+
+    # Steps end at every waveplate, so the adaptive run sees the same PMD as the reference.
+    assert stats.steps < 2 * 40 * 10
+    assert _relative_error(out, reference) < 1e-6
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import json
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from fiber_link_sim import aio
+from fiber_link_sim.aio import AsyncSimulator, iter_simulate_async, simulate_async
+from fiber_link_sim.data_models.spec_models import SimulationSpec
+from fiber_link_sim.simulate import simulate
+from fiber_link_sim.stages.core import ChannelStage, TxStage
+from fiber_link_sim.utils import compute_spec_hash
+
+simulate_module = importlib.import_module("fiber_link_sim.simulate")
+EXAMPLE = Path(__file__).resolve().parents[1] / "src/fiber_link_sim/schema/examples/ook_smoke.json"
+
+
+def test_async_iterator_pulls_lazily_and_matches_simulate(
+    autotune_spec: Callable[..., dict[str, Any]],
+) -> None:
+    pulled: list[int] = []
+
+    async def _specs() -> Any:
+        for seed in (1, 2, 3):
+            pulled.append(seed)
+            yield autotune_spec(seed)
+
+    async def _run() -> tuple[list[tuple[int, Any]], list[int], Any]:
+        seen: list[int] = []
+        items = []
+        async for index, result in iter_simulate_async(_specs(), concurrency=1):
+            seen.append(len(pulled))
+            items.append((index, result))
+        return items, seen, await simulate_async({"v": "bogus"})
+
+    items, seen, invalid = asyncio.run(_run())
+
+    assert sorted(index for index, _ in items) == [0, 1, 2]
+    assert seen == [1, 2, 3]
+    for index, result in items:
+        expected = simulate(autotune_spec(index + 1))
+        assert result.provenance.spec_hash == expected.provenance.spec_hash
+    assert invalid.error is not None and invalid.error.code == "validation_error"
+
+
+def test_cancel_stops_running_and_queued_simulations(monkeypatch) -> None:
+    monkeypatch.setenv("FIBER_LINK_SIM_LOCAL_CACHE", "0")
+    started, release = threading.Event(), threading.Event()
+    ran: list[str] = []
+    tx_process = TxStage.process
+
+    def _blocking_tx(self: TxStage, state: Any, *, policy: object | None = None) -> Any:
+        ran.append("tx")
+        started.set()
+        release.wait(30)
+        return tx_process(self, state, policy=policy)
+
+    def _channel(self: ChannelStage, state: Any, *, policy: object | None = None) -> Any:
+        ran.append("channel")
+        raise AssertionError("channel ran after cancellation")
+
+    monkeypatch.setattr(TxStage, "process", _blocking_tx)
+    monkeypatch.setattr(ChannelStage, "process", _channel)
+    spec = json.loads(EXAMPLE.read_text())
+
+    async def _run() -> tuple[bool, bool]:
+        async with AsyncSimulator(concurrency=1) as simulator:
+            running = asyncio.ensure_future(simulator.simulate(spec))
+            queued = asyncio.ensure_future(simulator.simulate(spec))
+            await asyncio.to_thread(started.wait, 30)
+            queued.cancel()
+            running.cancel()
+            asyncio.get_running_loop().call_later(0.05, release.set)
+            with pytest.raises(asyncio.CancelledError):
+                await running
+            with pytest.raises(asyncio.CancelledError):
+                await queued
+            return running.cancelled(), queued.cancelled()
+
+    assert asyncio.run(_run()) == (True, True)
+    assert ran == ["tx"]
+
+
+def test_process_mode_answers_from_the_callers_result_cache(monkeypatch) -> None:
+    monkeypatch.setenv("FIBER_LINK_SIM_LOCAL_CACHE", "1")
+    spec = SimulationSpec.model_validate(json.loads(EXAMPLE.read_text()))
+    cached = simulate({"v": "bogus"})
+    simulate_module._SIMULATION_CACHE.put((compute_spec_hash(spec), spec.runtime.seed), cached)
+
+    def _no_pool(*args: Any) -> Any:
+        raise AssertionError("cache hit went to the worker pool")
+
+    monkeypatch.setattr(aio, "get_pool", _no_pool)
+    try:
+        result = asyncio.run(AsyncSimulator(executor="process").simulate(spec))
+    finally:
+        simulate_module._SIMULATION_CACHE.clear()
+
+    assert result == cached
@@ -1,12 +1,20 @@
 from __future__ import annotations
 
+import importlib
 import json
+import pickle
+import threading
 from pathlib import Path
 
 import numpy as np
 import pytest
 
-from fiber_link_sim.artifacts import LocalArtifactStore, artifact_root_for_spec
+from fiber_link_sim.artifacts import (
+    ArtifactPayload,
+    AsyncArtifactWriter,
+    LocalArtifactStore,
+    artifact_root_for_spec,
+)
 from fiber_link_sim.data_models.spec_models import SimulationSpec
 from fiber_link_sim.data_models.stage_models import ArtifactsSpecSlice
 from fiber_link_sim.stages.base import SimulationState
@@ -14,6 +22,7 @@ from fiber_link_sim.stages.configs import ArtifactsStageConfig
 from fiber_link_sim.stages.core import ArtifactsStage
 from fiber_link_sim.utils import compute_spec_hash
 
+simulate_module = importlib.import_module("fiber_link_sim.simulate")
 EXAMPLE_DIR = Path(__file__).resolve().parents[1] / "src/fiber_link_sim/schema/examples"
 
 
@@ -103,3 +112,85 @@ def test_artifacts_absent_when_waveforms_disabled(
     stage.process(state)
 
     assert state.artifacts == []
+
+
+def test_async_writer_matches_synchronous_artifacts(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    spec_data = _load_example("ook_smoke.json")
+    spec_data["outputs"]["artifact_level"] = "basic"
+    spec_data["outputs"]["return_waveforms"] = True
+    spec = SimulationSpec.model_validate(spec_data)
+    stage = ArtifactsStage(
+        cfg=ArtifactsStageConfig(name="artifacts", spec=ArtifactsSpecSlice.from_spec(spec))
+    )
+
+    sync_state = _build_state(spec, root=tmp_path / "sync")
+    stage.process(sync_state)
+
+    async_state = _build_state(spec, root=tmp_path / "async")
+    writer = AsyncArtifactWriter(async_state.artifact_store, max_workers=2, max_pending=2)
+    async_state.artifact_store = writer
+    stage.process(async_state)
+    writer.close()
+
+    assert [a["name"] for a in async_state.artifacts] == [a["name"] for a in sync_state.artifacts]
+    for sync_entry, async_entry in zip(sync_state.artifacts, async_state.artifacts, strict=True):
+        assert async_entry["ref"] == sync_entry["ref"]
+        assert async_entry["bytes"] > 0
+        path = tmp_path / "async" / compute_spec_hash(spec) / f"{async_entry['name']}.npz"
+        assert path.stat().st_size == async_entry["bytes"]
+
+
+def test_async_writer_future_and_pickle(tmp_path: Path) -> None:
+    store = LocalArtifactStore(tmp_path / "run")
+    writer = AsyncArtifactWriter(store, max_workers=1)
+    payload = ArtifactPayload(name="trace", arrays={"x": np.arange(8)})
+
+    entry = writer.submit_npz_artifact(payload).result()
+    assert entry["ref"] == "artifact://run/trace.npz"
+
+    writer.save_npz_artifact(ArtifactPayload(name="other", arrays={"y": np.ones(4)}))
+    restored = pickle.loads(pickle.dumps(writer))
+    assert (tmp_path / "run" / "other.npz").exists()
+    assert restored.submit_npz_artifact(payload).result()["bytes"] == entry["bytes"]
+    restored.close()
+    writer.close()
+
+
+def test_async_writer_flush_raises_write_errors(tmp_path: Path) -> None:
+    class _FailingStore(LocalArtifactStore):
+        def save_npz_artifact(self, payload: ArtifactPayload) -> dict:
+            raise OSError("disk full")
+
+    writer = AsyncArtifactWriter(_FailingStore(tmp_path / "run"))
+    writer.save_npz_artifact(ArtifactPayload(name="trace", arrays={"x": np.arange(4)}))
+    with pytest.raises(OSError, match="disk full"):
+        writer.close()
+
+
+def test_failed_run_stops_its_artifact_writer(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("FIBER_LINK_SIM_LOCAL_CACHE", "0")
+    monkeypatch.setenv("FIBER_LINK_SIM_ARTIFACT_WRITERS", "2")
+    writers: list[AsyncArtifactWriter] = []
+
+    def _fail_after_queueing(pipeline: object, state: SimulationState, **_: object) -> None:
+        assert isinstance(state.artifact_store, AsyncArtifactWriter)
+        writers.append(state.artifact_store)
+        state.artifact_store.save_npz_artifact(
+            ArtifactPayload(name="trace", arrays={"x": np.arange(4)})
+        )
+        raise RuntimeError("stage failed")
+
+    data = _load_example("ook_smoke.json")
+    data["outputs"]["artifact_level"] = "basic"
+    monkeypatch.setattr(simulate_module, "run_pipeline", _fail_after_queueing)
+    result = simulate_module.simulate(data)
+
+    assert result.error is not None and result.error.code == "runtime_error"
+    assert writers[0]._executor is None
+    assert not [t for t in threading.enumerate() if t.name.startswith("fiber-link-sim-artifacts")]
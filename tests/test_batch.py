@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+from fiber_link_sim import batch
+from fiber_link_sim.simulate import simulate
+
+
+def test_simulate_many_keeps_order_and_reuses_the_pool(
+    autotune_spec: Callable[..., dict[str, Any]],
+) -> None:
+    specs: list[Any] = [autotune_spec(1), {"v": "bogus"}, autotune_spec(2), autotune_spec(3)]
+    try:
+        results = batch.simulate_many(specs, workers=2, chunksize=2)
+        pool = batch.get_pool(2)
+        again = batch.simulate_many(specs[:1], workers=2)
+
+        assert batch.get_pool(2) is pool
+        assert [result.provenance.seed for result in results] == [1, 0, 2, 3]
+        assert results[1].error is not None and results[1].error.code == "validation_error"
+        assert results[0].error is not None and results[0].error.code == "not_implemented"
+        assert results[2].provenance.spec_hash == simulate(specs[2]).provenance.spec_hash
+        assert again[0].provenance.spec_hash == results[0].provenance.spec_hash
+        completed = sorted(index for index, _ in batch.iter_simulate_many(specs, workers=2))
+        assert completed == [0, 1, 2, 3]
+    finally:
+        batch.shutdown_pools()
+
+
+def _broken_submit(self: Any, fn: Any, *args: Any) -> Future[Any]:
+    future: Future[Any] = Future()
+    future.set_exception(BrokenProcessPool("worker died"))
+    return future
+
+
+def test_crashed_worker_reports_runtime_errors_and_is_counted(
+    monkeypatch, autotune_spec: Callable[..., dict[str, Any]]
+) -> None:
+    spec = autotune_spec(4)
+    monkeypatch.setattr(ProcessPoolExecutor, "submit", _broken_submit)
+    try:
+        [result] = batch.simulate_many([spec], workers=1)
+        crashes = batch.get_pool(1).crashes
+    finally:
+        batch.shutdown_pools()
+
+    assert result.status == "error"
+    assert result.error is not None and result.error.code == "runtime_error"
+    assert result.error.details["exception_type"] == "BrokenProcessPool"
+    assert result.provenance.spec_hash == simulate(spec).provenance.spec_hash
+    assert crashes == 1
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from fiber_link_sim.artifacts import LocalArtifactStore, artifact_root_for_spec
+from fiber_link_sim.blob_pool import (
+    LINEAGE_DIRNAME,
+    LINEAGE_PREFIX,
+    BlobPool,
+    collect_garbage,
+    parse_byte_size,
+)
+from fiber_link_sim.cli import main
+from fiber_link_sim.stages.base import SimulationState
+
+
+def _run(base: Path, spec_hash: str, arrays: dict[str, np.ndarray], *, mtime: float) -> list[str]:
+    state = SimulationState(
+        meta={"spec_hash": spec_hash},
+        artifact_store=LocalArtifactStore(artifact_root_for_spec(spec_hash, base_dir=base)),
+    )
+    refs = [state.store_signal("tx", name, array) for name, array in arrays.items()]
+    state.artifact_store.save_json_artifact("run_manifest", {"refs": list(state.refs.values())})
+    os.utime(base / spec_hash / "run_manifest.json", (mtime, mtime))
+    return refs
+
+
+def _pool_files(base: Path) -> list[Path]:
+    return sorted(path for path in (base / "blob_pool").glob("*/*") if path.is_file())
+
+
+def test_identical_blobs_are_stored_once(tmp_path: Path) -> None:
+    waveform = np.arange(64, dtype=np.float64)
+    refs_a = _run(tmp_path, "spec-a", {"waveform": waveform}, mtime=1_000)
+    refs_b = _run(tmp_path, "spec-b", {"waveform": waveform.copy()}, mtime=2_000)
+
+    assert refs_a == refs_b
+    assert refs_a[0].startswith("blob://blob_pool/")
+    assert len(_pool_files(tmp_path)) == 1
+    assert not (tmp_path / "spec-a" / "blobs").exists()
+
+    reader = LocalArtifactStore(tmp_path / "spec-b")
+    assert np.array_equal(reader.read_blob(refs_a[0]), waveform)
+
+
+def test_gc_evicts_least_recently_used_runs_and_keeps_shared_blobs(tmp_path: Path) -> None:
+    shared = np.arange(256, dtype=np.float64)
+    _run(tmp_path, "old", {"shared": shared, "own": np.ones(256)}, mtime=1_000)
+    _run(tmp_path, "new", {"shared": shared}, mtime=2_000)
+    assert len(_pool_files(tmp_path)) == 2
+
+    report = collect_garbage(tmp_path, max_bytes=4_000)
+
+    assert report.removed_runs == ["old"]
+    assert report.removed_blobs == 1
+    assert report.total_bytes_after <= 4_000
+    assert not (tmp_path / "old").exists()
+    assert (tmp_path / "new").exists()
+    reader = LocalArtifactStore(tmp_path / "new")
+    manifest = json.loads((tmp_path / "new" / "run_manifest.json").read_text())
+    assert np.array_equal(reader.read_blob(manifest["refs"][0]["ref"]), shared)
+
+
+def test_gc_removes_stale_orphans_first_and_honours_dry_run(tmp_path: Path) -> None:
+    _run(tmp_path, "kept", {"waveform": np.zeros(128)}, mtime=2_000)
+    (orphan_ref,) = _run(tmp_path, "gone", {"waveform": np.ones(128)}, mtime=1_000)
+    (tmp_path / "gone" / "run_manifest.json").unlink()
+    os.utime(tmp_path / "gone", (1_000, 1_000))
+    orphan = tmp_path / orphan_ref.removeprefix("blob://")
+    os.utime(orphan, (1_000, 1_000))
+
+    dry = collect_garbage(tmp_path, max_bytes=0, dry_run=True, orphan_grace_s=60)
+    assert dry.removed_blobs == 2
+    assert orphan.exists()
+
+    report = collect_garbage(tmp_path, max_bytes=2_000, orphan_grace_s=60)
+    assert report.removed_runs == []
+    assert report.removed_blobs == 1
+    assert not orphan.exists()
+    assert (tmp_path / "kept").exists()
+
+
+def test_gc_cli_reports_json(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    _run(tmp_path, "run", {"waveform": np.zeros(64)}, mtime=1_000)
+
+    assert main(["gc", "--root", str(tmp_path), "--max-bytes", "100", "--dry-run"]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report["dry_run"] is True
+    assert report["removed_runs"] == ["run"]
+    assert (tmp_path / "run").exists()
+
+
+def test_parse_byte_size() -> None:
+    assert parse_byte_size("1024") == 1024
+    assert parse_byte_size("2K") == 2048
+    assert parse_byte_size("1.5GB") == int(1.5 * (1 << 30))
+
+
+def test_lineage_blobs_live_apart_from_content_blobs(tmp_path: Path) -> None:
+    state = SimulationState(
+        meta={"spec_hash": "spec", "seed": 1, "version": "1.0.0"},
+        artifact_store=LocalArtifactStore(artifact_root_for_spec("spec", base_dir=tmp_path)),
+    )
+    content = state.store_signal("tx", "symbols", np.arange(8.0))
+    lineage = state.store_signal(
+        "tx", "waveform", np.arange(8.0), lineage=state.lineage_key("tx", "slice")
+    )
+    state.artifact_store.save_json_artifact("run_manifest", {"refs": list(state.refs.values())})
+
+    assert content.startswith("blob://blob_pool/") and "/lineage/" not in content
+    assert lineage.startswith(f"blob://blob_pool/{LINEAGE_DIRNAME}/")
+    assert BlobPool.locate(lineage) == (state.refs[lineage]["digest"], state.refs[lineage]["codec"])
+    assert state.refs[lineage]["digest"].startswith(LINEAGE_PREFIX)
+    assert np.array_equal(state.load_ref(lineage), np.arange(8.0))
+
+    os.utime(tmp_path / "spec" / "run_manifest.json", (1_000, 1_000))
+    report = collect_garbage(tmp_path, max_bytes=0, orphan_grace_s=0.0)
+    assert report.removed_runs == ["spec"] and report.removed_blobs == 2
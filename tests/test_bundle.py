@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import json
+import pickle
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from fiber_link_sim.artifacts import (
+    BundleArtifactStore,
+    LocalArtifactStore,
+    artifact_root_for_spec,
+    load_artifact_arrays,
+)
+from fiber_link_sim.bundle import BundleReader, BundleWriter, read_bundle_index
+from fiber_link_sim.data_models.spec_models import SimulationSpec
+from fiber_link_sim.data_models.stage_models import ArtifactsSpecSlice
+from fiber_link_sim.stages.base import SimulationState
+from fiber_link_sim.stages.configs import ArtifactsStageConfig
+from fiber_link_sim.stages.core import ArtifactsStage
+
+EXAMPLE = Path(__file__).resolve().parents[1] / "src/fiber_link_sim/schema/examples/ook_smoke.json"
+
+
+def test_bundle_round_trip_with_footer_and_manifest_index(tmp_path: Path) -> None:
+    path = tmp_path / "bundle.bin"
+    writer = BundleWriter(path)
+    waveform = (np.arange(100) + 1j).astype(np.complex64).reshape(50, 2)
+    writer.append("wave", waveform)
+    writer.append("bits", np.array([1, 0, 1], dtype=np.uint8))
+    writer.append_chunks("streamed", (np.full(4, i, dtype=np.float64) for i in range(3)))
+    index = writer.finalize()
+
+    assert all(entry["offset"] % 64 == 0 for entry in index["members"].values())
+    assert read_bundle_index(path) == index
+    for reader in (BundleReader(path), BundleReader(path, index)):
+        assert np.array_equal(reader.read("wave"), waveform)
+        assert reader.read("bits").dtype == np.uint8
+        assert reader.read("streamed").shape == (12,)
+        assert np.array_equal(reader.memmap("wave")[10:20], waveform[10:20])
+    with pytest.raises(KeyError, match="missing"):
+        BundleReader(path).read("missing")
+
+
+def test_bundle_store_packs_artifacts_into_one_file(tmp_path: Path) -> None:
+    spec_data = json.loads(EXAMPLE.read_text())
+    spec_data["outputs"]["artifact_level"] = "basic"
+    spec_data["outputs"]["return_waveforms"] = True
+    spec = SimulationSpec.model_validate(spec_data)
+    root = artifact_root_for_spec("spec", base_dir=tmp_path, create=False)
+    state = SimulationState(meta={"seed": 1}, artifact_store=BundleArtifactStore(root))
+    waveform = np.linspace(0.0, 1.0, 64)
+    state.store_signal("tx", "waveform", waveform)
+    state.store_signal("optical", "waveform", waveform * 2)
+    state.store_signal("rx", "samples", waveform * 3)
+    state.store_signal("rx", "dsp_samples", waveform * 4)
+    state.store_signal("rx", "symbols", np.array([1 + 1j, -1 - 1j]))
+    state.store_signal("tx", "symbols", np.array([1 + 1j, -1 + 1j]))
+
+    ArtifactsStage(
+        cfg=ArtifactsStageConfig(name="artifacts", spec=ArtifactsSpecSlice.from_spec(spec))
+    ).process(state)
+    index = state.artifact_store.finalize()
+
+    assert sorted(path.name for path in root.iterdir()) == ["bundle.bin"]
+    assert not (tmp_path / "blob_pool").exists()
+    assert {artifact["type"] for artifact in state.artifacts} == {"bin"}
+    assert "artifacts/tx_waveform/data" in index["members"]
+    assert np.array_equal(load_artifact_arrays(root, "rx_samples")["data"], waveform * 3)
+    assert set(load_artifact_arrays(root, "tx_psd")) == {"freq_hz", "psd_db"}
+    assert load_artifact_arrays(root, "tx_constellation") == {}
+
+
+def test_bundle_store_persists_and_spills_blobs(tmp_path: Path) -> None:
+    root = artifact_root_for_spec("spec", base_dir=tmp_path, create=False)
+    store = BundleArtifactStore(root, persist_blobs=True, spill_bytes=256)
+    state = SimulationState(meta={"seed": 1}, artifact_store=store)
+    big = np.arange(128, dtype=np.float64)
+    small_ref = state.store_signal("tx", "symbols", np.arange(4.0))
+    big_ref = state.store_signal("optical", "waveform", big)
+
+    assert "#blobs/waveform-" in big_ref
+    assert big_ref not in store.blobs
+    assert np.array_equal(state.load_signal("optical", "waveform", lazy=True)[:8], big[:8])
+
+    restored = pickle.loads(pickle.dumps(store))
+    restored.finalize()
+    reader = LocalArtifactStore(tmp_path / "reader")
+    assert np.array_equal(reader.read_blob(big_ref), big)
+    assert np.array_equal(reader.read_blob(small_ref), np.arange(4.0))
+
+
+def test_pickled_bundle_store_appends_memory_blobs_instead_of_copying_them(tmp_path: Path) -> None:
+    store = BundleArtifactStore(artifact_root_for_spec("spec", base_dir=tmp_path, create=False))
+    state = SimulationState(meta={"seed": 1}, artifact_store=store)
+    ref = state.store_signal("tx", "waveform", np.arange(4096.0))
+
+    restored = pickle.loads(pickle.dumps(store))
+
+    assert restored.blobs == {}
+    assert np.array_equal(restored.open_blob(ref), np.arange(4096.0))
+    restored.finalize()
+    assert np.array_equal(LocalArtifactStore(tmp_path / "reader").read_blob(ref), np.arange(4096.0))
+
+
+def test_concurrent_writers_of_one_bundle_never_interleave(tmp_path: Path) -> None:
+    path = tmp_path / "bundle.bin"
+    first, second = BundleWriter(path), BundleWriter(path)
+    first.append("wave", np.arange(64.0))
+    second.append("wave", np.zeros(8))
+    second.append("bits", np.ones(4, dtype=np.uint8))
+    first.append("bits", np.zeros(4, dtype=np.uint8))
+
+    assert not path.exists()
+    first.finalize()
+    assert np.array_equal(BundleReader(path).read("wave"), np.arange(64.0))
+    second.finalize()
+    assert np.array_equal(BundleReader(path).read("wave"), np.zeros(8))
+    assert [item.name for item in tmp_path.iterdir()] == ["bundle.bin"]
+
+    failed = BundleWriter(path)
+    failed.append("wave", np.arange(4.0))
+    failed.discard()
+    assert [item.name for item in tmp_path.iterdir()] == ["bundle.bin"]
+    assert np.array_equal(BundleReader(path).read("wave"), np.zeros(8))
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from fiber_link_sim.artifacts import (
+    HybridArtifactStore,
+    LocalArtifactStore,
+    artifact_root_for_spec,
+    build_eye_traces,
+)
+from fiber_link_sim.blob_pool import collect_garbage
+from fiber_link_sim.chunked import ChunkedArray, split_chunks, write_chunked
+from fiber_link_sim.stages.base import SimulationState
+
+
+def _waveform(n: int = 1000) -> np.ndarray:
+    rng = np.random.default_rng(3)
+    return rng.standard_normal((n, 2)) + 1j * rng.standard_normal((n, 2))
+
+
+def test_chunked_array_slices_like_numpy(tmp_path: Path) -> None:
+    waveform = _waveform()
+    index, _ = write_chunked(tmp_path / "wf.chunked", split_chunks(waveform, 64))
+    lazy = ChunkedArray(tmp_path / "wf.chunked")
+
+    assert index["chunk_lengths"][:2] == [64, 64]
+    assert lazy.shape == waveform.shape
+    assert lazy.dtype == waveform.dtype
+    assert lazy.n_chunks == 16
+    assert np.array_equal(np.asarray(lazy), waveform)
+    assert np.array_equal(lazy[60:200], waveform[60:200])
+    assert np.array_equal(lazy[5:900:7], waveform[5:900:7])
+    assert np.array_equal(lazy[130:140, 0], waveform[130:140, 0])
+    assert np.array_equal(lazy[-1], waveform[-1])
+    assert lazy[128, 1] == waveform[128, 1]
+    assert np.array_equal(lazy[::-3], waveform[::-3])
+    assert np.array_equal(np.concatenate(list(lazy.iter_chunks())), waveform)
+    with pytest.raises(IndexError):
+        lazy[1000]
+
+
+def test_hybrid_store_spills_large_signals_to_chunks(tmp_path: Path) -> None:
+    store = HybridArtifactStore(
+        artifact_root_for_spec("spec", base_dir=tmp_path), spill_bytes=1024, chunk_bytes=4096
+    )
+    state = SimulationState(artifact_store=store)
+    waveform = _waveform()
+    small = np.arange(8.0)
+
+    big_ref = state.store_signal("optical", "waveform", waveform)
+    small_ref = state.store_signal("tx", "symbols", small)
+
+    assert big_ref.endswith(".chunked")
+    assert big_ref not in store.blobs
+    assert state.refs[big_ref]["persisted"] is True
+    assert state.refs[big_ref]["shape"] == [1000, 2]
+    assert small_ref in store.blobs
+    lazy = state.load_signal("optical", "waveform", lazy=True)
+    assert isinstance(lazy, ChunkedArray)
+    assert lazy.n_chunks == 8
+    assert np.array_equal(state.load_signal("optical", "waveform"), waveform)
+    assert np.array_equal(build_eye_traces(lazy, 8), build_eye_traces(waveform, 8))
+
+
+def test_store_signal_chunks_streams_and_dedups(tmp_path: Path) -> None:
+    waveform = _waveform()
+
+    def _state() -> SimulationState:
+        return SimulationState(
+            artifact_store=LocalArtifactStore(artifact_root_for_spec("spec", base_dir=tmp_path))
+        )
+
+    first, second = _state(), _state()
+    ref = first.store_signal_chunks("rx", "samples", split_chunks(waveform, 100), units="arb")
+    again = second.store_signal_chunks("rx", "samples", split_chunks(waveform, 100))
+
+    assert ref == again
+    assert first.refs[ref]["codec"] == "chunked"
+    assert first.refs[ref]["dtype"] == "complex128"
+    pieces = list(first.iter_signal_chunks("rx", "samples"))
+    assert [len(piece) for piece in pieces] == [100] * 10
+    resized = list(first.iter_signal_chunks("rx", "samples", chunk_len=300))
+    assert [len(piece) for piece in resized] == [300, 300, 300, 100]
+    assert np.array_equal(np.concatenate(resized), waveform)
+
+    first.artifact_store.save_json_artifact("run_manifest", {"refs": list(first.refs.values())})
+    report = collect_garbage(tmp_path, max_bytes=0, dry_run=True)
+    assert report.removed_blobs == 1
+
+
+def test_iter_signal_chunks_on_in_memory_signal() -> None:
+    state = SimulationState()
+    state.store_signal("tx", "waveform", np.arange(10.0))
+    assert [
+        chunk.tolist() for chunk in state.iter_signal_chunks("tx", "waveform", chunk_len=4)
+    ] == [
+        [0.0, 1.0, 2.0, 3.0],
+        [4.0, 5.0, 6.0, 7.0],
+        [8.0, 9.0],
+    ]
+    assert list(state.iter_signal_chunks("rx", "samples")) == []
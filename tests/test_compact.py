@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from fiber_link_sim.adapters.opticommpy.chain import validate_dsp_chain
+from fiber_link_sim.artifacts import LocalArtifactStore, artifact_root_for_spec
+from fiber_link_sim.compact import PackedBits, QuantizedLLRs, compact_symbols, quantize_llrs
+from fiber_link_sim.data_models.spec_models import DspBlock, SimulationSpec
+from fiber_link_sim.data_models.stage_models import FecSpecSlice
+from fiber_link_sim.stages.base import SimulationState
+from fiber_link_sim.stages.configs import FECStageConfig
+from fiber_link_sim.stages.core import FECStage
+
+EXAMPLE = Path(__file__).resolve().parents[1] / "src/fiber_link_sim/schema/examples/ook_smoke.json"
+
+
+def test_packed_bits_round_trip_and_error_count() -> None:
+    bits = np.random.default_rng(0).integers(0, 2, size=1003).astype(np.uint8)
+    packed = PackedBits.from_bits(bits)
+    flipped = bits.copy()
+    flipped[[0, 500, 1002]] ^= 1
+
+    assert packed.nbytes == 126
+    assert np.array_equal(packed.unpack(), bits)
+    assert packed.count_errors(PackedBits.from_bits(flipped)) == 3
+    assert packed.count_errors(PackedBits.from_bits(flipped[:1001])) == 2
+
+
+def test_error_count_does_not_need_numpy_2(monkeypatch: pytest.MonkeyPatch) -> None:
+    bits = np.random.default_rng(1).integers(0, 2, size=77).astype(np.uint8)
+    flipped = bits.copy()
+    flipped[[3, 40, 76]] ^= 1
+    monkeypatch.delattr(np, "bitwise_count", raising=False)
+
+    assert PackedBits.from_bits(bits).count_errors(PackedBits.from_bits(flipped)) == 3
+
+
+def test_quantized_llrs_keep_signs_and_scale() -> None:
+    llrs = np.array([-12.5, -0.2, 0.0, 0.3, 25.0, np.inf, np.nan])
+    quantized = quantize_llrs(llrs)
+
+    assert quantized.data.dtype == np.int8
+    assert quantized.scale == pytest.approx(25.0 / 127)
+    assert np.allclose(quantized.dequantize()[:5], llrs[:5], atol=quantized.scale)
+    assert quantized.dequantize()[5] == pytest.approx(25.0)
+    assert quantized.data[6] == 0
+    assert quantized.hard_decisions().unpack().tolist() == [1, 1, 0, 0, 0, 0, 0]
+
+
+def test_compact_symbols_use_single_precision() -> None:
+    assert compact_symbols(np.array([1 + 1j])).dtype == np.complex64
+    assert compact_symbols(np.array([0.5, -0.5])).dtype == np.float32
+    assert compact_symbols(np.array([1, 0])).dtype == np.array([1, 0]).dtype
+
+
+def test_state_round_trips_compact_blobs_through_disk(tmp_path: Path) -> None:
+    state = SimulationState(
+        meta={"seed": 1},
+        artifact_store=LocalArtifactStore(artifact_root_for_spec("spec", base_dir=tmp_path)),
+    )
+    bits = np.tile(np.array([1, 0, 0, 1, 1], dtype=np.uint8), 40)
+    bits_ref = state.store_compact(
+        "hard_bits", PackedBits.from_bits(bits), role="rx:hard_bits", lineage="dsp"
+    )
+    llr_ref = state.store_compact(
+        "llrs", quantize_llrs(np.linspace(-4, 4, 9)), role="rx:llrs", lineage="dsp"
+    )
+    plain_ref = state.store_blob("hard_bits", bits, role="rx:hard_bits", lineage="dsp")
+
+    assert bits_ref != plain_ref
+    assert state.refs[bits_ref]["n_bits"] == 200
+    assert state.refs[bits_ref]["shape"] == [25]
+    assert np.array_equal(state.load_packed_bits(bits_ref).unpack(), bits)
+    assert np.array_equal(state.load_packed_bits(plain_ref).unpack(), bits)
+    llrs = state.load_llrs(llr_ref)
+    assert isinstance(llrs, QuantizedLLRs)
+    assert llrs.data.dtype == np.int8
+    with pytest.raises(ValueError, match="not bits"):
+        state.load_packed_bits(llr_ref)
+
+
+def test_fec_stage_consumes_packed_bits() -> None:
+    spec = SimulationSpec.model_validate(json.loads(EXAMPLE.read_text()))
+    state = SimulationState(meta={"seed": 1}, stats={"pre_fec_ber": 0.01})
+    state.store_signal("tx", "symbols", compact_symbols(np.array([0.0, 1.0])))
+    ref = state.store_compact(
+        "hard_bits", PackedBits.from_bits(np.array([0, 1])), role="rx:hard_bits"
+    )
+    state.rx["hard_bits_ref"] = ref
+
+    FECStage(cfg=FECStageConfig(name="fec", spec=FecSpecSlice.from_spec(spec))).process(state)
+
+    assert "post_fec_ber" in state.stats
+    assert not state.meta.get("warnings")
+
+
+def test_demap_llr_format_is_validated() -> None:
+    validate_dsp_chain([DspBlock(name="demap", params={"soft": True, "llr_format": "int8"})])
+    with pytest.raises(ValueError, match="llr_format"):
+        validate_dsp_chain([DspBlock(name="demap", params={"llr_format": "int4"})])
@@ -7,7 +7,7 @@ import pytest
 from phys_pipeline import State
 
 from fiber_link_sim.adapters.opticommpy import units
-from fiber_link_sim.adapters.opticommpy.dsp import resolve_dsp_chain, validate_dsp_chain
+from fiber_link_sim.adapters.opticommpy.chain import resolve_dsp_chain, validate_dsp_chain
 from fiber_link_sim.data_models.spec_models import DspBlock, SimulationSpec
 from fiber_link_sim.data_models.stage_models import DspSpecSlice
 from fiber_link_sim.simulate import simulate
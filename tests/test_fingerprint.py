@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from phys_pipeline.types import hash_ndarray
+
+import fiber_link_sim.fingerprint as fingerprint
+from fiber_link_sim.artifacts import HybridArtifactStore, artifact_root_for_spec
+from fiber_link_sim.data_models.spec_models import SimulationSpec
+from fiber_link_sim.data_models.stage_models import DspSpecSlice, TxSpecSlice
+from fiber_link_sim.fingerprint import fingerprint_algo, fingerprint_array
+from fiber_link_sim.stages.base import SimulationState
+from fiber_link_sim.utils import compute_slice_hash
+
+EXAMPLE = Path(__file__).resolve().parents[1] / "src/fiber_link_sim/schema/examples/ook_smoke.json"
+
+
+def test_sha256_fingerprint_matches_phys_pipeline_hash() -> None:
+    array = np.arange(12, dtype=np.float32).reshape(3, 4)
+    assert fingerprint_array(array, "sha256") == hash_ndarray(array).hex()
+
+
+def test_blake2b_fingerprint_ignores_memory_layout() -> None:
+    array = np.random.default_rng(0).standard_normal((64, 33)) + 1j
+    strided = array.T[::2]
+    assert fingerprint_array(strided, "blake2b") == fingerprint_array(
+        np.ascontiguousarray(strided), "blake2b"
+    )
+    assert fingerprint_array(array, "blake2b") != fingerprint_array(array * 2, "blake2b")
+
+
+def test_fingerprint_algo_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("FIBER_LINK_SIM_FINGERPRINT_ALGO", "blake2b")
+    assert fingerprint_algo() == "blake2b"
+    monkeypatch.setenv("FIBER_LINK_SIM_FINGERPRINT_ALGO", "md5")
+    with pytest.raises(ValueError, match="unknown fingerprint algorithm"):
+        fingerprint_algo()
+
+
+def test_fingerprint_is_memoized_for_read_only_arrays(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[int] = []
+
+    def _counting_hash(array: np.ndarray) -> bytes:
+        calls.append(array.size)
+        return hash_ndarray(array)
+
+    monkeypatch.setattr(fingerprint, "hash_ndarray", _counting_hash)
+    frozen = np.arange(32.0)
+    frozen.flags.writeable = False
+    writeable = np.arange(32.0)
+
+    for _ in range(3):
+        fingerprint_array(frozen, "sha256")
+        fingerprint_array(writeable, "sha256")
+    assert len(calls) == 4
+
+    writeable[0] = 99.0
+    assert fingerprint_array(writeable, "sha256") == hash_ndarray(writeable).hex()
+
+
+def test_lineage_refs_do_not_hash_array_bytes(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    spec = SimulationSpec.model_validate_json(EXAMPLE.read_text())
+    tx_hash = compute_slice_hash(TxSpecSlice.from_spec(spec))
+
+    def _fail(*_: object, **__: object) -> str:
+        raise AssertionError("lineage blobs must not be fingerprinted")
+
+    def _state() -> SimulationState:
+        return SimulationState(
+            meta={"seed": 1, "version": "1.0.0"},
+            artifact_store=HybridArtifactStore(artifact_root_for_spec("spec", base_dir=tmp_path)),
+        )
+
+    monkeypatch.setattr("fiber_link_sim.artifacts.fingerprint_array", _fail)
+    first, second = _state(), _state()
+    ref_a = first.store_signal(
+        "tx", "waveform", np.zeros(8), lineage=first.lineage_key("tx", tx_hash)
+    )
+    ref_b = second.store_signal(
+        "tx", "waveform", np.ones(8), lineage=second.lineage_key("tx", tx_hash)
+    )
+    assert ref_a == ref_b
+
+    second.meta["seed"] = 2
+    assert second.lineage_key("tx", tx_hash) != first.lineage_key("tx", tx_hash)
+    before = first.lineage_key("tx", tx_hash)
+    monkeypatch.setattr(
+        "fiber_link_sim.stages.base.dependency_versions", lambda: "numpy==0.0;scipy==0.0"
+    )
+    assert first.lineage_key("tx", tx_hash) != before
+    assert first.lineage_key("dsp", tx_hash, [ref_a]) != first.lineage_key("dsp", tx_hash)
+
+
+def test_slice_hash_tracks_slice_fields_only() -> None:
+    spec_data = SimulationSpec.model_validate_json(EXAMPLE.read_text()).model_dump()
+    base = SimulationSpec.model_validate(spec_data)
+    spec_data["processing"]["dsp_chain"][2]["params"]["taps"] = 7
+    changed = SimulationSpec.model_validate(spec_data)
+
+    assert compute_slice_hash(TxSpecSlice.from_spec(base)) == compute_slice_hash(
+        TxSpecSlice.from_spec(changed)
+    )
+    assert compute_slice_hash(DspSpecSlice.from_spec(base)) != compute_slice_hash(
+        DspSpecSlice.from_spec(changed)
+    )
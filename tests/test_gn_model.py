@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import json
+import math
+from dataclasses import replace
+from pathlib import Path
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from fiber_link_sim import simulate
+from fiber_link_sim.data_models.spec_models import SimulationSpec
+from fiber_link_sim.data_models.stage_models import ChannelSpecSlice
+from fiber_link_sim.pipeline import build_pipeline
+from fiber_link_sim.propagation.gn_model import (
+    GnLink,
+    ase_power_w,
+    gn_estimate,
+    nli_coefficient,
+    optimal_launch_power_dbm,
+)
+from fiber_link_sim.propagation.ssfm import LinkModel, ase_noise_power_w
+
+EXAMPLE_DIR = Path("src/fiber_link_sim/schema/examples")
+
+_LINK = GnLink(
+    n_spans=10,
+    span_length_km=80.0,
+    symbol_rate_baud=32e9,
+    carrier_hz=193.1e12,
+    alpha_db_per_km=0.2,
+    beta2_s2_per_km=-21.7e-24,
+    gamma_w_inv_km=1.3,
+    noise_figure_db=5.0,
+)
+
+
+def _gn_spec() -> dict:
+    data = json.loads((EXAMPLE_DIR / "qpsk_longhaul_multispan.json").read_text())
+    data["propagation"]["backend"] = "gn_model"
+    data["outputs"]["artifact_level"] = "none"
+    return data
+
+
+def test_nli_coefficient_follows_the_closed_form() -> None:
+    alpha = _LINK.alpha_per_km
+    effective_km = (1 - math.exp(-alpha * 80.0)) / alpha
+    x = math.pi**2 / 2 * 21.7e-24 / alpha * 32e9**2
+    per_span = (
+        8 / 27 * 1.3**2 * effective_km**2 * math.asinh(x) / (math.pi * 21.7e-24 / alpha * 32e9**2)
+    )
+
+    assert nli_coefficient(_LINK) == pytest.approx(10 * per_span, rel=1e-12)
+    no_dispersion = nli_coefficient(replace(_LINK, beta2_s2_per_km=0.0))
+    assert no_dispersion == pytest.approx(10 * 8 / 27 * 1.3**2 * effective_km**2 * math.pi / 2)
+    assert nli_coefficient(replace(_LINK, gamma_w_inv_km=0.0)) == 0.0
+
+
+def test_ase_matches_the_split_step_amplifier_model() -> None:
+    model = LinkModel(
+        n_spans=1,
+        span_length_km=80.0,
+        step_km=1.0,
+        sample_rate_hz=32e9,
+        carrier_hz=193.1e12,
+        alpha_db_per_km=0.2,
+        beta2_s2_per_km=0.0,
+        beta3_s3_per_km=0.0,
+        gamma_w_inv_km=0.0,
+        amplifier="edfa",
+        noise_figure_db=5.0,
+    )
+    # Both polarizations per amplifier against the native engine's power per mode.
+    expected_w = _LINK.n_spans * 2 * ase_noise_power_w(model)
+    assert ase_power_w(_LINK, 32e9) == pytest.approx(expected_w, rel=1e-12)
+    assert ase_power_w(replace(_LINK, noise_figure_db=None), 32e9) == 0.0
+
+
+def test_one_call_evaluates_a_launch_power_sweep() -> None:
+    powers_dbm = np.linspace(-10.0, 10.0, 2001).reshape(1, -1)
+
+    estimate = gn_estimate(_LINK, powers_dbm)
+
+    assert estimate.snr_db.shape == estimate.nli_w.shape == powers_dbm.shape
+    assert estimate.osnr_db is not None and estimate.osnr_db.shape == powers_dbm.shape
+    best = float(powers_dbm.ravel()[np.argmax(estimate.snr_db)])
+    assert best == pytest.approx(optimal_launch_power_dbm(_LINK), abs=0.01)
+    # ASE-limited at low power (1 dB per dB), NLI-limited at high power (-2 dB per dB).
+    slopes = np.gradient(estimate.snr_db.ravel(), powers_dbm.ravel())
+    assert slopes[0] == pytest.approx(1.0, abs=0.01)
+    assert slopes[-1] == pytest.approx(-2.0, abs=0.01)
+    with pytest.raises(ValueError, match="finite SNR"):
+        gn_estimate(replace(_LINK, gamma_w_inv_km=0.0, noise_figure_db=None), 0.0)
+
+
+def test_gn_backend_fills_the_summary_without_a_waveform() -> None:
+    data = _gn_spec()
+    spec = SimulationSpec.model_validate(data)
+    link = GnLink.from_spec(ChannelSpecSlice.from_spec(spec), carrier_hz=193.1e12)
+    expected = gn_estimate(link, spec.transceiver.tx.launch_power_dbm)
+
+    result = simulate(spec)
+
+    assert [stage.name for stage in build_pipeline(spec).stages] == [
+        "gn_model",
+        "metrics",
+        "artifacts",
+    ]
+    assert result.status == "success" and result.summary is not None
+    assert result.summary.snr_db == pytest.approx(float(expected.snr_db))
+    assert result.summary.osnr_db == pytest.approx(float(expected.osnr_db))
+    assert 0.0 <= result.summary.errors.pre_fec_ber < 1e-3
+    assert result.provenance.backend == "gn_model"
+
+
+def test_gn_backend_rejects_imdd_formats() -> None:
+    data = json.loads((EXAMPLE_DIR / "pam4_shorthaul.json").read_text())
+    data["propagation"]["backend"] = "gn_model"
+    with pytest.raises(ValidationError, match="coherent_qpsk only"):
+        SimulationSpec.model_validate(data)
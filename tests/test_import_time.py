@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from fiber_link_sim.benchmarking import CLI_HELP_COMMAND, cli_startup_budget_s, time_command
+
+EXAMPLE = Path(__file__).resolve().parents[1] / "src/fiber_link_sim/schema/examples/ook_smoke.json"
+
+_NO_OPTIC = """
+import json, sys
+from fiber_link_sim import simulate
+from fiber_link_sim.data_models.spec_models import SimulationSpec
+from fiber_link_sim.pipeline import build_pipeline
+from fiber_link_sim.utils import compute_spec_hash
+import fiber_link_sim.latency
+
+data = json.loads(open(sys.argv[1]).read())
+spec = SimulationSpec.model_validate(data)
+compute_spec_hash(spec)
+build_pipeline(spec)
+assert simulate({"v": "bogus"}).error.code == "validation_error"
+data["processing"]["autotune"] = {"enabled": True, "budget_trials": 2}
+assert simulate(data).error.code == "not_implemented"
+print(json.dumps(sorted(name for name in sys.modules if name.split(".")[0] in {"optic", "scipy"})))
+"""
+
+
+def _loaded_by(code: str, *args: str) -> list[str]:
+    out = subprocess.run(
+        [sys.executable, "-c", code, *args], check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(out.splitlines()[-1])
+
+
+def test_validation_hashing_and_early_exits_do_not_import_opticommpy() -> None:
+    assert _loaded_by(_NO_OPTIC, str(EXAMPLE)) == []
+
+
+def test_cli_import_stays_off_the_physics_stack() -> None:
+    code = (
+        "import json, sys, fiber_link_sim.cli; "
+        "print(json.dumps(sorted({n.split('.')[0] for n in sys.modules} & "
+        "{'numpy', 'pydantic', 'phys_pipeline', 'optic'})))"
+    )
+    assert _loaded_by(code) == []
+
+
+def test_cold_cli_help_is_within_budget() -> None:
+    budget_s = cli_startup_budget_s()
+    fastest_s = min(time_command(CLI_HELP_COMMAND, repeat=3))
+    assert fastest_s <= budget_s, f"cold CLI --help took {fastest_s:.2f}s (budget {budget_s}s)"
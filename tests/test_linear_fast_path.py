@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import json
+import math
+from dataclasses import replace
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from fiber_link_sim.adapters.opticommpy.channel import run_channel
+from fiber_link_sim.adapters.opticommpy.param_builders import build_channel_params
+from fiber_link_sim.data_models.spec_models import SimulationSpec
+from fiber_link_sim.data_models.stage_models import ChannelSpecSlice
+from fiber_link_sim.propagation.linear import linear_link, nonlinear_phase_rad
+from fiber_link_sim.propagation.manakov import PmdSections, manakov_ssfm
+from fiber_link_sim.propagation.ssfm import LinkModel, ase_noise_power_w, ssfm
+
+EXAMPLE_DIR = Path("src/fiber_link_sim/schema/examples")
+
+_MODEL = LinkModel(
+    n_spans=3,
+    span_length_km=50.0,
+    step_km=0.5,
+    sample_rate_hz=64e9,
+    carrier_hz=193.1e12,
+    alpha_db_per_km=0.2,
+    beta2_s2_per_km=-21.7e-24,
+    beta3_s3_per_km=0.1e-36,
+    gamma_w_inv_km=0.0,
+    amplifier="ideal",
+)
+
+
+def _field(n: int = 1024) -> np.ndarray:
+    rng = np.random.default_rng(9)
+    return (rng.standard_normal(n) + 1j * rng.standard_normal(n)) * 0.03
+
+
+def test_linear_link_matches_the_split_step_engines_without_kerr() -> None:
+    x = _field()
+    expected, _ = ssfm(x, _MODEL, rng=np.random.default_rng())
+    np.testing.assert_allclose(
+        linear_link(x, _MODEL, rng=np.random.default_rng()), expected, atol=1e-14
+    )
+
+    model = replace(_MODEL, amplifier="none", pmd_ps_sqrt_km=0.5, pmd_sections_per_span=4)
+    field = np.stack([x, 1j * x[::-1]], axis=1)
+    expected, _ = manakov_ssfm(field, model, rng=np.random.default_rng(4))
+    rng = np.random.default_rng(4)
+    pmd = PmdSections.build(model, field.shape[0], rng)
+    np.testing.assert_allclose(linear_link(field, model, rng=rng, pmd=pmd), expected, atol=1e-14)
+
+
+def test_linear_link_adds_every_span_of_ase_in_one_draw() -> None:
+    model = replace(_MODEL, amplifier="edfa", noise_figure_db=5.0)
+    silence = np.zeros(1 << 16, dtype=np.complex128)
+
+    noise = linear_link(silence, model, rng=np.random.default_rng(1))
+
+    expected_w = model.n_spans * ase_noise_power_w(model)
+    assert np.mean(np.abs(noise) ** 2) == pytest.approx(expected_w, rel=0.03)
+
+
+def test_nonlinear_phase_uses_the_effective_length_per_amplified_span() -> None:
+    model = replace(_MODEL, gamma_w_inv_km=1.3)
+    alpha = model.alpha_per_km
+    per_span = 1.3 * 1e-3 * (1 - math.exp(-alpha * 50.0)) / alpha
+
+    assert nonlinear_phase_rad(model, 1e-3) == pytest.approx(3 * per_span)
+    unamplified = nonlinear_phase_rad(replace(model, amplifier="none"), 1e-3)
+    assert unamplified == pytest.approx(1.3 * 1e-3 * (1 - math.exp(-alpha * 150.0)) / alpha)
+    assert nonlinear_phase_rad(model, 1e-3, coefficient=8 / 9) == pytest.approx(8 / 3 * per_span)
+    assert nonlinear_phase_rad(_MODEL, 1e-3) == 0.0
+
+
+@pytest.mark.opticommpy
+def test_channel_takes_the_linear_path_below_the_phase_threshold() -> None:
+    data = json.loads((EXAMPLE_DIR / "qpsk_longhaul_1span.json").read_text())
+    data["runtime"]["n_symbols"] = 1024
+    samples = 1024 * data["runtime"]["samples_per_symbol"]
+    field = np.stack([_field(samples), _field(samples)[::-1]], axis=1)
+    spec = ChannelSpecSlice.from_spec(SimulationSpec.model_validate(data))
+
+    # 1 mW per polarization: tens of mrad of Kerr phase over the span.
+    launch = run_channel(spec, field * np.sqrt(1e-3 / np.mean(np.abs(field) ** 2)), seed=2)
+    weak = run_channel(spec, field * 1e-3, seed=2)
+
+    assert launch.propagation_path == "split_step"
+    assert launch.params.nonlinear_phase_rad > spec.propagation.linear_phase_threshold_rad
+    assert weak.propagation_path == "linear"
+    assert weak.osnr_db == launch.osnr_db
+    data["propagation"]["effects"]["nonlinearity"] = False
+    data["propagation"]["linear_phase_threshold_rad"] = 0.0
+    spec = ChannelSpecSlice.from_spec(SimulationSpec.model_validate(data))
+    assert run_channel(spec, field, seed=2).propagation_path == "linear"
+
+
+@pytest.mark.opticommpy
+def test_linear_path_reproduces_opticommpy_on_the_imdd_example() -> None:
+    from optic.models import channels  # type: ignore[import-untyped]
+
+    data = json.loads((EXAMPLE_DIR / "pam4_shorthaul.json").read_text())
+    data["runtime"]["n_symbols"] = 1024
+    spec = ChannelSpecSlice.from_spec(SimulationSpec.model_validate(data))
+    signal = _field(1024 * data["runtime"]["samples_per_symbol"]).real
+    param, _ = build_channel_params(spec, seed=5)
+
+    expected = channels.ssfm(signal, param)[0]
+    actual = run_channel(spec, signal, seed=5)
+
+    assert actual.propagation_path == "linear"
+    np.testing.assert_allclose(actual.signal, expected, rtol=0, atol=1e-12)
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import json
+import math
+from dataclasses import replace
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from fiber_link_sim.adapters.opticommpy.channel import run_channel
+from fiber_link_sim.data_models.spec_models import SimulationSpec
+from fiber_link_sim.data_models.stage_models import ChannelSpecSlice
+from fiber_link_sim.propagation.manakov import MANAKOV_KERR_FACTOR, PmdSections, manakov_ssfm
+from fiber_link_sim.propagation.ssfm import LinkModel, ssfm
+
+EXAMPLE_DIR = Path("src/fiber_link_sim/schema/examples")
+
+_MODEL = LinkModel(
+    n_spans=2,
+    span_length_km=20.0,
+    step_km=0.5,
+    sample_rate_hz=64e9,
+    carrier_hz=193.1e12,
+    alpha_db_per_km=0.2,
+    beta2_s2_per_km=-21.7e-24,
+    beta3_s3_per_km=0.0,
+    gamma_w_inv_km=1.3,
+)
+
+
+def _field(n: int = 1024) -> np.ndarray:
+    rng = np.random.default_rng(11)
+    return (rng.standard_normal(n) + 1j * rng.standard_normal(n)) * 0.05
+
+
+def test_single_polarization_manakov_is_the_scalar_equation_with_8_9_kerr() -> None:
+    x = _field()
+    dual, _ = manakov_ssfm(
+        np.stack([x, np.zeros_like(x)], axis=1), _MODEL, rng=np.random.default_rng()
+    )
+    scalar_model = replace(_MODEL, gamma_w_inv_km=_MODEL.gamma_w_inv_km * MANAKOV_KERR_FACTOR)
+    scalar, _ = ssfm(x, scalar_model, rng=np.random.default_rng())
+
+    np.testing.assert_allclose(dual[:, 0], scalar, rtol=0, atol=1e-14)
+    assert not dual[:, 1].any()
+
+
+def test_pmd_sections_conserve_energy_and_give_the_configured_mean_dgd() -> None:
+    lossless = replace(
+        _MODEL, alpha_db_per_km=0.0, pmd_ps_sqrt_km=0.5, pmd_sections_per_span=7, step_km=3.0
+    )
+    x = _field()
+    field = np.stack([x, 1j * x[::-1]], axis=1)
+    out, _ = manakov_ssfm(field, lossless, rng=np.random.default_rng(2))
+    assert np.sum(np.abs(out) ** 2) == pytest.approx(np.sum(np.abs(field) ** 2), rel=1e-12)
+    sections = PmdSections.build(lossless, 8, np.random.default_rng(0))
+    assert sorted(i for ends in sections.at_boundary for i in ends) == list(range(7))
+
+    link = replace(
+        _MODEL,
+        n_spans=10,
+        span_length_km=100.0,
+        step_km=100.0,
+        alpha_db_per_km=0.0,
+        beta2_s2_per_km=0.0,
+        gamma_w_inv_km=0.0,
+        pmd_ps_sqrt_km=0.1,
+        pmd_sections_per_span=5,
+    )
+    n = 4096
+    d_omega = 2 * np.pi * link.sample_rate_hz / n
+    dgds = []
+    for seed in range(200):
+        # Two modes launched on x and y read out the link's Jones matrix at every frequency.
+        spectrum = np.zeros((n, 4), dtype=np.complex128)
+        spectrum[:, 0] = spectrum[:, 3] = 1.0
+        sections = PmdSections.build(link, n, np.random.default_rng(seed))
+        for span in range(link.n_spans):
+            sections.apply_span(spectrum, span)
+        jones = spectrum.reshape(n, 2, 2).transpose(0, 2, 1)
+        eigen = np.linalg.eigvals(jones[1] @ jones[0].conj().T)
+        dgds.append(abs(np.angle(eigen[0] / eigen[1])) / d_omega)
+
+    expected_s = 0.1e-12 * math.sqrt(link.n_spans * link.span_length_km)
+    assert np.mean(dgds) == pytest.approx(expected_s, rel=0.1)
+
+
+@pytest.mark.opticommpy
+def test_native_manakov_runs_through_the_channel_adapter() -> None:
+    data = json.loads((EXAMPLE_DIR / "qpsk_longhaul_1span.json").read_text())
+    data["runtime"]["n_symbols"] = 1024
+    data["propagation"]["backend"] = "native_ssfm"
+    data["propagation"]["ssfm"]["dz_m"] = 10_000.0
+    data["propagation"]["ssfm"]["step_adapt"] = True
+    data["propagation"]["effects"]["pmd"] = True
+    data["propagation"]["linear_phase_threshold_rad"] = 0.0
+    spec = ChannelSpecSlice.from_spec(SimulationSpec.model_validate(data))
+    samples = 1024 * data["runtime"]["samples_per_symbol"]
+    signal = np.stack([_field(samples), _field(samples)[::-1]], axis=1) * 0.02
+
+    first = run_channel(spec, signal, seed=4)
+    second = run_channel(spec, signal, seed=4)
+
+    assert first.signal.shape == signal.shape
+    assert first.osnr_db is not None
+    np.testing.assert_array_equal(first.signal, second.signal)
+    # step_adapt defaults to the local-error method.
+    assert first.params.ssfm_steps > 0
+    assert first.params.ssfm_error_estimate is not None
+    with pytest.raises(ValueError, match="x/y columns"):
+        manakov_ssfm(signal[:, 0], _MODEL, rng=np.random.default_rng())
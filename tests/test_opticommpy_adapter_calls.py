@@ -2,10 +2,12 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
+from typing import Any
 
 import numpy as np
 import pytest
 
+from fiber_link_sim.adapters.opticommpy.metrics import compute_metrics
 from fiber_link_sim.adapters.opticommpy.stages import ADAPTERS
 from fiber_link_sim.data_models.spec_models import SimulationSpec
 from fiber_link_sim.data_models.stage_models import (
@@ -105,3 +107,40 @@ def test_adapter_chain_imdd_ook() -> None:
         dsp_out.symbols, tx_out.symbols, TxSpecSlice.from_spec(spec)
     )
     assert np.isfinite(metrics_out.pre_fec_ber)
+
+
+@pytest.mark.parametrize("example", ["ook_smoke.json", "qpsk_longhaul_1span.json"])
+def test_metrics_match_on_read_only_stored_symbols(example: str) -> None:
+    signal = SimulationSpec.model_validate_json((EXAMPLE_DIR / example).read_text()).signal
+    rng = np.random.default_rng(7)
+    if signal.format == "imdd_ook":
+        tx = rng.integers(0, 2, 512).astype(np.float64)
+        rx = tx + 0.3 * rng.standard_normal(512)
+    else:
+        tx = (rng.choice([-1.0, 1.0], 512) + 1j * rng.choice([-1.0, 1.0], 512)) / np.sqrt(2)
+        rx = tx + 0.2 * (rng.standard_normal(512) + 1j * rng.standard_normal(512))
+    writable = compute_metrics(rx.copy(), tx.copy(), signal)
+    rx.flags.writeable = tx.flags.writeable = False
+
+    assert compute_metrics(rx, tx, signal) == writable
+
+
+def test_metrics_fall_back_to_theory_only_on_rejected_symbols(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    from fiber_link_sim.adapters.opticommpy import metrics
+
+    signal = SimulationSpec.model_validate_json((EXAMPLE_DIR / "ook_smoke.json").read_text()).signal
+    tx = np.tile([0.0, 1.0], 64)
+
+    def _raise(exc: Exception) -> Any:
+        def _fast_ber(*_: object) -> Any:
+            raise exc
+
+        return _fast_ber
+
+    monkeypatch.setattr(metrics.opti_metrics, "fastBERcalc", _raise(AssertionError("sizes")))
+    assert "sizes" in (compute_metrics(tx, tx, signal).ber_fallback or "")
+    monkeypatch.setattr(metrics.opti_metrics, "fastBERcalc", _raise(ValueError("read-only")))
+    with pytest.raises(ValueError, match="read-only"):
+        compute_metrics(tx, tx, signal)
@@ -81,3 +81,16 @@ def test_channel_params_unit_normalization() -> None:
         -(2.0 * np.pi * units.C_M_S / (wavelength_m**2)) * spec.fiber.beta2_s2_per_m * 1e6
     )
     assert param.D == pytest.approx(expected_dispersion)
+
+
+def test_channel_params_keep_opticommpy_adaptive_stepping() -> None:
+    spec_data = _load_example("qpsk_longhaul_manakov.json")
+    spec_data["propagation"]["ssfm"]["max_nonlinear_phase_rad"] = 0.01
+    for step_adapt in (False, True):
+        spec_data["propagation"]["ssfm"]["step_adapt"] = step_adapt
+        param, _ = build_channel_params(
+            ChannelSpecSlice.from_spec(SimulationSpec.model_validate(spec_data)), seed=1
+        )
+        # manakovSSF defaults nlprMethod to True; the builtin backend never overrides it.
+        assert not hasattr(param, "nlprMethod")
+        assert param.maxNlinPhaseRot == 0.01
@@ -1,10 +1,21 @@
 from __future__ import annotations
 
+import json
 from dataclasses import dataclass
+from pathlib import Path
 
-from fiber_link_sim.pipeline_execution import run_pipeline
+import numpy as np
+from phys_pipeline import DagCache
+
+from fiber_link_sim import simulate
+from fiber_link_sim.artifacts import load_artifact_arrays
+from fiber_link_sim.data_models.spec_models import SimulationResult, SimulationSpec
+from fiber_link_sim.pipeline import build_pipeline
+from fiber_link_sim.pipeline_execution import _build_dag_nodes, assign_node_keys, run_pipeline
 from fiber_link_sim.stages.base import SimulationState, StageConfig, StageResult
 
+EXAMPLE = Path(__file__).resolve().parents[1] / "src/fiber_link_sim/schema/examples/ook_smoke.json"
+
 
 @dataclass(slots=True)
 class _CounterPipeline:
@@ -72,3 +83,130 @@ def test_dag_and_sequential_execution_match(monkeypatch, tmp_path) -> None:
     assert seq_meta.mode == "sequential"
     assert dag_meta.mode == "dag"
     assert seq_state.stats == dag_state.stats
+
+
+def test_standard_pipeline_runs_as_a_dependency_graph() -> None:
+    spec = SimulationSpec.model_validate(json.loads(EXAMPLE.read_text()))
+    nodes = {node.id: node for node in _build_dag_nodes(build_pipeline(spec).stages)}
+
+    assert nodes["channel"].deps == ["tx"]
+    assert nodes["latency"].deps == ["channel"]
+    assert nodes["metrics"].deps == ["fec", "latency"]
+    assert nodes["artifacts_tx"].deps == ["tx"]
+    assert nodes["artifacts_dsp"].deps == ["dsp"]
+    assert nodes["artifacts"].deps == [
+        "metrics",
+        "artifacts_tx",
+        "artifacts_channel",
+        "artifacts_rx",
+        "artifacts_dsp",
+    ]
+
+
+def test_merge_joins_what_each_branch_added() -> None:
+    parent = SimulationState(meta={"seed": 3, "warnings": ["w0"]}, stats={"n_symbols": 4})
+    left = parent.fork()
+    left.stats["post_fec_ber"] = 0.0
+    left.meta.setdefault("stage_timings", {})["fec"] = 1.0
+    right = parent.fork()
+    right.stats["latency_budget"] = {"total_s": 1.0}
+    right.meta.setdefault("stage_timings", {})["latency"] = 2.0
+    right.meta["warnings"].append("w1")
+
+    merged = SimulationState.merge([left, right])
+
+    assert merged.stats == {"n_symbols": 4, "post_fec_ber": 0.0, "latency_budget": {"total_s": 1.0}}
+    assert merged.meta["stage_timings"] == {"fec": 1.0, "latency": 2.0}
+    assert merged.meta["warnings"] == ["w0", "w1"]
+    assert parent.stats == {"n_symbols": 4}
+
+
+def test_merge_leaves_the_ancestor_and_first_branch_untouched() -> None:
+    root = SimulationState(meta={"cfg": {"dsp": {"a": 1}, "order": ["tx"]}})
+    a, b = root.fork(), root.fork()
+    b.meta["cfg"] = {"dsp": {"a": 1, "b": 2}, "order": ["tx", "dsp"]}
+
+    merged = SimulationState.merge([a, b])
+
+    assert merged.meta["cfg"] == {"dsp": {"a": 1, "b": 2}, "order": ["tx", "dsp"]}
+    assert root.meta == a.meta == {"cfg": {"dsp": {"a": 1}, "order": ["tx"]}}
+
+
+def test_node_keys_change_only_downstream_of_a_changed_slice() -> None:
+    data = json.loads(EXAMPLE.read_text())
+    base = SimulationSpec.model_validate(data)
+    data["processing"]["dsp_chain"][2]["params"]["taps"] = 9
+    changed = SimulationSpec.model_validate(data)
+
+    def _keys(spec: SimulationSpec) -> dict[str, str]:
+        nodes = _build_dag_nodes(build_pipeline(spec).stages)
+        return assign_node_keys(nodes, SimulationState(meta={"seed": 1}))
+
+    base_keys, changed_keys = _keys(base), _keys(changed)
+    same = {node for node in base_keys if base_keys[node] == changed_keys[node]}
+    assert same == {
+        "tx",
+        "channel",
+        "rx_frontend",
+        "artifacts_tx",
+        "artifacts_channel",
+        "artifacts_rx",
+    }
+
+
+def test_warm_dag_run_reads_only_the_final_node(monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv("FIBER_LINK_SIM_PIPELINE_EXECUTOR", "dag")
+    monkeypatch.setenv("FIBER_LINK_SIM_PIPELINE_CACHE_BACKEND", "disk")
+    monkeypatch.setenv("FIBER_LINK_SIM_PIPELINE_CACHE_ROOT", str(tmp_path / "dag-cache"))
+    spec = SimulationSpec.model_validate(json.loads(EXAMPLE.read_text()))
+    cold = SimulationState(meta={"seed": spec.runtime.seed})
+    run_pipeline(build_pipeline(spec), cold)
+
+    lookups: list[str] = []
+    original_get = DagCache.get
+
+    def _get(self: DagCache, key: str) -> object:
+        lookups.append(key)
+        return original_get(self, key)
+
+    monkeypatch.setattr(DagCache, "get", _get)
+    warm = SimulationState(meta={"seed": spec.runtime.seed})
+    meta = run_pipeline(build_pipeline(spec), warm)
+
+    assert len(lookups) == 1
+    assert meta.cache_hits == 12
+    assert warm.stats["summary"] == cold.stats["summary"]
+
+
+def test_dag_simulation_matches_sequential_summary_and_artifacts(monkeypatch, tmp_path) -> None:
+    data = json.loads(EXAMPLE.read_text())
+    data["runtime"]["n_symbols"] = 1024
+    data["outputs"] = {"artifact_level": "debug", "return_waveforms": True}
+    monkeypatch.setenv("FIBER_LINK_SIM_LOCAL_CACHE", "0")
+    monkeypatch.setenv("FIBER_LINK_SIM_PIPELINE_CACHE_BACKEND", "none")
+
+    results = {}
+    for mode in ("sequential", "dag"):
+        monkeypatch.setenv("FIBER_LINK_SIM_PIPELINE_EXECUTOR", mode)
+        (tmp_path / mode).mkdir()
+        monkeypatch.chdir(tmp_path / mode)
+        results[mode] = simulate(data)
+
+    sequential, dag = results["sequential"], results["dag"]
+    assert sequential.status == dag.status == "success"
+    assert dag.summary == sequential.summary
+    assert dag.warnings == sequential.warnings
+
+    def _products(result: SimulationResult) -> dict[str, str]:
+        return {artifact.name: artifact.ref for artifact in result.artifacts}
+
+    assert _products(dag) == _products(sequential)
+    root = Path("artifacts") / sequential.provenance.spec_hash
+    products = [artifact for artifact in sequential.artifacts if artifact.type == "npz"]
+    assert products
+    for artifact in products:
+        expected = load_artifact_arrays(tmp_path / "sequential" / root, artifact.name)
+        actual = load_artifact_arrays(tmp_path / "dag" / root, artifact.name)
+        assert expected.keys() == actual.keys() and expected
+        for key in expected:
+            np.testing.assert_array_equal(actual[key], expected[key])
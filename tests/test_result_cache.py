@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import importlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+from fiber_link_sim.data_models.spec_models import ErrorInfo, Provenance, SimulationResult
+from fiber_link_sim.result_cache import DiskResultCache, FrozenSimulationResult, ResultCache
+from fiber_link_sim.simulate import simulate
+
+simulate_module = importlib.import_module("fiber_link_sim.simulate")
+
+EXAMPLE = Path(__file__).resolve().parents[1] / "src/fiber_link_sim/schema/examples/ook_smoke.json"
+
+
+def _result(tag: str, n_warnings: int = 0) -> SimulationResult:
+    return SimulationResult(
+        v="0.2",
+        status="error",
+        error=ErrorInfo(code="runtime_error", message=tag),
+        provenance=Provenance(
+            sim_version="1.0.0",
+            spec_hash=tag,
+            seed=0,
+            runtime_s=0.0,
+            backend=None,
+            model=None,
+        ),
+        warnings=["w" * 100] * n_warnings,
+    )
+
+
+def test_lru_evicts_by_entries_and_counts() -> None:
+    cache = ResultCache(max_entries=2)
+    for tag in ("a", "b"):
+        cache.put(tag, _result(tag))
+    assert cache.get("a") is not None
+    cache.put("c", _result("c"))
+
+    assert "b" not in cache
+    assert cache.get("b") is None
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.entries) == (1, 1, 1, 2)
+
+
+def test_byte_budget_evicts_and_skips_oversized_results() -> None:
+    small = len(_result("a").model_dump_json())
+    cache = ResultCache(max_entries=100, max_bytes=2 * small + 10)
+    cache.put("a", _result("a"))
+    cache.put("b", _result("b"))
+    cache.put("c", _result("c"))
+    cache.put("huge", _result("huge", n_warnings=10))
+
+    assert len(cache) == 2
+    assert "huge" not in cache
+    assert cache.stats().bytes <= cache.max_bytes
+    cache.clear()
+    assert cache.stats().to_dict() == {
+        "hits": 0,
+        "misses": 0,
+        "evictions": 0,
+        "entries": 0,
+        "bytes": 0,
+    }
+
+
+def test_hits_are_isolated_copies_unless_frozen() -> None:
+    cache = ResultCache()
+    original = _result("a")
+    assert cache.put("a", original) is original
+    original.warnings.append("mutated after put")
+    hit = cache.get("a")
+    assert hit is not None and hit.warnings == []
+    hit.warnings.append("mutated hit")
+    assert cache.get("a").warnings == []  # type: ignore[union-attr]
+
+    frozen = ResultCache(frozen=True)
+    shared = frozen.put("a", _result("a"))
+    assert isinstance(shared, FrozenSimulationResult)
+    assert frozen.get("a") is shared
+    with pytest.raises(ValidationError):
+        shared.status = "success"
+    assert SimulationResult.model_validate(shared.model_dump()) == _result("a")
+
+
+def test_simulate_serves_repeat_specs_from_bounded_cache() -> None:
+    cache = simulate_module._SIMULATION_CACHE
+    cache.clear()
+    spec = json.loads(EXAMPLE.read_text())
+
+    first = simulate(spec)
+    second = simulate(spec)
+
+    assert first.status == "success"
+    assert second == first
+    assert second is not first
+    assert cache.stats().hits == 1
+    assert cache.stats().entries == 1
+
+
+def test_disk_cache_round_trips_and_evicts_lru(tmp_path: Path) -> None:
+    size = len(_result("a" * 64).model_dump_json())
+    cache = DiskResultCache(tmp_path / "results", max_bytes=2 * size)
+    hashes = [tag * 64 for tag in "abc"]
+    cache.put(hashes[0], "1.0.0", _result(hashes[0]))
+    cache.put(hashes[1], "1.0.0", _result(hashes[1]))
+    os.utime(cache.path_for(hashes[1], "1.0.0"), (0, 0))
+    assert cache.get(hashes[0], "1.0.0") == _result(hashes[0])
+    cache.put(hashes[2], "1.0.0", _result(hashes[2]))
+
+    assert cache.get(hashes[1], "1.0.0") is None
+    assert cache.get(hashes[0], "1.0.0") is not None
+    assert cache.get(hashes[0], "2.0.0") is None
+    assert cache.total_bytes() <= cache.max_bytes
+    assert not list(cache.root.rglob(".tmp-*"))
+
+
+def test_disk_cache_concurrent_writers_respect_budget(tmp_path: Path) -> None:
+    size = len(_result("0" * 64).model_dump_json())
+    cache = DiskResultCache(tmp_path, max_bytes=5 * size)
+    hashes = [f"{idx:064d}" for idx in range(40)]
+
+    def _put(spec_hash: str) -> None:
+        DiskResultCache(tmp_path, cache.max_bytes).put(spec_hash, "v", _result(spec_hash))
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(_put, hashes))
+
+    assert 0 < len(cache.entries()) <= 5
+    assert cache.total_bytes() <= cache.max_bytes
+    for path in cache.entries():
+        SimulationResult.model_validate_json(path.read_text())
+
+
+def test_simulate_returns_disk_hit_before_building_pipeline(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setenv("FIBER_LINK_SIM_RESULT_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("FIBER_LINK_SIM_LOCAL_CACHE", "0")
+    spec = json.loads(EXAMPLE.read_text())
+    first = simulate(spec)
+    assert first.status == "success"
+
+    def _fail(*_: object) -> None:
+        raise AssertionError("pipeline must not be built on a disk cache hit")
+
+    monkeypatch.setattr(simulate_module, "build_pipeline", _fail)
+    assert simulate(spec) == first
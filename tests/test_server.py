@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import json
+import threading
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from fiber_link_sim import cli
+from fiber_link_sim.client import (
+    CONTEXT_HEADER,
+    REMOTE_TIMEOUT_GRACE_S,
+    ServerError,
+    ServerUnavailable,
+    _remote_timeout_s,
+    request,
+    run_context,
+    server_health,
+    simulate_remote,
+)
+from fiber_link_sim.server import make_server
+from fiber_link_sim.simulate import simulate
+
+
+@pytest.fixture()
+def unix_address(tmp_path: Path) -> Iterator[str]:
+    address = f"unix:{tmp_path / 'sim.sock'}"
+    server = make_server(address)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield address
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def test_server_answers_specs_health_and_bad_requests(
+    unix_address: str, autotune_spec: Callable[..., dict[str, Any]]
+) -> None:
+    spec = autotune_spec()
+    result = simulate_remote(spec, unix_address)
+
+    assert result["error"]["code"] == "not_implemented"
+    assert result["provenance"]["spec_hash"] == simulate(spec).provenance.spec_hash
+    health = server_health(unix_address)
+    assert health is not None and health["status"] == "ok"
+    with pytest.raises(ServerError, match="must be a JSON object"):
+        request(unix_address, "POST", "/simulate", [1, 2])
+    with pytest.raises(ServerError, match="unknown path"):
+        request(unix_address, "GET", "/nope")
+
+
+def test_tcp_server_and_missing_server() -> None:
+    server = make_server("127.0.0.1:0")
+    host, port = server.server_address[:2]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        health = server_health(f"http://{host}:{port}")
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+    assert health is not None and health["status"] == "ok"
+    assert server_health(f"{host}:{port}") is None
+
+
+def test_cli_forwards_to_a_running_server(
+    unix_address: str,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    autotune_spec: Callable[..., dict[str, Any]],
+) -> None:
+    spec_path = tmp_path / "spec.json"
+    spec_path.write_text(json.dumps(autotune_spec()))
+    local_runs: list[Path] = []
+
+    def _local(path: Path) -> dict[str, Any]:
+        local_runs.append(path)
+        return simulate(path).model_dump(mode="json")
+
+    monkeypatch.setattr(cli, "_simulate_locally", _local)
+    monkeypatch.setenv("FIBER_LINK_SIM_SERVER", unix_address)
+    output = tmp_path / "result.json"
+
+    assert cli.main([str(spec_path), "-o", str(output)]) == 1
+    assert json.loads(output.read_text())["error"]["code"] == "not_implemented"
+    assert local_runs == []
+
+    assert cli.main([str(spec_path), "--local", "-o", str(output)]) == 1
+    monkeypatch.setenv("FIBER_LINK_SIM_SERVER", f"unix:{tmp_path / 'missing.sock'}")
+    assert cli.main([str(spec_path), "-o", str(output)]) == 1
+    assert local_runs == [spec_path, spec_path]
+
+
+def test_server_refuses_specs_from_a_different_context(
+    unix_address: str, autotune_spec: Callable[..., dict[str, Any]]
+) -> None:
+    spec = autotune_spec()
+    assert simulate_remote(spec, unix_address, context=run_context())["status"] == "error"
+
+    elsewhere = {**run_context(), "cwd": "/somewhere/else"}
+    with pytest.raises(ServerError, match="differ") as excinfo:
+        simulate_remote(spec, unix_address, context=elsewhere)
+    assert excinfo.value.status == 409
+    with pytest.raises(ServerError, match="invalid X-Fiber-Link-Sim-Context") as excinfo:
+        request(unix_address, "POST", "/simulate", spec, headers={CONTEXT_HEADER: "{not json"})
+    assert excinfo.value.status == 400
+    with pytest.raises(ServerUnavailable):
+        request("127.0.0.1:1", "GET", "/health", timeout=1.0)
+    assert _remote_timeout_s(spec) == spec["runtime"]["max_runtime_s"] + REMOTE_TIMEOUT_GRACE_S
+
+
+def test_cli_runs_locally_on_a_context_mismatch_but_never_twice(
+    unix_address: str,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    autotune_spec: Callable[..., dict[str, Any]],
+) -> None:
+    spec_path = tmp_path / "spec.json"
+    spec_path.write_text(json.dumps(autotune_spec()))
+    local_runs: list[Path] = []
+
+    def _local(path: Path) -> dict[str, Any]:
+        local_runs.append(path)
+        return simulate(path).model_dump(mode="json")
+
+    monkeypatch.setattr(cli, "_simulate_locally", _local)
+    monkeypatch.setenv("FIBER_LINK_SIM_SERVER", unix_address)
+    monkeypatch.setattr(cli, "run_context", lambda: {**run_context(), "cwd": str(tmp_path)})
+    assert cli.main([str(spec_path), "-o", str(tmp_path / "result.json")]) == 1
+    assert local_runs == [spec_path]
+
+    def _dropped(*args: Any, **kwargs: Any) -> dict[str, Any]:
+        raise TimeoutError("timed out")
+
+    monkeypatch.setattr(cli, "simulate_remote", _dropped)
+    assert cli.main([str(spec_path), "-o", str(tmp_path / "result.json")]) == 1
+    assert local_runs == [spec_path]
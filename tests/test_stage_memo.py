@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pytest
+
+from fiber_link_sim.adapters.opticommpy.stages import ADAPTERS
+from fiber_link_sim.data_models.spec_models import SimulationSpec
+from fiber_link_sim.pipeline import build_pipeline
+from fiber_link_sim.pipeline_execution import run_pipeline
+from fiber_link_sim.stages.base import SimulationState, StageConfig, StageResult
+from fiber_link_sim.stages.memo import MemoizedStage, StageMemo, StageOutputs
+
+EXAMPLE = Path(__file__).resolve().parents[1] / "src/fiber_link_sim/schema/examples/ook_smoke.json"
+
+
+def _spec(taps: int) -> SimulationSpec:
+    data = json.loads(EXAMPLE.read_text())
+    data["processing"]["dsp_chain"][2]["params"]["taps"] = taps
+    return SimulationSpec.model_validate(data)
+
+
+def _run(spec: SimulationSpec, memo: StageMemo | None) -> SimulationState:
+    state = SimulationState(meta={"seed": spec.runtime.seed, "version": "1.0.0"})
+    run_pipeline(build_pipeline(spec, memo=memo), state)
+    return state
+
+
+def _count_channel_runs(monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    calls: list[int] = []
+    original = type(ADAPTERS.channel).run
+
+    def _counting(self: Any, *args: Any, **kwargs: Any) -> Any:
+        calls.append(1)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(type(ADAPTERS.channel), "run", _counting)
+    return calls
+
+
+@pytest.mark.parametrize("executor", ["sequential", "dag"])
+def test_taps_sweep_propagates_once(monkeypatch: pytest.MonkeyPatch, executor: str) -> None:
+    monkeypatch.setenv("FIBER_LINK_SIM_PIPELINE_EXECUTOR", executor)
+    monkeypatch.setenv("FIBER_LINK_SIM_PIPELINE_CACHE_BACKEND", "none")
+    reference = _run(_spec(9), memo=None)
+    calls = _count_channel_runs(monkeypatch)
+    memo = StageMemo()
+
+    _run(_spec(5), memo)
+    swept = _run(_spec(9), memo)
+
+    assert len(calls) == 1
+    assert swept.meta["stage_memo_hits"] == ["tx", "channel", "rx_frontend"]
+    assert swept.stats["summary"] == reference.stats["summary"]
+    assert swept.signals == reference.signals
+    assert np.array_equal(
+        swept.load_signal("rx", "symbols"), reference.load_signal("rx", "symbols")
+    )
+    assert memo.stats().memory_hits == 3
+
+
+def test_disk_tier_replays_in_a_fresh_memo(tmp_path: Path) -> None:
+    spec = _spec(9)
+    first = _run(spec, StageMemo(disk_root=tmp_path))
+    fresh = StageMemo(disk_root=tmp_path)
+    second = _run(spec, fresh)
+
+    assert fresh.stats().disk_hits == 6
+    assert second.meta["stage_memo_hits"] == [
+        "tx",
+        "channel",
+        "rx_frontend",
+        "dsp",
+        "fec",
+        "metrics",
+    ]
+    assert second.stats["summary"] == first.stats["summary"]
+    hard_bits = second.rx["hard_bits_ref"]
+    assert np.array_equal(
+        second.load_packed_bits(hard_bits).data, first.load_packed_bits(hard_bits).data
+    )
+
+
+def test_memory_tier_evicts_to_budget() -> None:
+    def _outputs(n: int) -> StageOutputs:
+        return StageOutputs({}, {}, {"ref": np.zeros(n)}, {}, {}, [])
+
+    memo = StageMemo(max_bytes=3000)
+    memo.put("a", _outputs(100))
+    memo.put("b", _outputs(100))
+    memo.put("huge", _outputs(10_000))
+
+    assert memo.get("huge") is None
+    assert memo.get("a") is None
+    assert memo.get("b") is not None
+    assert memo.stats().evictions == 1
+    assert memo.stats().bytes <= memo.max_bytes
+
+
+class _InPlaceTally:
+    name = "tally"
+
+    def __init__(self) -> None:
+        self.cfg = StageConfig(name=self.name)
+
+    def process(self, state: SimulationState, **_: object) -> StageResult[SimulationState]:
+        state.stats["counts"]["runs"] += 1
+        return StageResult(state=state)
+
+
+def test_replay_includes_values_mutated_in_place() -> None:
+    stage = MemoizedStage(stage=_InPlaceTally(), memo=StageMemo())
+
+    def _state() -> SimulationState:
+        return SimulationState(meta={"seed": 1, "version": "1.0.0"}, stats={"counts": {"runs": 0}})
+
+    ran, replayed = _state(), _state()
+    stage.process(ran)
+    stage.process(replayed)
+
+    assert replayed.meta["stage_memo_hits"] == ["tally"]
+    assert replayed.stats["counts"] == ran.stats["counts"] == {"runs": 1}
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+import pickle
 from pathlib import Path
 
 import numpy as np
+import pytest
 
-from fiber_link_sim.artifacts import LocalArtifactStore, artifact_root_for_spec
+from fiber_link_sim.artifacts import (
+    HybridArtifactStore,
+    LocalArtifactStore,
+    artifact_root_for_spec,
+)
 from fiber_link_sim.stages.base import SimulationState
 
 
@@ -42,3 +48,115 @@ def test_stage_rng_independent_of_call_order() -> None:
 
     assert first == first_reordered
     assert second == second_reordered
+
+
+def test_hybrid_store_keeps_signals_in_memory(tmp_path: Path) -> None:
+    root = artifact_root_for_spec("spec", base_dir=tmp_path / "artifacts", create=False)
+    state = SimulationState(meta={"seed": 1}, artifact_store=HybridArtifactStore(root))
+    waveform = np.arange(8, dtype=np.float64)
+    ref = state.store_signal("tx", "waveform", waveform)
+
+    loaded = state.load_signal("tx", "waveform")
+    assert loaded is not None
+    assert np.shares_memory(loaded, waveform)
+    with pytest.raises(ValueError):
+        loaded[0] = 1.0
+    assert state.refs[ref]["persisted"] is False
+    assert not root.exists()
+
+
+def test_hybrid_store_refs_match_local_store(tmp_path: Path) -> None:
+    waveform = np.linspace(0.0, 1.0, 16)
+    local = SimulationState(
+        meta={"seed": 1},
+        artifact_store=LocalArtifactStore(artifact_root_for_spec("spec", base_dir=tmp_path)),
+    )
+    hybrid = SimulationState(
+        meta={"seed": 1},
+        artifact_store=HybridArtifactStore(
+            artifact_root_for_spec("spec", base_dir=tmp_path / "hybrid"), persist_blobs=True
+        ),
+    )
+    local_ref = local.store_signal("tx", "waveform", waveform)
+    hybrid_ref = hybrid.store_signal("tx", "waveform", waveform)
+
+    assert local_ref == hybrid_ref
+    assert hybrid.refs[hybrid_ref]["persisted"] is True
+    reader = LocalArtifactStore(tmp_path / "hybrid" / "spec")
+    assert np.array_equal(reader.read_blob(hybrid_ref), waveform)
+
+
+def test_local_store_codec_policy_memory_maps_waveforms(tmp_path: Path) -> None:
+    store = LocalArtifactStore(artifact_root_for_spec("spec", base_dir=tmp_path))
+    state = SimulationState(meta={"seed": 1}, artifact_store=store)
+    waveform = (np.arange(64) + 1j * np.arange(64)).astype(np.complex128)
+    optical_ref = state.store_signal("optical", "waveform", waveform)
+    bits_ref = state.store_blob("hard_bits", np.array([0, 1, 1, 0]), role="rx:hard_bits")
+
+    assert state.refs[optical_ref]["codec"] == "npy"
+    assert optical_ref.endswith(".npy")
+    assert state.refs[bits_ref]["codec"] == "npz"
+    assert bits_ref.endswith(".npz")
+
+    reader = LocalArtifactStore(tmp_path / "spec")
+    lazy = reader.read_blob(optical_ref)
+    assert isinstance(lazy, np.memmap)
+    assert np.array_equal(lazy[8:16], waveform[8:16])
+    assert np.array_equal(reader.read_blob(bits_ref), np.array([0, 1, 1, 0]))
+
+
+def test_local_store_codec_policy_is_configurable(tmp_path: Path) -> None:
+    store = LocalArtifactStore(
+        artifact_root_for_spec("spec", base_dir=tmp_path), codecs={"rx:hard_bits": "npy"}
+    )
+    state = SimulationState(meta={"seed": 1}, artifact_store=store)
+    optical_ref = state.store_signal("optical", "waveform", np.zeros(8))
+    bits_ref = state.store_blob("hard_bits", np.array([0, 1]), role="rx:hard_bits")
+
+    assert state.refs[optical_ref]["codec"] == "npz"
+    assert state.refs[bits_ref]["codec"] == "npy"
+
+
+def test_deepcopy_shares_blobs_and_copies_bookkeeping() -> None:
+    state = SimulationState(meta={"seed": 5, "stage_timings": {"tx": 1.0}})
+    state.store_signal("tx", "waveform", np.arange(1024, dtype=np.float64))
+
+    copied = state.deepcopy()
+    copied.meta["stage_timings"]["channel"] = 2.0
+    copied.store_signal("optical", "waveform", np.zeros(4))
+
+    assert copied.artifact_store is state.artifact_store
+    assert np.shares_memory(
+        copied.load_signal("tx", "waveform"), state.load_signal("tx", "waveform")
+    )
+    assert not state.load_signal("tx", "waveform").flags.writeable
+    assert state.meta["stage_timings"] == {"tx": 1.0}
+    assert "optical" not in state.signals
+    assert len(state.refs) == 1
+
+
+def test_hybrid_store_owns_what_it_keeps(tmp_path: Path) -> None:
+    state = SimulationState(meta={"seed": 1}, artifact_store=HybridArtifactStore(tmp_path / "run"))
+    owned = np.arange(8, dtype=np.float64)
+    buffer = np.zeros((2, 8))
+    state.store_signal("tx", "waveform", owned)
+    state.store_signal("optical", "waveform", buffer[0])
+
+    with pytest.raises(ValueError):
+        owned[0] = 1.0
+    buffer[0, 0] = 5.0
+    assert state.load_signal("optical", "waveform")[0] == 0.0
+
+
+def test_pickled_hybrid_store_keeps_refs_not_arrays(tmp_path: Path) -> None:
+    root = artifact_root_for_spec("spec", base_dir=tmp_path / "artifacts", create=False)
+    state = SimulationState(meta={"seed": 1}, artifact_store=HybridArtifactStore(root))
+    waveform = np.linspace(0.0, 1.0, 1 << 16)
+    ref = state.store_signal("tx", "waveform", waveform)
+
+    payload = pickle.dumps(state)
+    restored = pickle.loads(payload)
+
+    assert len(payload) < waveform.nbytes // 10
+    assert (tmp_path / "artifacts" / ref.removeprefix("blob://")).exists()
+    assert np.array_equal(restored.load_signal("tx", "waveform"), waveform)
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import importlib
+import json
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pytest
+
+from fiber_link_sim.adapters.opticommpy.stages import ADAPTERS
+from fiber_link_sim.data_models.spec_models import SimulationSpec
+from fiber_link_sim.simulate import simulate
+from fiber_link_sim.stages.base import SimulationState
+from fiber_link_sim.sweep import _BlobLedger, plan_sweep, run_sweep
+
+simulate_module = importlib.import_module("fiber_link_sim.simulate")
+EXAMPLE = Path(__file__).resolve().parents[1] / "src/fiber_link_sim/schema/examples/ook_smoke.json"
+
+
+def _spec(taps: int, processing_weight: float = 0.1) -> SimulationSpec:
+    data = json.loads(EXAMPLE.read_text())
+    data["processing"]["dsp_chain"][2]["params"]["taps"] = taps
+    data["latency_model"]["processing_weight"] = processing_weight
+    return SimulationSpec.model_validate(data)
+
+
+def test_plan_shares_prefixes_by_slice_hash() -> None:
+    plan = plan_sweep([_spec(5), _spec(9), _spec(5, processing_weight=0.2), _spec(5)])
+
+    by_stage: dict[str, int] = {}
+    for node in plan.nodes.values():
+        by_stage[node.stage_name] = by_stage.get(node.stage_name, 0) + 1
+    assert by_stage["tx"] == by_stage["channel"] == by_stage["rx_frontend"] == 1
+    assert by_stage["dsp"] == by_stage["fec"] == 2
+    assert by_stage["metrics"] == 3
+    assert plan.leaves[0] == plan.leaves[3]
+    assert plan.stage_runs < plan.unshared_stage_runs
+
+
+def test_sweep_propagates_once_and_matches_simulate(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("FIBER_LINK_SIM_LOCAL_CACHE", "0")
+    specs = [_spec(5), _spec(9), _spec(9, processing_weight=0.2)]
+    references = [simulate(spec) for spec in specs]
+    calls: list[int] = []
+    original = type(ADAPTERS.channel).run
+
+    def _counting(self: Any, *args: Any, **kwargs: Any) -> Any:
+        calls.append(1)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(type(ADAPTERS.channel), "run", _counting)
+    sweep = run_sweep([*specs, {"v": "bogus"}])
+
+    assert len(calls) == 1
+    assert sweep.results[-1].error is not None
+    assert sweep.results[-1].error.code == "validation_error"
+    for result, reference in zip(sweep.results, references, strict=False):
+        assert result.status == "success"
+        assert result.summary == reference.summary
+        assert result.provenance.spec_hash == reference.provenance.spec_hash
+        assert [artifact.name for artifact in result.artifacts] == [
+            artifact.name for artifact in reference.artifacts
+        ]
+
+
+def test_sweep_persists_blobs_only_below_debug_specs(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("FIBER_LINK_SIM_LOCAL_CACHE", "0")
+    debug, quiet = _spec(5), _spec(9)
+    debug.outputs.artifact_level = "debug"
+    quiet.outputs.artifact_level = "none"
+
+    sweep = run_sweep([debug, quiet])
+
+    assert [result.status for result in sweep.results] == ["success", "success"]
+    manifest = json.loads(
+        (
+            tmp_path / "artifacts" / sweep.results[0].provenance.spec_hash / "run_manifest.json"
+        ).read_text()
+    )
+    listed = {entry["ref"].removeprefix("blob://") for entry in manifest["refs"]}
+    pooled = {
+        path.relative_to(tmp_path / "artifacts").as_posix()
+        for path in (tmp_path / "artifacts" / "blob_pool").rglob("*")
+        if path.is_file()
+    }
+    assert pooled and pooled <= listed
+
+
+def test_sweep_applies_each_specs_timeout(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("FIBER_LINK_SIM_LOCAL_CACHE", "0")
+    hurried = _spec(9)
+    hurried.runtime.max_runtime_s = 1e-9
+
+    relaxed, timed_out = run_sweep([_spec(5), hurried]).results
+
+    assert relaxed.status == "success"
+    assert timed_out.error is not None and timed_out.error.code == "timeout"
+    assert timed_out.error.details["max_runtime_s"] == 1e-9
+
+
+def test_sweep_reads_and_fills_the_result_cache(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("FIBER_LINK_SIM_LOCAL_CACHE", "1")
+    simulate_module._SIMULATION_CACHE.clear()
+    first = run_sweep([_spec(5)]).results[0]
+    calls: list[int] = []
+    original = type(ADAPTERS.channel).run
+
+    def _counting(self: Any, *args: Any, **kwargs: Any) -> Any:
+        calls.append(1)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(type(ADAPTERS.channel), "run", _counting)
+    again = run_sweep([_spec(5)])
+
+    assert calls == [] and again.stage_runs == 0
+    assert again.results[0] == first
+    assert simulate(_spec(5)) == first
+    simulate_module._SIMULATION_CACHE.clear()
+
+
+def test_ledger_releases_blobs_once_no_pending_leaf_can_read_them() -> None:
+    blobs = {ref: np.zeros(1) for ref in ("shared", "left", "same")}
+    ledger = _BlobLedger(
+        blobs=blobs,
+        parents={"root": None, "left": "root", "right": "root"},
+        pending={"root": 2, "left": 1, "right": 1},
+    )
+    ledger.record("root", SimulationState(), SimulationState(refs={"shared": {}}))
+    ledger.record(
+        "left",
+        SimulationState(refs={"shared": {}}),
+        SimulationState(refs={"shared": {}, "left": {}, "same": {}}),
+    )
+    ledger.record(
+        "right",
+        SimulationState(refs={"shared": {}}),
+        SimulationState(refs={"shared": {}, "same": {}}),
+    )
+
+    ledger.release("left")
+    assert set(blobs) == {"shared", "same"}
+    ledger.release("right")
+    assert blobs == {}
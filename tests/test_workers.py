@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import importlib
+import json
+import os
+import sys
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any
+
+from fiber_link_sim import workers
+from fiber_link_sim.data_models.spec_models import SimulationResult, SimulationSpec
+from fiber_link_sim.simulate import simulate
+
+EXAMPLE = Path(__file__).resolve().parents[1] / "src/fiber_link_sim/schema/examples/ook_smoke.json"
+simulate_module = importlib.import_module("fiber_link_sim.simulate")
+
+
+def test_pool_recycles_workers_and_replaces_crashed_ones() -> None:
+    pool = workers.WorkerPool(1, max_runs=2)
+    try:
+        pids = [pool.submit(os.getpid).result(timeout=120) for _ in range(3)]
+        assert pids[0] == pids[1] != pids[2]
+
+        spec = json.loads(EXAMPLE.read_text())
+        spec["processing"]["autotune"] = {"enabled": True, "budget_trials": 2}
+        result = pool.run(spec)
+        assert result.error is not None and result.error.code == "not_implemented"
+        assert result.provenance.spec_hash == simulate(spec).provenance.spec_hash
+
+        died = pool.submit(os._exit, 1)
+        assert isinstance(died.exception(timeout=120), BrokenProcessPool)
+        assert pool.crashes == 1
+        assert pool.submit(os.getpid).result(timeout=120) not in pids
+        assert pool.starts == 2
+    finally:
+        pool.shutdown()
+
+
+def _optic_loaded() -> bool:
+    return "optic" in sys.modules
+
+
+def test_warm_workers_have_already_imported_opticommpy() -> None:
+    pool = workers.WorkerPool(1)
+    try:
+        pool.warm()
+        assert pool.submit(_optic_loaded).result(timeout=120)
+    finally:
+        pool.shutdown()
+
+
+def test_cancel_event_reaches_the_worker_run() -> None:
+    pool = workers.WorkerPool(1)
+    manager = get_context("spawn").Manager()
+    try:
+        cancel = manager.Event()
+        cancel.set()
+        payload = pool.submit_cancellable(json.loads(EXAMPLE.read_text()), cancel).result(
+            timeout=300
+        )
+    finally:
+        manager.shutdown()
+        pool.shutdown()
+
+    result = SimulationResult.model_validate(payload)
+    assert result.error is not None and result.error.code == "runtime_error"
+    assert result.error.details["exception_type"] == "SimulationCancelled"
+
+
+def _system_error(*args: Any, **kwargs: Any) -> Any:
+    raise SystemError("native extension failure")
+
+
+def test_isolated_runs_and_the_system_error_fallback_use_the_warm_pool(monkeypatch) -> None:
+    spec = json.loads(EXAMPLE.read_text())
+    calls: list[SimulationSpec] = []
+    sentinel = simulate({"v": "bogus"})
+
+    def _run(self: workers.WorkerPool, spec: Any, **kwargs: Any) -> SimulationResult:
+        calls.append(spec)
+        return sentinel
+
+    monkeypatch.setenv("FIBER_LINK_SIM_LOCAL_CACHE", "0")
+    monkeypatch.setattr(workers.WorkerPool, "run", _run)
+    monkeypatch.setenv("FIBER_LINK_SIM_ISOLATE", "1")
+    assert simulate(spec) is sentinel
+
+    monkeypatch.delenv("FIBER_LINK_SIM_ISOLATE")
+    monkeypatch.setattr(simulate_module, "run_pipeline", _system_error)
+    assert simulate(spec) is sentinel
+
+    monkeypatch.setenv("FIBER_LINK_SIM_NO_SUBPROCESS", "1")
+    result = simulate(spec)
+    assert result.error is not None and result.error.details["exception_type"] == "SystemError"
+    assert [call.runtime.seed for call in calls] == [spec["runtime"]["seed"]] * 2